@@ -0,0 +1,146 @@
+import os
+import sys
+import logging
+import warnings
+import importlib.util
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from data_manager.loaders.data_loader import load_data
+from data_manager.loaders.time_column_scanner import scan_time_column
+from data_manager.preprocessing.core_preprocessor import DataChecker
+from data_manager.preprocessing.resampler import Resampler
+from data_manager.preprocessing.time_preprocessor import TimePreprocessor
+from data_manager.prepare_data.filter_by_date_range import PartialDataLoader
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+from core.rule_mining import find_frequent_itemsets, generate_association_rules, format_rules_output
+from synthetic_data import generate_historian, write_historian
+
+TIME_COLUMN = "time"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIME_PROCESSING_PAR = ["first", "drop", "drop"]
+FILL_METHODS = ["ffill", "bfill", "mean", "median", "mode", "constant", "interpolate"]
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """
+  This decorator registers a benchmark. The decorated function gets the shared context, does its (untimed) setup
+  and returns the callable that is timed. It is called again for every repeat, so every run starts from a fresh setup.
+  """
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+class BenchmarkSkipped(Exception):
+    """
+  This exception marks a benchmark that can not run in the current environment (e.g., a missing optional dependency).
+  """
+
+def build_context(work_dir, rows, generator_par, excel_rows=5000):
+    """
+  This function generates the synthetic data and prepares the inputs of every stage once (raw, time processed,
+  cleaned and discretized data, frequent itemsets and rules), so every benchmark only times its own stage.
+  """
+    raw_data, sensors = generate_historian(rows, time_column=TIME_COLUMN, time_format=TIME_FORMAT, **generator_par)
+    sensors_combined = [sensor for division in sensors.values() for sensor in division]
+    continuous_sensor_types = [division for division in ["temperature", "pressure", "el_power", "rpm"] if division in sensors]
+
+    csv_file = write_historian(os.path.join(work_dir, "historian.csv"), raw_data)
+    excel_file = None
+    if importlib.util.find_spec("openpyxl") is not None:
+        excel_file = write_historian(os.path.join(work_dir, "historian.xlsx"), raw_data.iloc[:excel_rows])
+
+    time_processed = TimePreprocessor(raw_data[[TIME_COLUMN]].copy(), TIME_COLUMN, TIME_FORMAT).process_time_column(TIME_PROCESSING_PAR)
+    data = raw_data.loc[time_processed.index].copy()
+    data[TIME_COLUMN] = time_processed[TIME_COLUMN]
+    data = data.reset_index(drop=True)
+
+    cleaned = DataChecker(data.copy(), sensors_combined, TIME_COLUMN).full_validation(["fill", "mean", None, None, "z_score", 3])
+    discretized = RuleMiningProcessor(cleaned.copy(), sensors, TIME_COLUMN).advanced_preprocessing("equal_width", 3, None, continuous_sensor_types)
+    frequent_itemsets = find_frequent_itemsets(discretized, 0.1)
+    rules = generate_association_rules(frequent_itemsets, 0.5, None)
+
+    times = time_processed[TIME_COLUMN].sort_values()
+    range_start, range_end = times.iloc[len(times) // 4], times.iloc[len(times) // 2]
+    return {
+        "rows": rows, "sensors": sensors, "sensors_combined": sensors_combined, "continuous_sensor_types": continuous_sensor_types,
+        "csv_file": csv_file, "excel_file": excel_file, "raw_data": raw_data, "data": data, "cleaned": cleaned,
+        "discretized": discretized, "frequent_itemsets": frequent_itemsets, "rules": rules,
+        "range": (range_start.strftime("%Y-%m-%d %H:%M:%S"), range_end.strftime("%Y-%m-%d %H:%M:%S"))}
+
+@benchmark("load_csv")
+def load_csv(context):
+    reader = load_data(context["csv_file"])
+    columns = [TIME_COLUMN] + context["sensors_combined"]
+    return lambda: reader.read_file(columns)
+
+@benchmark("load_excel")
+def load_excel(context):
+    if context["excel_file"] is None:
+        raise BenchmarkSkipped("openpyxl is not installed")
+    reader = load_data(context["excel_file"])
+    columns = [TIME_COLUMN] + context["sensors_combined"]
+    return lambda: reader.read_file(columns)
+
+@benchmark("partial_range_load")
+def partial_range_load(context):
+    start_date, end_date = context["range"]
+    def run():
+        loader = PartialDataLoader(context["csv_file"], context["sensors_combined"], TIME_COLUMN, TIME_FORMAT, TIME_PROCESSING_PAR)
+        return loader.get_filtered_data(start_date, end_date)
+    return run
+
+@benchmark("time_column_scan")
+def time_column_scan(context):
+    return lambda: scan_time_column(context["csv_file"], TIME_COLUMN, TIME_FORMAT)
+
+@benchmark("time_parsing")
+def time_parsing(context):
+    time_preprocessor = TimePreprocessor(context["raw_data"][[TIME_COLUMN]].copy(), TIME_COLUMN, TIME_FORMAT)
+    return lambda: time_preprocessor.process_time_column(TIME_PROCESSING_PAR)
+
+@benchmark("resampling")
+def resampling(context):
+    resampler = Resampler(context["data"], context["sensors"], TIME_COLUMN)
+    return lambda: resampler.resample("15min", {})
+
+def _fill_benchmark(fill_method, time_window=None):
+    def setup(context):
+        data_checker = DataChecker(context["data"].copy(), context["sensors_combined"], TIME_COLUMN)
+        return lambda: data_checker.handle_missing_values("fill", fill_method, 0.0, time_window)
+    return setup
+
+for _fill_method in FILL_METHODS:
+    benchmark(f"fill_{_fill_method}")(_fill_benchmark(_fill_method))
+benchmark("fill_mean_time_window")(_fill_benchmark("mean", "5min"))
+
+def _outliers_benchmark(method, threshold):
+    def setup(context):
+        data_checker = DataChecker(context["cleaned"].copy(), context["sensors_combined"], TIME_COLUMN)
+        return lambda: data_checker.detect_outliers(method, threshold)
+    return setup
+
+benchmark("outliers_z_score")(_outliers_benchmark("z_score", 3))
+benchmark("outliers_iqr")(_outliers_benchmark("iqr", 1.5))
+
+@benchmark("discretization")
+def discretization(context):
+    rule_mining_processor = RuleMiningProcessor(context["cleaned"].copy(), context["sensors"], TIME_COLUMN)
+    return lambda: rule_mining_processor.advanced_preprocessing("equal_width", 3, None, context["continuous_sensor_types"])
+
+@benchmark("fpgrowth")
+def fpgrowth_benchmark(context):
+    return lambda: find_frequent_itemsets(context["discretized"], 0.1)
+
+@benchmark("rule_formatting")
+def rule_formatting(context):
+    return lambda: format_rules_output(context["rules"])
+
+def silence_logging():
+    """
+  This function keeps the pipeline logs and the pandas deprecation warnings out of the benchmark output.
+  """
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger().setLevel(logging.ERROR)
+    warnings.simplefilter("ignore", FutureWarning)
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import argparse
+import tracemalloc
+from datetime import datetime
+from hot_paths import TIME_COLUMN, TIME_FORMAT, TIME_PROCESSING_PAR, silence_logging
+from synthetic_data import generate_historian
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+from data_manager.preprocessing.core_preprocessor import DataChecker
+from data_manager.preprocessing.time_preprocessor import TimePreprocessor
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+
+CORE_PROCESSING_PAR = {"fill_mean": ["fill", "mean", None, None, "z_score", 3], "drop": ["drop", None, None, None, "z_score", 3]}
+
+def measure_peak(func):
+    """
+  This function runs "func" and returns its result and the peak of the memory allocated while it ran (in bytes,
+  traced with tracemalloc, which also sees the NumPy buffers of pandas).
+  """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    try:
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak - start
+
+def run_memory_benchmarks(rows, seed=0):
+    """
+  This function measures the peak memory of the cleaning, of the rule mining preprocessing and of both together (the
+  "pipeline", from the loaded data to the binary data of the rule mining) as a ratio of the size of their input frame.
+  The input is handed over to the processors (they own it, no defensive copies), so the ratio includes the input itself:
+  1.0 means that a stage did not allocate anything on top of its input.
+  """
+    raw_data, sensors = generate_historian(rows, time_column=TIME_COLUMN, time_format=TIME_FORMAT, seed=seed)
+    sensors_combined = [sensor for division in sensors.values() for sensor in division]
+    continuous_sensor_types = [division for division in ["temperature", "pressure", "el_power", "rpm"] if division in sensors]
+
+    time_processed = TimePreprocessor(raw_data[[TIME_COLUMN]].copy(), TIME_COLUMN, TIME_FORMAT).process_time_column(TIME_PROCESSING_PAR)
+    data = raw_data.loc[time_processed.index].copy()
+    data[TIME_COLUMN] = time_processed[TIME_COLUMN]
+    data = data.reset_index(drop=True)
+    del raw_data, time_processed
+
+    def clean(frames, core_processing_par):
+        return DataChecker(frames.pop(), sensors_combined, TIME_COLUMN).full_validation(core_processing_par)
+
+    def prepare_for_mining(frames):
+        return RuleMiningProcessor(frames.pop(), sensors, TIME_COLUMN).advanced_preprocessing("equal_width", 3, None, continuous_sensor_types)
+
+    results = {}
+    for name, core_processing_par in CORE_PROCESSING_PAR.items():
+        # the frames are passed in a list and popped by the stage, so the benchmark keeps no reference to its input
+        frames = [data.copy()]
+        input_bytes = int(frames[0].memory_usage(deep=True).sum())
+        cleaned, peak = measure_peak(lambda: clean(frames, core_processing_par))
+        results[f"cleaning_{name}"] = _memory_result(input_bytes, peak)
+
+        frames = [cleaned]
+        cleaned_bytes = int(cleaned.memory_usage(deep=True).sum())
+        del cleaned
+        _, peak = measure_peak(lambda: prepare_for_mining(frames))
+        results[f"rule_mining_preprocessing_{name}"] = _memory_result(cleaned_bytes, peak)
+
+        frames = [data.copy()]
+        _, peak = measure_peak(lambda: prepare_for_mining([clean(frames, core_processing_par)]))
+        results[f"pipeline_{name}"] = _memory_result(input_bytes, peak)
+
+    for name, result in results.items():
+        print(f"{name:<36} input {result['input_mb']:8.2f} MB   peak {result['peak_mb']:8.2f} MB   ratio {result['ratio']:6.3f}")
+    return results
+
+def _memory_result(input_bytes, allocated_peak):
+    """
+  This helper function returns the input size, the peak memory (input included) and their ratio of a stage.
+  """
+    peak = input_bytes + allocated_peak
+    return {"input_mb": round(input_bytes / 2**20, 2), "peak_mb": round(peak / 2**20, 2), "ratio": round(peak / input_bytes, 3)}
+
+def main():
+    """
+  This function parses the arguments, runs the memory benchmarks and stores the results as JSON. It fails if the peak
+  memory of the pipeline is more than "--max-ratio" times its input.
+  """
+    parser = argparse.ArgumentParser(description="Measure the peak memory of the DataSense preprocessing on a synthetic historian.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of generated rows (default: 200000).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    parser.add_argument("--max-ratio", type=float, default=1.5, help="Highest accepted peak/input ratio of the pipeline (default: 1.5).")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/memory-<timestamp>.json).")
+    args = parser.parse_args()
+
+    silence_logging()
+    results = {"created_at": datetime.now().isoformat(timespec="seconds"), "parameters": {"rows": args.rows, "seed": args.seed},
+               "stages": run_memory_benchmarks(args.rows, args.seed)}
+
+    output_file = args.output or os.path.join(os.path.dirname(__file__), "results", f"memory-{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with open(output_file, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved in {output_file}")
+
+    too_large = [name for name, result in results["stages"].items() if name.startswith("pipeline_") and result["ratio"] > args.max_ratio]
+    if too_large:
+        print(f"\nThe peak memory is more than {args.max_ratio}x the input in: {', '.join(too_large)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import fnmatch
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from hot_paths import BENCHMARKS, BenchmarkSkipped, build_context, silence_logging
+
+def run_benchmarks(rows, generator_par, repeat, selected=None):
+    """
+  This function runs the selected benchmarks ("selected" is a list of name patterns, e.g., ["fill_*"]) on a generated
+  dataset and returns the timing of every benchmark (every repeat starts from a fresh, untimed setup).
+  """
+    names = [name for name in BENCHMARKS if not selected or any(fnmatch.fnmatch(name, pattern) for pattern in selected)]
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        context = build_context(work_dir, rows, generator_par)
+        for name in names:
+            runs = []
+            try:
+                for _ in range(repeat):
+                    run = BENCHMARKS[name](context)
+                    start = time.perf_counter()
+                    run()
+                    runs.append(time.perf_counter() - start)
+            except BenchmarkSkipped as e:
+                results[name] = {"skipped": str(e)}
+                print(f"{name:<24} skipped ({e})")
+                continue
+
+            results[name] = {"min_s": round(min(runs), 6), "median_s": round(statistics.median(runs), 6),
+                             "mean_s": round(statistics.fmean(runs), 6), "runs_s": [round(run, 6) for run in runs]}
+            print(f"{name:<24} min {min(runs):9.4f} s   median {statistics.median(runs):9.4f} s")
+    return results
+
+def compare_results(current, baseline, threshold):
+    """
+  This function compares the median times of two result files and returns the benchmarks that are slower than
+  "threshold" times their baseline.
+  """
+    regressions = []
+    print(f"\n{'benchmark':<24} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, result in current["benchmarks"].items():
+        baseline_result = baseline["benchmarks"].get(name, {})
+        if "median_s" not in result or "median_s" not in baseline_result:
+            continue
+        ratio = result["median_s"] / baseline_result["median_s"] if baseline_result["median_s"] else float("inf")
+        flag = "  <-- slower" if ratio > threshold else ""
+        print(f"{name:<24} {baseline_result['median_s']:>10.4f} {result['median_s']:>10.4f} {ratio:>7.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+def get_environment():
+    """
+  This function returns the versions and the commit the benchmarks ran with, so the result files can be compared.
+  """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    try:
+        import mlxtend
+        mlxtend_version = mlxtend.__version__
+    except ImportError:
+        mlxtend_version = None
+
+    return {"commit": commit, "python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+            "numpy": np.__version__, "pandas": pd.__version__, "mlxtend": mlxtend_version}
+
+def main():
+    """
+  This function parses the arguments, runs the benchmarks and stores the results as JSON.
+  """
+    parser = argparse.ArgumentParser(description="Run the DataSense hot path benchmarks on a synthetic historian.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of generated rows (default: 100000).")
+    parser.add_argument("--sensors-per-division", type=int, default=None, help="Number of sensors in every division (default: 2 temperature, 2 pressure, 1 of the others).")
+    parser.add_argument("--gap-rate", type=float, default=0.01, help="Fraction of missing continuous values.")
+    parser.add_argument("--duplicate-rate", type=float, default=0.001, help="Fraction of duplicated timestamps.")
+    parser.add_argument("--outlier-rate", type=float, default=0.001, help="Fraction of outliers in the continuous sensors.")
+    parser.add_argument("--unsorted-fraction", type=float, default=0.0, help="Fraction of shuffled rows.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of every benchmark (default: 3).")
+    parser.add_argument("--only", nargs="*", default=None, help="Name patterns of the benchmarks to run (e.g., fill_* fpgrowth).")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<timestamp>.json).")
+    parser.add_argument("--compare", default=None, help="Result file of a previous run to compare with.")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression (default: 1.2).")
+    args = parser.parse_args()
+
+    silence_logging()
+    generator_par = {"gap_rate": args.gap_rate, "duplicate_rate": args.duplicate_rate, "outlier_rate": args.outlier_rate,
+                     "unsorted_fraction": args.unsorted_fraction, "seed": args.seed}
+    if args.sensors_per_division:
+        generator_par["sensors_per_division"] = {division: args.sensors_per_division for division in
+                                                 ["temperature", "pressure", "el_power", "rpm", "ordinal", "categorical"]}
+
+    results = {"created_at": datetime.now().isoformat(timespec="seconds"), "environment": get_environment(),
+               "parameters": {"rows": args.rows, "repeat": args.repeat, **generator_par},
+               "benchmarks": run_benchmarks(args.rows, generator_par, args.repeat, args.only)}
+
+    output_file = args.output or os.path.join(os.path.dirname(__file__), "results", f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with open(output_file, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved in {output_file}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_results(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks are slower than {args.threshold}x their baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_SENSORS_PER_DIVISION = {"temperature": 2, "pressure": 2, "el_power": 1, "rpm": 1, "ordinal": 1, "categorical": 1}
+CONTINUOUS_DIVISIONS = ["temperature", "pressure", "el_power", "rpm"]
+
+def generate_historian(rows=100_000, sensors_per_division=None, gap_rate=0.01, duplicate_rate=0.001, outlier_rate=0.001, unsorted_fraction=0.0,
+                       start="2024-01-01", freq="1min", time_column="time", time_format="%Y-%m-%d %H:%M:%S", seed=0):
+    """
+  This function generates a deterministic synthetic historian export (the same arguments always give the same data).
+  The continuous sensors are random walks with gaps (NaN) and outliers, the ordinal sensors take a few integer levels
+  and the categorical sensors are 0/1 states. A part of the rows get the timestamp of their previous row (duplicates)
+  and a fraction of the rows can be shuffled (unsorted). It returns the DataFrame and the sensors config (divisions).
+  """
+    rng = np.random.default_rng(seed)
+    sensors_per_division = DEFAULT_SENSORS_PER_DIVISION if sensors_per_division is None else sensors_per_division
+
+    # step 1: regular timestamps, some of them repeat the previous one (duplicates)
+    times = pd.date_range(start, periods=rows, freq=freq)
+    duplicated = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    duplicated = duplicated[duplicated > 0]
+    times = times.to_numpy().copy()
+    times[duplicated] = times[duplicated - 1]
+    data = {time_column: pd.DatetimeIndex(times).strftime(time_format)}
+
+    # step 2: the sensor values of every division
+    sensors = {}
+    for division, count in sensors_per_division.items():
+        sensors[division] = [f"{division}_{i + 1}" for i in range(count)]
+        for sensor in sensors[division]:
+            if division in CONTINUOUS_DIVISIONS:
+                values = 50 + np.cumsum(rng.normal(0, 0.5, rows))
+                outliers = rng.random(rows) < outlier_rate
+                values[outliers] += rng.choice([-1, 1], outliers.sum()) * 20 * max(values.std(), 1.0)
+                values[rng.random(rows) < gap_rate] = np.nan
+                data[sensor] = values.round(3)
+            elif division == "ordinal":
+                data[sensor] = rng.integers(0, 4, rows)
+            else:
+                data[sensor] = rng.integers(0, 2, rows)
+    df = pd.DataFrame(data)
+
+    # step 3: shuffle a fraction of the rows between their positions (unsorted export)
+    shuffled_count = int(rows * unsorted_fraction)
+    if shuffled_count > 1:
+        positions = np.sort(rng.choice(rows, shuffled_count, replace=False))
+        order = np.arange(rows)
+        order[positions] = rng.permutation(positions)
+        df = df.iloc[order].reset_index(drop=True)
+
+    return df, sensors
+
+def write_historian(file_path, df):
+    """
+  This function writes a generated historian as CSV or Excel (based on the file extension).
+  """
+    file_path = str(file_path)
+    if file_path.endswith((".xlsx", ".xls")):
+        df.to_excel(file_path, index=False)
+    else:
+        df.to_csv(file_path, index=False)
+    return file_path
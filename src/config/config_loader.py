@@ -4,24 +4,33 @@ import yaml
 import logging
 from pathlib import Path
 from utils.logging_setup import log_and_raise_error
-from config.validate_config import validate_config
+from config.validate_config import validate_config, MEMORY_SIZE_PATTERN, MEMORY_SIZE_UNITS
 
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.file_management import create_output_dir
+from utils.stage_cache import StageCache
 
 def load_validate_config(config_file):
     """
   This function loads and validates the configuration from the YAML file.
+  """
+    config = load_config(config_file)
+
+    logging.info("Validating configuration...")
+    validate_config(config)
+    logging.info("Configuration validated successfully.")
+    return config
+
+def load_config(config_file):
+    """
+  This function loads the configuration from the YAML file without validating it (e.g., to apply the command line
+  overrides first).
   """
     try:
         with open(config_file, "r") as f:
             config = yaml.safe_load(f)
         logging.info("Configuration file %s loaded successfully.", config_file)
-
-        logging.info("Validating configuration...")
-        validate_config(config)
-        logging.info("Configuration validated successfully.")
         return config
 
     except FileNotFoundError:
@@ -56,9 +65,14 @@ def get_yaml_input(config, single_date=False, time_range=False):
     check_duplicates_keep = pre_processing["time_col"]["check_duplicates_keep"]
     time_col_missing_values = pre_processing["time_col"]["handle_missing_values"]
     time_col_datetime_conversion = pre_processing["time_col"]["failed_datetime_conversion"]
+    # optional file with the code tables of the categorical columns (stable codes for every run, chunk or file)
+    categorical_codes_file = pre_processing.get("categorical_codes_file")
     core_processing_par = [missing_values_strategy, missing_values_fill_method, missing_values_fill_value,
-        missing_values_time_window, detect_outliers_method, detect_outliers_threshold]
-    time_processing_par = [check_duplicates_keep, time_col_missing_values, time_col_datetime_conversion]
+        missing_values_time_window, detect_outliers_method, detect_outliers_threshold, categorical_codes_file]
+    # optional resampling of the loaded data to a time grid, the aggregations of the divisions that are not set use their defaults
+    resample_config = pre_processing.get("resample")
+    resample_par = [resample_config["rule"], resample_config.get("aggregations") or {}] if resample_config else None
+    time_processing_par = [check_duplicates_keep, time_col_missing_values, time_col_datetime_conversion, resample_par]
 
     # get rule mining parameters if present
     rule_mining_config = pre_processing.get("rule_mining", None)
@@ -70,7 +84,10 @@ def get_yaml_input(config, single_date=False, time_range=False):
         min_support = rule_mining_config.get("min_support")
         min_confidence = rule_mining_config.get("min_confidence")
         min_lift = rule_mining_config.get("min_lift")
-        rule_mining_processing_par = [rule_mining_method, rule_mining_bins, rule_mining_labels, continuous_sensor_types, min_support, min_confidence, min_lift]
+        discretization_model_file = rule_mining_config.get("discretization_model_file")
+        discretization_sample_size = rule_mining_config.get("discretization_sample_size")
+        rule_mining_processing_par = [rule_mining_method, rule_mining_bins, rule_mining_labels, continuous_sensor_types, min_support, min_confidence, min_lift,
+            discretization_model_file, discretization_sample_size]
     else:
         rule_mining_processing_par = None
 
@@ -89,3 +106,110 @@ def get_yaml_input(config, single_date=False, time_range=False):
     else:
         # for "full_data" mode 
         return input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par
+
+def get_incremental_input(config):
+    """
+  This function retrieves the incremental mining parameters from the config file.
+  """
+    return Path(config["incremental"]["state_file"])
+
+def get_rolling_window_input(config):
+    """
+  This function retrieves the window length and step of the rolling window mode from the config file.
+  """
+    rolling_window_config = config["rolling_window"]
+    return rolling_window_config["window"], rolling_window_config["step"]
+
+def get_batch_input(config):
+    """
+  This function retrieves the batch jobs (name and date range) and the number of workers from the config file.
+  """
+    batch_config = config["batch"]
+    jobs = []
+    for job in batch_config["jobs"]:
+        if job.get("date"):
+            jobs.append((job.get("name") or job["date"], (job["date"], None)))
+        else:
+            jobs.append((job.get("name") or f"{job['start_date']}_{job['end_date']}", (job["start_date"], job["end_date"])))
+
+    max_workers = batch_config.get("max_workers") or os.cpu_count() or 1
+    return jobs, max_workers
+
+def get_per_day_input(config):
+    """
+  This function retrieves the number of workers of the per_day mode from the config file.
+  """
+    per_day_config = config.get("per_day") or {}
+    return per_day_config.get("max_workers") or os.cpu_count() or 1
+
+def get_full_data_input(config):
+    """
+  This function retrieves the optional bounds (inclusive timestamps, default: None), the chunk size (default: 100000 rows)
+  and the number of chunks read ahead (default: 2) of the full_data mode from the config file. The result is None if no
+  bounds are configured.
+  """
+    full_data_config = config.get("full_data") or {}
+    start, end = full_data_config.get("start"), full_data_config.get("end")
+    if start is None and end is None:
+        return None
+    return start, end, full_data_config.get("chunk_size") or 100_000, full_data_config.get("prefetch_chunks", 2)
+
+def get_preview_input(config):
+    """
+  This function retrieves the optional preview settings of the rule mining from the config file: the margin of error
+  (default: 0.01), the confidence level (default: 0.95), the sampling (default: "random"), the strata of the "stratified"
+  sampling (default: "1h") and the seed (default: 0). The result is None if no preview is configured.
+  """
+    rule_mining_config = (config.get("pre_processing") or {}).get("rule_mining") or {}
+    preview_config = rule_mining_config.get("preview")
+    if preview_config is None:
+        return None
+    return (preview_config.get("margin_of_error", 0.01), preview_config.get("confidence_level", 0.95), preview_config.get("sampling", "random"),
+            preview_config.get("strata", "1h"), preview_config.get("seed", 0))
+
+def get_stage_cache_input(config):
+    """
+  This function creates the stage cache from the config file, it returns None if no stage cache is configured.
+  """
+    stage_cache_config = config.get("stage_cache")
+    if not stage_cache_config:
+        return None
+    return StageCache(Path(stage_cache_config["cache_dir"]), stage_cache_config.get("max_size_mb") or 1024)
+
+def get_instrumentation_input(config):
+    """
+  This function retrieves if the run report is written (default: True) and if the memory allocations are traced (default: False).
+  """
+    instrumentation_config = config.get("instrumentation") or {}
+    return instrumentation_config.get("run_report", True), instrumentation_config.get("trace_memory", False)
+
+def get_profiling_input(config):
+    """
+  This function retrieves the profiling settings from the config file: enabled (default: False), per_stage (default: False)
+  and the stack sampling interval in seconds (default: 0.005).
+  """
+    profiling_config = config.get("profiling") or {}
+    return profiling_config.get("enabled", False), profiling_config.get("per_stage", False), profiling_config.get("sample_interval", 0.005)
+
+def get_output_input(config):
+    """
+  This function retrieves the output settings from the config file: the format (default: "csv"), the compression
+  (default: None), if the outputs are written in the background (default: False) and the disabled outputs (the processed
+  data and the rule mining data are written by default).
+  """
+    output_config = config.get("output") or {}
+    disabled_outputs = [name for key, name in [("processed_data", "processed_data"), ("mining_data", "processed_data_mining_rules")]
+                        if not output_config.get(key, True)]
+    return output_config.get("format", "csv"), output_config.get("compression"), output_config.get("background", False), disabled_outputs
+
+def get_memory_input(config):
+    """
+  This function retrieves the memory budget of the run in MB (default: None, no budget) and the directory of the spilled
+  data (default: None, the system temporary directory) from the config file.
+  """
+    memory_config = config.get("memory") or {}
+    max_memory = memory_config.get("max_memory")
+    if isinstance(max_memory, str):
+        size, unit = MEMORY_SIZE_PATTERN.match(max_memory.strip()).groups()
+        max_memory = float(size) * MEMORY_SIZE_UNITS[unit]
+    return (int(max_memory) if max_memory is not None else None), memory_config.get("spill_dir")
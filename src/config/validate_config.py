@@ -1,9 +1,19 @@
-import pandas as pd
-from datetime import datetime
+import re
+from datetime import datetime, timedelta
 from utils.logging_setup import log_and_raise_error
 
 ACCEPTED_TIME_FORMATS = ["%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%m-%d-%Y %H:%M:%S"]
+INPUT_FILE_EXTENSIONS = (".csv", ".xlsx", ".csv.gz", ".csv.bz2", ".csv.xz", ".csv.zst")
 REQUIRED_CONFIG_KEYS = ["input_file", "output_dir", "time_column", "time_format", "sensors", "pre_processing"]
+EXPLICIT_MODES = ["incremental", "rolling_window", "batch", "per_day"]
+ALLOWED_DIVISIONS = ["temperature", "pressure", "el_power", "rpm", "ordinal", "categorical"]
+RESAMPLE_AGGREGATIONS = ["mean", "min", "max", "first", "last", "mode"]
+PREVIEW_SAMPLING_METHODS = ["random", "stratified"]
+OUTPUT_COMPRESSIONS = {"csv": ["gzip", "bz2", "xz", "zstd"], "parquet": ["snappy", "gzip", "zstd"], "feather": ["lz4", "zstd"]}
+MEMORY_SIZE_UNITS = {"MB": 1, "GB": 1024}
+MEMORY_SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*(MB|GB)$")
+SIMPLE_OFFSET_UNITS = {"W": "weeks", "D": "days", "d": "days", "h": "hours", "min": "minutes", "s": "seconds", "ms": "milliseconds", "us": "microseconds"}
+SIMPLE_OFFSET_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)(W|D|d|h|min|s|ms|us)$")
 
 def validate_config(config):
     """
@@ -15,15 +25,31 @@ def validate_config(config):
 def validate_date_inputs(config):
     """
   This function validates the date-related fields and dynamically set the mode.
+  Modes that can not be derived from the dates (e.g., "incremental", "batch") have to be set explicitly with the "mode" key.
   """
     date = config.get("date")
     start_date = config.get("start_date")
     end_date = config.get("end_date")
+    mode = config.get("mode")
 
     if bool(start_date) != bool(end_date):  # XOR check for start_date and end_date
         log_and_raise_error("Both 'start_date' and 'end_date' must be specified together if one is provided.")
 
-    if date:
+    if mode is not None and mode not in EXPLICIT_MODES:
+        log_and_raise_error(f"Invalid 'mode': must be one of {EXPLICIT_MODES}, other modes are set based on the dates.")
+
+    if mode in EXPLICIT_MODES:
+        if date or start_date:
+            log_and_raise_error(f"The '{mode}' mode can not be combined with the top-level date fields.")
+        if mode == "incremental":
+            validate_incremental(config.get("incremental"))
+        elif mode == "rolling_window":
+            validate_rolling_window(config.get("rolling_window"))
+        elif mode == "batch":
+            validate_batch(config.get("batch"))
+        elif mode == "per_day":
+            validate_per_day(config.get("per_day"))
+    elif date:
         config["mode"] = "single_day"
         validate_date_format(date, "date")
     elif start_date and end_date:
@@ -44,8 +70,8 @@ def validate_common_config(config):
 
     # validate input_file
     input_file = config["input_file"]
-    if not input_file.endswith((".csv", ".xlsx")):
-        log_and_raise_error("Invalid 'input_file': must be a CSV or XLSX file.")
+    if not input_file.endswith(INPUT_FILE_EXTENSIONS):
+        log_and_raise_error("Invalid 'input_file': must be a CSV (optionally compressed: .gz, .bz2, .xz, .zst) or XLSX file.")
 
     # validate output_dir
     output_dir = config["output_dir"]
@@ -69,6 +95,30 @@ def validate_common_config(config):
     pre_processing = config.get("pre_processing", {})
     validate_pre_processing(pre_processing)
 
+    # validate the optional bounds of the full_data mode
+    if config.get("full_data") is not None:
+        validate_full_data(config["full_data"])
+
+    # validate the optional stage cache
+    if config.get("stage_cache") is not None:
+        validate_stage_cache(config["stage_cache"])
+
+    # validate the optional instrumentation settings
+    if config.get("instrumentation") is not None:
+        validate_instrumentation(config["instrumentation"])
+
+    # validate the optional profiling settings
+    if config.get("profiling") is not None:
+        validate_profiling(config["profiling"])
+
+    # validate the optional output settings
+    if config.get("output") is not None:
+        validate_output(config["output"])
+
+    # validate the optional memory budget
+    if config.get("memory") is not None:
+        validate_memory(config["memory"])
+
 def nested_key_exists(config, key):
     """
   This function checks if a nested key exists in the configuration dictionary.
@@ -81,6 +131,18 @@ def nested_key_exists(config, key):
             return False
     return True
 
+def parse_timedelta(value):
+    """
+  This function parses a pandas offset string (e.g., "1min", "7D"). The simple offsets are parsed without pandas, so
+  validating a config (e.g., with "main.py validate") does not have to import it, the others are parsed by pandas.
+  """
+    match = SIMPLE_OFFSET_PATTERN.match(value) if isinstance(value, str) else None
+    if match:
+        return timedelta(**{SIMPLE_OFFSET_UNITS[match.group(2)]: float(match.group(1))})
+
+    import pandas as pd
+    return pd.Timedelta(value)
+
 def validate_date_format(date_str, key_name):
     """
   This function validates the format of date strings.
@@ -94,7 +156,7 @@ def validate_sensors(sensors):
     """
   This function validates the sensors section of the configuration.
   """
-    allowed_divisions = ["temperature", "pressure", "el_power", "rpm", "ordinal", "categorical"]
+    allowed_divisions = ALLOWED_DIVISIONS
     if not sensors:
         log_and_raise_error("Invalid 'sensors': At least one division with sensors must be provided.")
 
@@ -122,6 +184,14 @@ def validate_pre_processing(pre_processing):
     time_col_config = pre_processing.get("time_col", {})
     validate_time_col(time_col_config)
 
+    resample_config = pre_processing.get("resample", None)
+    if resample_config is not None:
+        validate_resample(resample_config)
+
+    categorical_codes_file = pre_processing.get("categorical_codes_file")
+    if categorical_codes_file is not None and (not isinstance(categorical_codes_file, str) or not categorical_codes_file.strip()):
+        log_and_raise_error("Invalid 'categorical_codes_file': must be a non-empty string or None.")
+
     rule_mining_config = pre_processing.get("rule_mining", None)
     if rule_mining_config:
         validate_rule_mining(rule_mining_config)
@@ -146,7 +216,7 @@ def validate_handle_missing_values(hmv_config):
 
     if "time_window" in hmv_config:
         try:
-            pd.Timedelta(hmv_config["time_window"])
+            parse_timedelta(hmv_config["time_window"])
         except ValueError:
             log_and_raise_error("Invalid 'time_window': must be a valid pandas offset string.")
 
@@ -176,6 +246,32 @@ def validate_time_col(time_col_config):
         if value not in valid_options:
             log_and_raise_error(f"Invalid '{key}': must be one of {valid_options}.")
 
+def validate_resample(resample_config):
+    """
+  This function validates the optional resample section of the pre_processing.
+  """
+    if not isinstance(resample_config, dict):
+        log_and_raise_error("Invalid 'resample': must be a dictionary with a 'rule' and optional 'aggregations'.")
+
+    rule = resample_config.get("rule")
+    try:
+        rule_seconds = parse_timedelta(rule).total_seconds() if isinstance(rule, str) else 0
+    except ValueError:
+        rule_seconds = 0
+    if not rule_seconds > 0:
+        log_and_raise_error("Invalid 'rule': must be a positive fixed pandas offset string (e.g., '1min').")
+
+    aggregations = resample_config.get("aggregations") or {}
+    if not isinstance(aggregations, dict):
+        log_and_raise_error("Invalid 'aggregations': must be a dictionary of sensor divisions and aggregations.")
+    for division, aggregation in aggregations.items():
+        if division not in ALLOWED_DIVISIONS:
+            log_and_raise_error(f"Invalid 'aggregations' division '{division}': must be one of {ALLOWED_DIVISIONS}.")
+        if aggregation not in RESAMPLE_AGGREGATIONS:
+            log_and_raise_error(f"Invalid aggregation '{aggregation}' for '{division}': must be one of {RESAMPLE_AGGREGATIONS}.")
+        if aggregation in ["mean", "min", "max"] and division == "categorical":
+            log_and_raise_error(f"Invalid aggregation '{aggregation}' for 'categorical': use 'first', 'last' or 'mode'.")
+
 def validate_rule_mining(rule_mining_config):
     """
   This function validates the rule_mining section of the configuration.
@@ -214,3 +310,226 @@ def validate_rule_mining(rule_mining_config):
         log_and_raise_error("Invalid 'min_confidence': must be a positive float or None.")
     if min_lift is not None and (not isinstance(min_lift, float) or min_lift < 0):
         log_and_raise_error("Invalid 'min_lift': must be a non-negative float or None.")
+
+    discretization_model_file = rule_mining_config.get("discretization_model_file")
+    if discretization_model_file is not None and (not isinstance(discretization_model_file, str) or not discretization_model_file.strip()):
+        log_and_raise_error("Invalid 'discretization_model_file': must be a non-empty string or None.")
+
+    discretization_sample_size = rule_mining_config.get("discretization_sample_size")
+    if discretization_sample_size is not None and (not isinstance(discretization_sample_size, int) or discretization_sample_size <= 0):
+        log_and_raise_error("Invalid 'discretization_sample_size': must be a positive integer or None.")
+
+    preview = rule_mining_config.get("preview")
+    if preview is not None:
+        validate_preview(preview)
+
+def validate_preview(preview_config):
+    """
+  This function validates the optional preview section of the rule_mining.
+  """
+    if not isinstance(preview_config, dict):
+        log_and_raise_error("Invalid 'preview': must be a dictionary with optional 'margin_of_error', 'confidence_level', 'sampling', 'strata' and 'seed'.")
+
+    margin_of_error = preview_config.get("margin_of_error", 0.01)
+    if not isinstance(margin_of_error, float) or not 0 < margin_of_error <= 0.5:
+        log_and_raise_error("Invalid 'margin_of_error': must be a float within the interval (0, 0.5].")
+
+    confidence_level = preview_config.get("confidence_level", 0.95)
+    if not isinstance(confidence_level, float) or not 0 < confidence_level < 1:
+        log_and_raise_error("Invalid 'confidence_level': must be a float within the interval (0, 1).")
+
+    sampling = preview_config.get("sampling", "random")
+    if sampling not in PREVIEW_SAMPLING_METHODS:
+        log_and_raise_error(f"Invalid 'sampling': must be one of {PREVIEW_SAMPLING_METHODS}.")
+
+    strata = preview_config.get("strata", "1h")
+    try:
+        strata_seconds = parse_timedelta(strata).total_seconds() if isinstance(strata, str) else 0
+    except ValueError:
+        strata_seconds = 0
+    if not strata_seconds > 0:
+        log_and_raise_error("Invalid 'strata': must be a positive fixed pandas offset string (e.g., '1h').")
+
+    seed = preview_config.get("seed", 0)
+    if not isinstance(seed, int) or isinstance(seed, bool) or seed < 0:
+        log_and_raise_error("Invalid 'seed': must be a non-negative integer.")
+
+def validate_incremental(incremental_config):
+    """
+  This function validates the incremental section of the configuration.
+  """
+    if not isinstance(incremental_config, dict):
+        log_and_raise_error("Invalid 'incremental': a section with a 'state_file' must be provided for the 'incremental' mode.")
+
+    state_file = incremental_config.get("state_file")
+    if not isinstance(state_file, str) or not state_file.strip():
+        log_and_raise_error("Invalid 'state_file': must be a non-empty string.")
+
+def validate_rolling_window(rolling_window_config):
+    """
+  This function validates the rolling_window section of the configuration.
+  """
+    if not isinstance(rolling_window_config, dict):
+        log_and_raise_error("Invalid 'rolling_window': a section with a 'window' and a 'step' must be provided for the 'rolling_window' mode.")
+
+    for key in ["window", "step"]:
+        value = rolling_window_config.get(key)
+        try:
+            # a missing offset would be parsed as NaT, which is neither positive nor negative
+            if not isinstance(value, str) or not parse_timedelta(value) > timedelta(0):
+                raise ValueError
+        except (ValueError, TypeError):
+            log_and_raise_error(f"Invalid '{key}': must be a positive pandas offset string (e.g., '7D', '1D').")
+
+def validate_batch(batch_config):
+    """
+  This function validates the batch section of the configuration (a list of "single_day"/"time_range" jobs).
+  """
+    if not isinstance(batch_config, dict) or not isinstance(batch_config.get("jobs"), list) or not batch_config["jobs"]:
+        log_and_raise_error("Invalid 'batch': a section with a non-empty list of 'jobs' must be provided for the 'batch' mode.")
+
+    max_workers = batch_config.get("max_workers")
+    if max_workers is not None and (not isinstance(max_workers, int) or max_workers <= 0):
+        log_and_raise_error("Invalid 'max_workers': must be a positive integer or None.")
+
+    job_names = []
+    for index, job in enumerate(batch_config["jobs"]):
+        if not isinstance(job, dict):
+            log_and_raise_error(f"Invalid batch job {index}: must be a dictionary with 'date' or 'start_date' and 'end_date'.")
+
+        date, start_date, end_date = job.get("date"), job.get("start_date"), job.get("end_date")
+        if date and not start_date and not end_date:
+            validate_date_format(date, "date")
+        elif start_date and end_date and not date:
+            validate_date_format(start_date, "start_date")
+            validate_date_format(end_date, "end_date")
+        else:
+            log_and_raise_error(f"Invalid batch job {index}: must have either a 'date' or both 'start_date' and 'end_date'.")
+
+        name = job.get("name")
+        if name is not None and (not isinstance(name, str) or not name.strip() or "/" in name or "\\" in name):
+            log_and_raise_error(f"Invalid batch job {index}: 'name' must be a non-empty string without path separators.")
+        job_names.append(name or date or f"{start_date}_{end_date}")
+
+    duplicated_names = sorted({name for name in job_names if job_names.count(name) > 1})
+    if duplicated_names:
+        log_and_raise_error(f"Invalid 'batch': the job names must be unique, duplicated: {duplicated_names}.")
+
+def validate_per_day(per_day_config):
+    """
+  This function validates the optional per_day section of the configuration.
+  """
+    if per_day_config is None:
+        return
+    if not isinstance(per_day_config, dict):
+        log_and_raise_error("Invalid 'per_day': must be a dictionary (e.g., with 'max_workers').")
+
+    max_workers = per_day_config.get("max_workers")
+    if max_workers is not None and (not isinstance(max_workers, int) or max_workers <= 0):
+        log_and_raise_error("Invalid 'max_workers': must be a positive integer or None.")
+
+def validate_full_data(full_data_config):
+    """
+  This function validates the optional full_data section of the configuration.
+  """
+    if not isinstance(full_data_config, dict):
+        log_and_raise_error("Invalid 'full_data': must be a dictionary with 'start', 'end', 'chunk_size' and/or 'prefetch_chunks'.")
+
+    bounds = {}
+    for key in ["start", "end"]:
+        value = full_data_config.get(key)
+        if value is None:
+            continue
+        try:
+            bounds[key] = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            log_and_raise_error(f"Invalid '{key}': must be a 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' string.")
+    if len(bounds) == 2 and bounds["start"] > bounds["end"]:
+        log_and_raise_error("Invalid 'full_data': 'start' must not be after 'end'.")
+
+    chunk_size = full_data_config.get("chunk_size")
+    if chunk_size is not None and (isinstance(chunk_size, bool) or not isinstance(chunk_size, int) or chunk_size <= 0):
+        log_and_raise_error("Invalid 'chunk_size': must be a positive integer or None.")
+
+    prefetch_chunks = full_data_config.get("prefetch_chunks")
+    if prefetch_chunks is not None and (isinstance(prefetch_chunks, bool) or not isinstance(prefetch_chunks, int) or prefetch_chunks < 0):
+        log_and_raise_error("Invalid 'prefetch_chunks': must be a non-negative integer (0 reads and filters the chunks one after the other).")
+
+def validate_stage_cache(stage_cache_config):
+    """
+  This function validates the optional stage_cache section of the configuration.
+  """
+    if not isinstance(stage_cache_config, dict):
+        log_and_raise_error("Invalid 'stage_cache': must be a dictionary with a 'cache_dir' and an optional 'max_size_mb'.")
+
+    cache_dir = stage_cache_config.get("cache_dir")
+    if not isinstance(cache_dir, str) or not cache_dir.strip():
+        log_and_raise_error("Invalid 'cache_dir': must be a non-empty string.")
+
+    max_size_mb = stage_cache_config.get("max_size_mb")
+    if max_size_mb is not None and (isinstance(max_size_mb, bool) or not isinstance(max_size_mb, (int, float)) or max_size_mb <= 0):
+        log_and_raise_error("Invalid 'max_size_mb': must be a positive number or None.")
+
+def validate_instrumentation(instrumentation_config):
+    """
+  This function validates the optional instrumentation section of the configuration.
+  """
+    if not isinstance(instrumentation_config, dict):
+        log_and_raise_error("Invalid 'instrumentation': must be a dictionary with 'run_report' and/or 'trace_memory'.")
+
+    for key in ["run_report", "trace_memory"]:
+        if key in instrumentation_config and not isinstance(instrumentation_config[key], bool):
+            log_and_raise_error(f"Invalid '{key}': must be a boolean.")
+
+def validate_profiling(profiling_config):
+    """
+  This function validates the optional profiling section of the configuration.
+  """
+    if not isinstance(profiling_config, dict):
+        log_and_raise_error("Invalid 'profiling': must be a dictionary with 'enabled', 'per_stage' and/or 'sample_interval'.")
+
+    for key in ["enabled", "per_stage"]:
+        if key in profiling_config and not isinstance(profiling_config[key], bool):
+            log_and_raise_error(f"Invalid '{key}': must be a boolean.")
+
+    sample_interval = profiling_config.get("sample_interval")
+    if sample_interval is not None and (isinstance(sample_interval, bool) or not isinstance(sample_interval, (int, float)) or sample_interval <= 0):
+        log_and_raise_error("Invalid 'sample_interval': must be a positive number of seconds.")
+
+def validate_output(output_config):
+    """
+  This function validates the optional output section of the configuration.
+  """
+    if not isinstance(output_config, dict):
+        log_and_raise_error("Invalid 'output': must be a dictionary with 'format', 'compression', 'background', 'processed_data' and/or 'mining_data'.")
+
+    file_format = output_config.get("format", "csv")
+    if file_format not in OUTPUT_COMPRESSIONS:
+        log_and_raise_error(f"Invalid 'format': must be one of {list(OUTPUT_COMPRESSIONS)}.")
+
+    compression = output_config.get("compression")
+    if compression is not None and compression not in OUTPUT_COMPRESSIONS[file_format]:
+        log_and_raise_error(f"Invalid 'compression' for the '{file_format}' format: must be one of {OUTPUT_COMPRESSIONS[file_format]} or None.")
+
+    for key in ["background", "processed_data", "mining_data"]:
+        if key in output_config and not isinstance(output_config[key], bool):
+            log_and_raise_error(f"Invalid '{key}': must be a boolean.")
+
+def validate_memory(memory_config):
+    """
+  This function validates the optional memory section of the configuration.
+  """
+    if not isinstance(memory_config, dict):
+        log_and_raise_error("Invalid 'memory': must be a dictionary with 'max_memory' and an optional 'spill_dir'.")
+
+    max_memory = memory_config.get("max_memory")
+    if isinstance(max_memory, str):
+        match = MEMORY_SIZE_PATTERN.match(max_memory.strip())
+        if not match or float(match.group(1)) <= 0:
+            log_and_raise_error(f"Invalid 'max_memory': '{max_memory}', must be a positive size in MB or GB (e.g., '512MB' or '4GB').")
+    elif isinstance(max_memory, bool) or not isinstance(max_memory, (int, float)) or max_memory <= 0:
+        log_and_raise_error("Invalid 'max_memory': must be a positive number of MB or a size string (e.g., '4GB').")
+
+    spill_dir = memory_config.get("spill_dir")
+    if spill_dir is not None and (not isinstance(spill_dir, str) or not spill_dir.strip()):
+        log_and_raise_error("Invalid 'spill_dir': must be a non-empty string or None.")
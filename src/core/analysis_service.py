@@ -0,0 +1,220 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.mode_runner import prepare_inputs
+from core.rule_mining import mine_and_save_rules, mine_and_save_preview_rules
+from config.validate_config import validate_config
+from config.config_loader import get_full_data_input, get_preview_input, get_output_input, get_memory_input
+from utils.stage_cache import file_fingerprint
+from utils.output_writer import thread_output_writer, get_output_writer
+from utils.logging_setup import initialize_logging, log_and_raise_error
+from data_manager.data_processing import DataProcessor
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+
+SERVICE_MODES = ["single_day", "time_range", "full_data"]
+
+class AnalysisService:
+    """
+  This class runs analysis requests (configs with the same schema as "config.yaml") in a long-running process.
+  The cleaned datasets are kept in an LRU cache keyed by the input file fingerprint (path, size, modification time)
+  and the preprocessing parameters, so a repeated request (e.g., with other rule mining thresholds) skips the loading
+  and cleaning steps. A changed input file gets a new fingerprint, so stale datasets are never used. Only one request
+  loads a dataset, the concurrent requests for the same dataset wait for it and get it from the cache.
+  """
+    def __init__(self, cache_size=8):
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._output_locks = defaultdict(threading.Lock)
+        self._loading_locks = defaultdict(threading.Lock)
+
+    def analyze(self, config):
+        """
+      This method validates a config, gets the cleaned data (from the cache if possible), mines the rules and
+      writes the usual outputs in the output directory. It returns a JSON serializable summary of the request.
+      """
+        start_time = time.perf_counter()
+        if not isinstance(config, dict):
+            log_and_raise_error("Invalid request: the body must be a JSON object with the config.yaml schema.")
+
+        # step 1: validate the config and get the inputs of its mode
+        validate_config(config)
+        mode = config["mode"]
+        if mode not in SERVICE_MODES:
+            log_and_raise_error(f"Invalid 'mode' for the service: '{mode}', must be one of {SERVICE_MODES}.")
+        if get_memory_input(config)[0] is not None:
+            # the budget is checked against the memory of the whole process, which the requests and the cache share
+            log_and_raise_error("Invalid request: 'memory.max_memory' is not supported by the service, run the analysis with main.py or the job scheduler instead.")
+
+        input_file, output_dir, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, rule_mining_processing_par = prepare_inputs(config, mode)
+        if not rule_mining_processing_par:
+            log_and_raise_error("Invalid request: the 'pre_processing.rule_mining' section is required by the service.")
+        full_data_bounds = get_full_data_input(config) if mode == "full_data" else None
+        preview = get_preview_input(config)
+
+        # the output settings of the request (format, compression, disabled outputs) apply to its thread only
+        with thread_output_writer(*get_output_input(config)) as output_writer:
+            # the requests with the same output directory write their outputs one after the other
+            dataset_key = self.get_dataset_key(input_file, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, full_data_bounds)
+            with self._output_locks[os.path.abspath(output_dir)]:
+                # step 2: get the cleaned data, only a cache miss loads and cleans the input file
+                processed_data, cached = self.get_processed_data(dataset_key, input_file, output_dir, time_column, time_format, sensors, date_range,
+                                                                 core_processing_par, time_processing_par, full_data_bounds)
+
+                # step 3: mine the rules (the cached data is copied, so the rule mining steps never change it)
+                model_file = rule_mining_processing_par[7]
+                discretization_model = DiscretizationModel.load(model_file, rule_mining_processing_par[:3]) if model_file else None
+                if preview:
+                    formatted_rules = mine_and_save_preview_rules(processed_data.copy(), output_dir, sensors, time_column, rule_mining_processing_par, discretization_model, preview)
+                else:
+                    formatted_rules = mine_and_save_rules(processed_data.copy(), output_dir, sensors, time_column, rule_mining_processing_par, discretization_model)
+                # the background writes finish before another request can write in the same output directory
+                output_writer.wait()
+
+        elapsed_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        logging.info(f"Service request for mode '{mode}' done in {elapsed_ms} ms (cached dataset: {cached}).")
+        # the preview rules start with a header line
+        rule_lines = formatted_rules.split("\n")[1:] if preview else formatted_rules.split("\n")
+        rules = [] if rule_lines[0].startswith("No valid") else rule_lines
+        return {"mode": mode, "cached": cached, "preview": bool(preview), "rows": len(processed_data), "rule_count": len(rules), "rules": rules,
+                "output_dir": str(output_dir), "elapsed_ms": elapsed_ms}
+
+    def get_dataset_key(self, input_file, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, full_data_bounds=None):
+        """
+      This method builds the cache key of a cleaned dataset from the input file fingerprint and the preprocessing parameters.
+      The chunk size of a bounded full_data read does not change the cleaned data, so only its bounds are part of the key.
+      """
+        try:
+            fingerprint = file_fingerprint(input_file)
+        except OSError as e:
+            log_and_raise_error(f"Input file {input_file} can not be read: {e}")
+
+        key_data = {"file": fingerprint, "time_column": time_column, "time_format": time_format, "sensors": sensors, "date_range": date_range,
+                    "full_data_bounds": full_data_bounds[:2] if full_data_bounds else None, "core_processing_par": core_processing_par, "time_processing_par": time_processing_par}
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_processed_data(self, dataset_key, input_file, output_dir, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, full_data_bounds=None):
+        """
+      This method returns the cleaned dataset of a key and whether it came from the cache, the processed data is written
+      in "output_dir" in both cases. On a cache miss the data is loaded (only the rows within "full_data_bounds" in the
+      full_data mode) and cleaned, then stored, and the least recently used datasets are evicted above "cache_size".
+      """
+        with self._cache_lock:
+            loading_lock = self._loading_locks[dataset_key]
+
+        # only one request loads a dataset, the others wait for it and get it from the cache
+        with loading_lock:
+            with self._cache_lock:
+                processed_data = self._cache.get(dataset_key)
+                if processed_data is not None:
+                    self._cache.move_to_end(dataset_key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            if processed_data is not None:
+                # the outputs of a request do not depend on the cache
+                get_output_writer().write(processed_data, output_dir, "processed_data")
+                return processed_data, True
+
+            data_processor = DataProcessor(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par)
+            if date_range:
+                _, _, processed_data = data_processor.process_time_range(*date_range)
+            else:
+                _, _, processed_data = data_processor.process_full_data(*(full_data_bounds or ()))
+
+            with self._cache_lock:
+                self._cache[dataset_key] = processed_data
+                self._cache.move_to_end(dataset_key)
+                while len(self._cache) > self.cache_size:
+                    evicted_key, _ = self._cache.popitem(last=False)
+                    self._loading_locks.pop(evicted_key, None)
+                    logging.info(f"Dataset {evicted_key[:12]} evicted from the service cache.")
+        return processed_data, False
+
+    def get_status(self):
+        """
+      This method returns the cache statistics of the service.
+      """
+        with self._cache_lock:
+            return {"cached_datasets": len(self._cache), "cache_size": self.cache_size, "hits": self.hits, "misses": self.misses}
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+  This class handles the HTTP requests of the service: "POST /analyze" with a JSON config and "GET /status".
+  """
+    def do_GET(self):
+        if self.path == "/status":
+            self._send_json(200, self.server.service.get_status())
+        else:
+            self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+            return
+
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+            config = json.loads(self.rfile.read(content_length) or b"null")
+            self._send_json(200, self.server.service.analyze(config))
+        except ValueError as e:
+            # invalid JSON and config validation errors
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            logging.exception("The service request failed.")
+            self._send_json(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        logging.info(f"Service request from {self.address_string()}: {format % args}")
+
+    # --- Helper Methods ---
+    def _send_json(self, status, data):
+        """
+      This helper method sends a JSON response.
+      """
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def create_server(host="127.0.0.1", port=8765, cache_size=8):
+    """
+  This function creates the HTTP server of the service (port 0 picks a free port), the requests are handled in threads.
+  """
+    server = ThreadingHTTPServer((host, port), AnalysisRequestHandler)
+    server.service = AnalysisService(cache_size)
+    return server
+
+def main():
+    """
+  This function starts the service, it runs until it is interrupted (e.g., with Ctrl+C).
+  """
+    parser = argparse.ArgumentParser(description="Run DataSense as a local HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765).")
+    parser.add_argument("--cache-size", type=int, default=8, help="Number of cleaned datasets kept in memory (default: 8).")
+    args = parser.parse_args()
+
+    initialize_logging(level="INFO")
+    server = create_server(args.host, args.port, args.cache_size)
+    logging.info(f"DataSense service listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("DataSense service stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.file_management import create_output_dir
+from core.rule_mining import mine_and_save_rules
+from data_manager.data_processing import DataProcessor
+from data_manager.prepare_data.get_full_data import FullDataLoader
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+
+def run_batch(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, jobs, max_workers):
+    """
+  This function runs many "single_day"/"time_range" jobs in one process. The needed columns are loaded and the time
+  column is processed only once, every job gets its rows from the sorted time column, and the jobs are cleaned and
+  mined in a worker pool. Every job writes its outputs in "output_dir/<job name>", and a summary of all the jobs is written
+  in "batch_summary.json".
+  """
+    # step 1: load the shared dataset once and sort it by time
+    sensors_combined = [sensor for division in sensors.values() for sensor in division]
+    data_loader = FullDataLoader(input_file, sensors_combined, time_column, time_format, time_processing_par)
+    data = data_loader.get_filtered_data()
+    data = data.sort_values(by=time_column, kind="stable").reset_index(drop=True)
+    times = pd.to_datetime(data[time_column]).to_numpy(dtype="datetime64[ns]")
+    logging.info(f"Shared dataset loaded with {len(data)} rows for {len(jobs)} batch jobs.")
+
+    # step 2: the bin edges are shared only if the model file exists, the jobs do not write it concurrently
+    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, model_file, sample_size = rule_mining_processing_par
+    discretization_model = DiscretizationModel.load(model_file, (method, bins, labels)) if model_file else None
+    if model_file and discretization_model is None:
+        logging.warning(f"The discretization model file {model_file} does not exist (or has other settings), every batch job fits its own bin edges and the file is not written.")
+    job_rule_mining_par = [method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, None, sample_size]
+
+    # step 3: run the jobs (in a worker pool if more than one worker is allowed)
+    job_arguments = []
+    outcomes = {}
+    for job_name, date_range in jobs:
+        job_data = select_date_range(data, times, date_range)
+        if job_data.empty:
+            message = f"No data found for the batch job '{job_name}' ({date_range[0]} to {date_range[1] or date_range[0]})."
+            logging.warning(message)
+            outcomes[job_name] = {"status": "failed", "error": message}
+            continue
+        job_output_dir = os.path.join(output_dir, job_name)
+        job_arguments.append((job_name, job_data, job_output_dir, time_column, time_format, sensors, core_processing_par,
+                              time_processing_par, job_rule_mining_par, discretization_model))
+
+    if max_workers == 1 or len(job_arguments) <= 1:
+        for arguments in job_arguments:
+            outcomes[arguments[0]] = _run_job_safely(*arguments)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_run_job_safely, *arguments): arguments[0] for arguments in job_arguments}
+            for future in as_completed(futures):
+                try:
+                    outcomes[futures[future]] = future.result()
+                except Exception as e:
+                    # the worker itself failed (e.g., it was killed), the jobs it broke are reported as failed
+                    logging.error(f"The worker of the batch job '{futures[future]}' failed: {e!r}")
+                    outcomes[futures[future]] = {"status": "failed", "error": repr(e)}
+
+    # step 4: write the summary of all the jobs (in the order of the config)
+    summary = [{"job": job_name, "start": date_range[0], "end": date_range[1], **outcomes[job_name]} for job_name, date_range in jobs]
+    summary_file = os.path.join(output_dir, "batch_summary.json")
+    with open(summary_file, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    failed_jobs = [job["job"] for job in summary if job["status"] != "succeeded"]
+    logging.info(f"Batch finished: {len(summary) - len(failed_jobs)} jobs succeeded, {len(failed_jobs)} failed. Summary saved in {summary_file}")
+    return summary
+
+def select_date_range(data, times, date_range):
+    """
+  This function returns the rows of a time sorted dataset for a date range, with the same bounds as the PartialDataLoader:
+  a single date selects the whole day, a range selects the rows from "start_date" up to "end_date" (both included).
+  """
+    start_date, end_date = date_range
+    start_date = pd.to_datetime(start_date)
+    end_date = pd.to_datetime(end_date) if end_date else start_date + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+
+    start_row = int(np.searchsorted(times, start_date.to_datetime64(), side="left"))
+    end_row = int(np.searchsorted(times, end_date.to_datetime64(), side="right"))
+    return data.iloc[start_row:end_row].reset_index(drop=True)
+
+def run_batch_job(job_name, job_data, job_output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, discretization_model=None):
+    """
+  This function cleans the rows of one batch job and generates its rules in the job output directory.
+  """
+    logging.info(f"Starting the batch job '{job_name}' with {len(job_data)} rows.")
+    create_output_dir(job_output_dir)
+
+    data_processor = DataProcessor(None, job_output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par)
+    _, _, processed_data = data_processor.process_loaded_data(job_data)
+    formatted_rules = mine_and_save_rules(processed_data, job_output_dir, sensors, time_column, rule_mining_processing_par, discretization_model)
+
+    return len(processed_data), formatted_rules
+
+def _run_job_safely(job_name, *arguments):
+    """
+  This helper function runs a batch job and returns its outcome, so a failing job does not stop the others.
+  """
+    try:
+        rows, formatted_rules = run_batch_job(job_name, *arguments)
+        rule_count = 0 if formatted_rules.startswith("No valid") else formatted_rules.count("\n") + 1
+        return {"status": "succeeded", "rows": rows, "rules": rule_count}
+    except Exception as e:
+        logging.error(f"The batch job '{job_name}' failed: {e}")
+        return {"status": "failed", "error": str(e)}
@@ -0,0 +1,180 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from utils.logging_setup import log_and_raise_error
+from data_manager.data_processing import DataProcessor
+from data_manager.preprocessing.item_dictionary import ItemDictionary
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+from core.rule_mining import count_transactions, mine_frequent_itemsets_from_counts, generate_association_rules, format_rules_output
+
+class IncrementalMiningState:
+    """
+  This class holds everything needed to update the rules without mining the full history again: the watermark
+  (last processed timestamp) and the number of rows at the watermark already processed, the transaction count, the fixed discretization model (bin edges), the item names,
+  and the support count of every distinct transaction itemset seen so far.
+  """
+    VERSION = 2
+
+    def __init__(self, settings, watermark=None, transaction_count=0, discretization_model=None, items=None, itemset_counts=None, watermark_rows=None):
+        self.settings = settings
+        self.watermark = watermark
+        self.watermark_rows = watermark_rows
+        self.transaction_count = transaction_count
+        self.discretization_model = discretization_model
+        self.items = items or []
+        self.itemset_counts = defaultdict(int, itemset_counts or {})
+
+    @classmethod
+    def load(cls, state_file):
+        """
+      This method loads the state saved by a previous run. It returns None if there is no state file yet.
+      """
+        if not os.path.exists(state_file):
+            logging.info(f"No incremental state found at {state_file}, the full data will be mined.")
+            return None
+
+        try:
+            with open(state_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log_and_raise_error(f"Failed to read the incremental state file {state_file}: {e}")
+
+        if data.get("version") != cls.VERSION:
+            log_and_raise_error(f"Unsupported incremental state version {data.get('version')} in {state_file}.")
+
+        itemset_counts = {tuple(itemset): count for itemset, count in data["itemset_counts"]}
+        discretization_model = DiscretizationModel.from_dict(data["discretization_model"]) if data["discretization_model"] else None
+        logging.info(f"Incremental state loaded from {state_file} (watermark: {data['watermark']}, transactions: {data['transaction_count']}).")
+        return cls(data["settings"], data["watermark"], data["transaction_count"], discretization_model, data["items"], itemset_counts,
+                   data.get("watermark_rows"))
+
+    def save(self, state_file):
+        """
+      This method saves the state as JSON, the file is replaced atomically so a failed run never leaves a partial state behind.
+      """
+        data = {
+            "version": self.VERSION,
+            "settings": self.settings,
+            "watermark": self.watermark,
+            "watermark_rows": self.watermark_rows,
+            "transaction_count": self.transaction_count,
+            "discretization_model": self.discretization_model.to_dict() if self.discretization_model is not None else None,
+            "items": self.items,
+            "itemset_counts": [[list(itemset), count] for itemset, count in self.itemset_counts.items()]}
+
+        temp_file = f"{state_file}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_file, state_file)
+        logging.info(f"Incremental state saved in {state_file}.")
+
+    def advance_watermark(self, loaded_times):
+        """
+      This method moves the watermark to the last timestamp of the loaded rows (before the cleaning drops any) and counts
+      the rows at that timestamp, so the rows appended later with the same timestamp are still processed by the next run.
+      """
+        if loaded_times is None or len(loaded_times) == 0:
+            return
+
+        watermark = pd.Timestamp(loaded_times.max())
+        watermark_rows = int(np.count_nonzero(loaded_times == loaded_times.max()))
+        if self.watermark is not None and self.watermark_rows is not None and pd.to_datetime(self.watermark) == watermark:
+            watermark_rows += self.watermark_rows
+        self.watermark = str(watermark)
+        self.watermark_rows = watermark_rows
+
+    def add_transactions(self, columns, unique_transactions, counts):
+        """
+      This method adds the counts of the unique transactions of a new chunk. New items are appended to the item list,
+      so the item IDs of the previous runs never change.
+      """
+        item_positions = {item: position for position, item in enumerate(self.items)}
+        for column in columns:
+            if column not in item_positions:
+                item_positions[column] = len(self.items)
+                self.items.append(column)
+        item_ids = np.array([item_positions[column] for column in columns], dtype=np.int64)
+
+        for transaction, count in zip(unique_transactions, counts):
+            itemset = tuple(sorted(int(item_id) for item_id in item_ids[transaction]))
+            self.itemset_counts[itemset] += int(count)
+        self.transaction_count += int(np.sum(counts))
+
+    def to_transactions(self):
+        """
+      This method returns the stored itemsets as unique boolean transactions (one column per item) and their counts.
+      """
+        unique_transactions = np.zeros((len(self.itemset_counts), len(self.items)), dtype=bool)
+        counts = np.zeros(len(self.itemset_counts), dtype=np.int64)
+        for row, (itemset, count) in enumerate(self.itemset_counts.items()):
+            unique_transactions[row, list(itemset)] = True
+            counts[row] = count
+        return unique_transactions, counts
+
+def get_incremental_rules(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, state_file):
+    """
+  This function updates the rules with the rows appended since the last run. Only the new rows are loaded, cleaned
+  and discretized (with the bin edges of the first run), their transaction counts are added to the saved state,
+  and the rules are generated again from the updated counts.
+  The new rows are cleaned without the rows of the previous runs: a forward fill or an interpolation can not use the
+  last value of the previous run, and the mean fill and the outlier check use the statistics of the new rows only.
+  """
+    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, model_file, sample_size = rule_mining_processing_par
+    settings = {"time_column": time_column, "sensors": sensors, "method": method, "bins": bins, "labels": labels,
+                "continuous_sensor_types": continuous_sensor_types}
+
+    # step 1: load the previous state, a state created with other settings can not be reused
+    state = IncrementalMiningState.load(state_file)
+    if state is not None and state.settings != settings:
+        logging.warning("The sensors or the discretization settings changed since the last run, the full data will be mined again.")
+        state = None
+
+    # step 2: load and clean only the rows appended after the watermark
+    data_processor = DataProcessor(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par)
+    if state is None:
+        # the first run fixes the bin edges, a configured discretization model file is used if it exists
+        state = IncrementalMiningState(settings, discretization_model=DiscretizationModel.load(model_file, (method, bins, labels)) if model_file else None)
+        _, _, processed_data = data_processor.process_full_data()
+    else:
+        new_data = data_processor.process_data_after(state.watermark, state.watermark_rows)
+        processed_data = new_data[2] if new_data is not None else None
+
+    # step 3: discretize the new rows with the fixed bin edges and add their transaction counts to the state
+    if processed_data is not None:
+        state.advance_watermark(data_processor.loaded_times)
+    if processed_data is not None and not processed_data.empty:
+        rule_mining_processor = RuleMiningProcessor(processed_data, sensors, time_column, state.discretization_model)
+        discretize_data = rule_mining_processor.advanced_preprocessing(method, bins, labels, continuous_sensor_types, sample_size)
+
+        unique_transactions, counts = count_transactions(discretize_data)
+        state.add_transactions([str(column) for column in discretize_data.columns], unique_transactions, counts)
+        state.discretization_model = rule_mining_processor.discretization_model
+        logging.info(f"Added {len(discretize_data)} new transactions ({len(counts)} unique), total transactions: {state.transaction_count}.")
+
+    # step 4: generate the rules again from the updated counts
+    unique_transactions, counts = state.to_transactions()
+    frequent_itemsets = mine_frequent_itemsets_from_counts(unique_transactions, counts, min_support, state.transaction_count)
+    if frequent_itemsets.empty:
+        logging.warning("No frequent itemsets were found. Consider lowering min_support.")
+        rules = frequent_itemsets
+    else:
+        logging.info(f"Number of frequent itemsets found: {len(frequent_itemsets)}")
+        rules = generate_association_rules(frequent_itemsets, min_confidence, min_lift)
+
+    bin_edges = state.discretization_model.bin_edges if state.discretization_model is not None else {}
+    bin_labels = state.discretization_model.bin_labels if state.discretization_model is not None else {}
+    item_dictionary = ItemDictionary.from_columns(state.items, sensors, bin_edges, bin_labels)
+    formatted_rules = format_rules_output(rules, item_dictionary)
+
+    # step 5: write the rules and save the updated state for the next run
+    mining_rules_file = os.path.join(output_dir, "generated_rules.txt")
+    with open(mining_rules_file, "w") as file:
+        file.write(formatted_rules)
+    logging.info(f"Formatted rules generated and saved in {mining_rules_file}")
+
+    state.save(state_file)
+    return formatted_rules
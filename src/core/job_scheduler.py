@@ -0,0 +1,227 @@
+import os
+import copy
+import json
+import heapq
+import logging
+import argparse
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from core.mode_runner import run_analysis
+from config.config_loader import load_config, get_batch_input, get_per_day_input, get_memory_input
+from config.validate_config import validate_config
+from utils.logging_setup import initialize_logging
+from utils.memory_governor import estimate_decompressed_size
+
+# memory of a worker before it loads data (interpreter, pandas, mlxtend)
+JOB_BASE_MEMORY_MB = 200
+# memory per byte of the uncompressed CSV columns that are read (parsed frame, cleaned copy and transactions)
+MEMORY_PER_INPUT_BYTE = 8
+
+class JobScheduler:
+    """
+  This class runs many analyses (config files or configs with the "config.yaml" schema) on one host without
+  oversubscribing it. Every job gets a memory estimate from its input file size and the share of the columns it reads
+  (its sensors), and the jobs are started in the order of their priority (then of their submission) only while the
+  running jobs stay within the CPU and memory budgets. A job that does not fit waits for the running ones (the smaller
+  jobs behind it wait too, so it is never starved), and a job larger than the whole budget runs alone. The outcome
+  of every job and the queueing statistics are written in a summary file.
+  """
+    def __init__(self, max_cpus=None, max_memory_mb=None):
+        self.max_cpus = max_cpus or os.cpu_count() or 1
+        self.max_memory_mb = max_memory_mb or get_total_memory_mb()
+        self.jobs = []
+
+    def submit(self, job, priority=0, name=None, memory_mb=None):
+        """
+      This method adds a job (a config file path or a config dict) to the queue, the jobs with a higher priority start
+      first. The config is validated here, an invalid job is reported as failed without stopping the others. The
+      memory estimate can be replaced with "memory_mb". It returns the job entry of the summary.
+      """
+        index = len(self.jobs)
+        is_file = not isinstance(job, dict)
+        entry = {"job": name or (os.path.splitext(os.path.basename(job))[0] if is_file else f"job_{index + 1}"),
+                 "config_file": os.path.abspath(job) if is_file else None, "priority": priority}
+        try:
+            config = load_config(job) if is_file else copy.deepcopy(job)
+            validate_config(config)
+        except ValueError as e:
+            logging.error(f"The scheduled job '{entry['job']}' is invalid: {e}")
+            entry.update({"status": "failed", "error": str(e)})
+            self.jobs.append(entry)
+            return entry
+
+        entry.update({"mode": config["mode"], "cpus": get_job_cpus(config, self.max_cpus),
+                      "estimated_memory_mb": memory_mb or estimate_job_memory(config), "status": "queued"})
+        if config["mode"] in ["batch", "per_day"]:
+            # the job starts only the workers it was granted
+            config[config["mode"]] = {**(config.get(config["mode"]) or {}), "max_workers": entry["cpus"]}
+        entry["_config"], entry["_submitted"] = config, time.perf_counter()
+        self.jobs.append(entry)
+        logging.info(f"Job '{entry['job']}' queued with priority {priority} ({entry['mode']}, {entry['cpus']} CPUs, about {entry['estimated_memory_mb']} MB).")
+        return entry
+
+    def run(self, summary_file="scheduler_summary.json"):
+        """
+      This method runs the queued jobs in a worker pool and waits for them. It writes the summary (budgets, queueing
+      statistics and the outcome of every job, in the order of submission) in "summary_file" and returns it.
+      """
+        start_time = time.perf_counter()
+        pending = [(-job["priority"], index) for index, job in enumerate(self.jobs) if job["status"] == "queued"]
+        heapq.heapify(pending)
+        stats = {"max_queue_length": len(pending), "max_concurrent_jobs": 0, "peak_cpus": 0, "peak_memory_mb": 0}
+        logging.info(f"Scheduling {len(pending)} jobs with {self.max_cpus} CPUs and {self.max_memory_mb or 'unlimited'} MB.")
+
+        # step 1: start the jobs that fit in the budgets and wait for one of them to finish, until all the jobs ran
+        running = {}
+        used_cpus, used_memory_mb, start_order = 0, 0, 0
+        executor = ProcessPoolExecutor(max_workers=max(min(self.max_cpus, len(pending)), 1))
+        try:
+            while pending or running:
+                while pending:
+                    job = self.jobs[pending[0][1]]
+                    if running and not self._fits(job, used_cpus, used_memory_mb):
+                        break
+                    if not running and not self._fits(job, 0, 0):
+                        logging.warning(f"Job '{job['job']}' needs more than the budgets ({job['cpus']} CPUs, about {job['estimated_memory_mb']} MB), it runs alone.")
+                    heapq.heappop(pending)
+
+                    try:
+                        future = executor.submit(_run_job_safely, job["job"], job["_config"], job["mode"])
+                    except BrokenProcessPool:
+                        # a worker was killed (e.g., out of memory), the next jobs get a new pool
+                        executor.shutdown(wait=False)
+                        executor = ProcessPoolExecutor(max_workers=max(min(self.max_cpus, len(pending) + 1), 1))
+                        future = executor.submit(_run_job_safely, job["job"], job["_config"], job["mode"])
+
+                    start_order += 1
+                    job.update({"status": "running", "start_order": start_order, "queued_s": round(time.perf_counter() - job["_submitted"], 3)})
+                    job["_started"] = time.perf_counter()
+                    running[future] = job
+                    used_cpus += job["cpus"]
+                    used_memory_mb += job["estimated_memory_mb"]
+                    stats["max_concurrent_jobs"] = max(stats["max_concurrent_jobs"], len(running))
+                    stats["peak_cpus"] = max(stats["peak_cpus"], used_cpus)
+                    stats["peak_memory_mb"] = max(stats["peak_memory_mb"], used_memory_mb)
+                    logging.info(f"Job '{job['job']}' started ({len(running)} running, {len(pending)} queued).")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    used_cpus -= job["cpus"]
+                    used_memory_mb -= job["estimated_memory_mb"]
+                    try:
+                        job.update(future.result())
+                    except Exception as e:
+                        logging.error(f"The worker of job '{job['job']}' failed: {e!r}")
+                        job.update({"status": "failed", "error": repr(e)})
+                    job["run_s"] = round(time.perf_counter() - job.pop("_started"), 3)
+                    logging.info(f"Job '{job['job']}' {job['status']} in {job['run_s']} s.")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        # step 2: the queueing statistics and the summary file
+        queued_times = [job["queued_s"] for job in self.jobs if "queued_s" in job]
+        stats.update({"jobs": len(self.jobs), "succeeded": sum(job["status"] == "succeeded" for job in self.jobs),
+                      "failed": sum(job["status"] == "failed" for job in self.jobs),
+                      "mean_queued_s": round(sum(queued_times) / len(queued_times), 3) if queued_times else 0.0,
+                      "max_queued_s": max(queued_times, default=0.0), "elapsed_s": round(time.perf_counter() - start_time, 3)})
+        summary = {"max_cpus": self.max_cpus, "max_memory_mb": self.max_memory_mb, "stats": stats,
+                   "jobs": [{key: value for key, value in job.items() if not key.startswith("_")} for job in self.jobs]}
+        if summary_file:
+            with open(summary_file, "w") as f:
+                json.dump(summary, f, indent=2)
+            logging.info(f"Scheduler finished: {stats['succeeded']} jobs succeeded, {stats['failed']} failed. Summary saved in {summary_file}")
+        return summary
+
+    # --- Helper Methods ---
+    def _fits(self, job, used_cpus, used_memory_mb):
+        """
+      This helper method checks if a job can start next to the running jobs within the CPU and memory budgets.
+      """
+        if used_cpus + job["cpus"] > self.max_cpus:
+            return False
+        return self.max_memory_mb is None or used_memory_mb + job["estimated_memory_mb"] <= self.max_memory_mb
+
+def estimate_job_memory(config):
+    """
+  This function estimates the peak memory (in MB) of an analysis from the size of its input file and the share of its
+  columns that are read (the time column and the sensors). It is an upper bound for the modes that read only a date
+  range of the file. A job with a memory budget ("memory.max_memory") is kept within it by the memory governor, so it
+  is estimated at most at its budget.
+  """
+    input_file = config["input_file"]
+    max_memory_mb = get_memory_input(config)[0]
+    try:
+        input_bytes = estimate_decompressed_size(input_file)
+    except OSError:
+        # the job fails when it loads the file
+        return min(JOB_BASE_MEMORY_MB, max_memory_mb or JOB_BASE_MEMORY_MB)
+
+    sensor_count = sum(len(sensors or []) for sensors in config["sensors"].values())
+    column_share = 1.0
+    if not str(input_file).endswith((".xls", ".xlsx")):
+        try:
+            file_columns = len(pd.read_csv(input_file, nrows=0).columns)
+            column_share = min((sensor_count + 1) / max(file_columns, 1), 1.0)
+        except Exception as e:
+            logging.warning(f"The header of {input_file} can not be read ({e}), all its columns are counted.")
+    estimate_mb = JOB_BASE_MEMORY_MB + int(input_bytes * column_share * MEMORY_PER_INPUT_BYTE / 2**20)
+    return min(estimate_mb, max_memory_mb) if max_memory_mb else estimate_mb
+
+def get_job_cpus(config, max_cpus):
+    """
+  This function returns the number of CPUs used by an analysis: the workers of the batch and per_day modes (at most all
+  the CPUs of the budget, the submitted job is limited to them), one for the other modes.
+  """
+    if config["mode"] == "batch":
+        return min(get_batch_input(config)[1], max_cpus)
+    if config["mode"] == "per_day":
+        return min(get_per_day_input(config), max_cpus)
+    return 1
+
+def get_total_memory_mb():
+    """
+  This function returns the physical memory of the host in MB, or None if it is not known (no memory budget).
+  """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2**20
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def main():
+    """
+  This function runs the jobs of the command line (config files with an optional priority) and exits with 1 if a job failed.
+  """
+    parser = argparse.ArgumentParser(description="Run many DataSense analyses within CPU and memory budgets.")
+    parser.add_argument("configs", nargs="*", help="Config files of the jobs (priority 0).")
+    parser.add_argument("--job", nargs=2, action="append", default=[], metavar=("CONFIG", "PRIORITY"), help="Config file of a job with its priority (higher first).")
+    parser.add_argument("--max-cpus", type=int, default=None, help="CPU budget of the running jobs (default: number of CPUs).")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="Memory budget of the running jobs in MB (default: physical memory).")
+    parser.add_argument("--summary", default="scheduler_summary.json", help="Summary file (default: scheduler_summary.json).")
+    args = parser.parse_args()
+
+    initialize_logging(level="INFO")
+    scheduler = JobScheduler(args.max_cpus, args.max_memory_mb)
+    for config_file in args.configs:
+        scheduler.submit(config_file)
+    for config_file, priority in args.job:
+        scheduler.submit(config_file, int(priority))
+    summary = scheduler.run(args.summary)
+    return 0 if summary["stats"]["failed"] == 0 else 1
+
+# --- Helper Functions ---
+def _run_job_safely(job_name, config, mode):
+    """
+  This helper function runs one analysis in a worker process and returns its outcome, so a failing job does not stop the others.
+  """
+    try:
+        run_analysis(config, mode)
+        return {"status": "succeeded"}
+    except Exception as e:
+        logging.error(f"The scheduled job '{job_name}' failed: {e}")
+        return {"status": "failed", "error": str(e)}
+
+if __name__ == "__main__":
+    raise SystemExit(main())
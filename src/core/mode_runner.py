@@ -1,10 +1,20 @@
 import os
 import sys
 import logging
+from contextlib import nullcontext
 from core.rule_mining import get_rules
+from core.batch_runner import run_batch
+from core.per_day_mining import get_per_day_rules
+from core.window_mining import get_window_rules
+from core.incremental_mining import get_incremental_rules
+from utils.instrumentation import start_run_report, finish_run_report
+from utils.profiling import profile_block, start_stage_profiling, stop_stage_profiling
+from utils.logging_setup import get_session_log_dir
+from utils.output_writer import configure_output_writer, finish_output_writer
+from utils.memory_governor import configure_memory_governor, finish_memory_governor
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from config.config_loader import get_yaml_input
+from config.config_loader import get_yaml_input, get_incremental_input, get_rolling_window_input, get_batch_input, get_per_day_input, get_full_data_input, get_preview_input, get_stage_cache_input, get_instrumentation_input, get_profiling_input, get_output_input, get_memory_input
 
 def run_analysis(config, mode):
     """
@@ -16,12 +26,73 @@ def run_analysis(config, mode):
         logging.info(f"Starting analysis for one day: {date_range[0]}.")
     elif mode == "time_range":
         logging.info(f"Starting analysis from {date_range[0]} to {date_range[1]}.")
+    elif mode == "incremental":
+        logging.info("Starting incremental analysis for the newly appended data.")
+    elif mode == "rolling_window":
+        logging.info("Starting rolling window analysis for full data.")
+    elif mode == "batch":
+        logging.info("Starting batch analysis for the configured jobs.")
+    elif mode == "per_day":
+        logging.info("Starting per-day analysis for full data.")
     else:  
         # full_data
         logging.info("Starting analysis for full data.")
 
-    if rule_mining_processing_par:
-        get_rules(input_file, output_dir, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, rule_mining_processing_par)
+    # the output format, the background writing and the disabled outputs of the run
+    configure_output_writer(*get_output_input(config))
+
+    # the optional memory budget, the steps that do not fit in it degrade to leaner paths
+    configure_memory_governor(*get_memory_input(config))
+
+    # the stages are measured and written in "run_report.json" (also if the run fails)
+    run_report, trace_memory = get_instrumentation_input(config)
+    if run_report:
+        start_run_report(mode, trace_memory)
+
+    # optional profiling of the whole run (or of every top-level stage), the profiles are saved in the session log dir
+    profiling_enabled, per_stage, sample_interval = get_profiling_input(config)
+    profile_dir = get_session_log_dir() or output_dir
+    run_profile = nullcontext()
+    if profiling_enabled and per_stage and run_report:
+        start_stage_profiling(profile_dir, sample_interval)
+    elif profiling_enabled:
+        if per_stage:
+            logging.warning("Profiling every stage needs the run report, the whole run is profiled instead.")
+        run_profile = profile_block(profile_dir, f"run_{mode}", sample_interval)
+
+    # the preview mines a sample of the cleaned data (only in the modes that mine one time range)
+    preview = get_preview_input(config)
+    if preview and mode in ["incremental", "rolling_window", "batch", "per_day"]:
+        logging.warning(f"The rule mining preview is not supported by the {mode} mode, all the rows are mined.")
+
+    try:
+        with run_profile:
+            if rule_mining_processing_par and mode == "incremental":
+                state_file = get_incremental_input(config)
+                get_incremental_rules(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, state_file)
+            elif rule_mining_processing_par and mode == "rolling_window":
+                window, step = get_rolling_window_input(config)
+                get_window_rules(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, window, step)
+            elif rule_mining_processing_par and mode == "batch":
+                jobs, max_workers = get_batch_input(config)
+                run_batch(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, jobs, max_workers)
+            elif rule_mining_processing_par and mode == "per_day":
+                max_workers = get_per_day_input(config)
+                get_per_day_rules(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, max_workers)
+            elif rule_mining_processing_par:
+                stage_cache = get_stage_cache_input(config)
+                full_data_bounds = get_full_data_input(config) if mode == "full_data" else None
+                get_rules(input_file, output_dir, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, rule_mining_processing_par, stage_cache, full_data_bounds, preview)
+            # the background writes are part of the run
+            finish_output_writer()
+    except Exception as e:
+        finish_run_report(output_dir, status="failed", error=str(e))
+        raise
+    finally:
+        finish_output_writer(raise_errors=False)
+        finish_memory_governor()
+        stop_stage_profiling()
+    finish_run_report(output_dir)
 
 def prepare_inputs(config, mode):
     """
@@ -34,6 +105,6 @@ def prepare_inputs(config, mode):
         input_file, output_dir, time_column, time_format, sensors, start_date, end_date, core_processing_par, time_processing_par, rule_mining_processing_par = get_yaml_input(config, time_range=True)
         return input_file, output_dir, time_column, time_format, sensors, (start_date, end_date), core_processing_par, time_processing_par, rule_mining_processing_par
     else:  
-        # full_data
+        # full_data (also used by the incremental, rolling_window, batch and per_day modes)
         input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par = get_yaml_input(config)
         return input_file, output_dir, time_column, time_format, sensors, None, core_processing_par, time_processing_par, rule_mining_processing_par
@@ -0,0 +1,161 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from data_manager.data_processing import DataProcessor
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+from core.rule_mining import run_association_rule_mining, format_rules_output, rules_to_frame
+
+def get_per_day_rules(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, max_workers):
+    """
+  This function generates the rules of every calendar day of the full data. The data is loaded and cleaned once, the
+  days are found on the sorted time column, and every day is discretized and mined in a worker pool. The numeric sensor
+  columns are placed once in a shared memory block, so the workers only receive the row range of their day. All days use
+  the same bin edges (fitted on the full data or loaded from the discretization model file), so their rules can be compared.
+  """
+    # step 1: load and clean the full data once and sort it by time
+    data_processor = DataProcessor(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par)
+    _, _, processed_data = data_processor.process_full_data()
+    processed_data = processed_data.sort_values(by=time_column, kind="stable").reset_index(drop=True)
+    times = pd.to_datetime(processed_data[time_column]).to_numpy(dtype="datetime64[ns]")
+
+    # step 2: fix the bin edges of the continuous sensors for all days
+    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, model_file, sample_size = rule_mining_processing_par
+    discretization_model = DiscretizationModel.load(model_file, (method, bins, labels)) if model_file else None
+    continuous_columns = [sensor for division, division_sensors in sensors.items() if division in (continuous_sensor_types or []) for sensor in division_sensors]
+    if continuous_columns and (discretization_model is None or not discretization_model.has_columns(continuous_columns)):
+        discretization_model = DiscretizationModel.fit(processed_data, continuous_columns, method, bins, labels, sample_size)
+        if model_file:
+            discretization_model.save(model_file)
+
+    # step 3: mine every day, the sensor columns are shared with the workers instead of being pickled per day
+    day_ranges = split_by_day(times)
+    logging.info(f"{len(processed_data)} rows split into {len(day_ranges)} days.")
+
+    sensor_data = processed_data.drop(columns=[time_column])
+    shared_block, layout = create_shared_block(sensor_data)
+    object_columns = [col for col in sensor_data.columns if col not in {entry[0] for entry in layout}]
+    try:
+        day_arguments = [(day, shared_block.name, layout, len(sensor_data), start_row, end_row, sensor_data.iloc[start_row:end_row][object_columns],
+                          list(sensor_data.columns), sensors, rule_mining_processing_par, discretization_model)
+                         for day, start_row, end_row in day_ranges]
+
+        # a failing day is recorded in the outputs without stopping the other days
+        results = {}
+        if max_workers == 1 or len(day_arguments) <= 1:
+            for arguments in day_arguments:
+                results[arguments[0]] = _mine_day_safely(*arguments)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(_mine_day_safely, *arguments): arguments[0] for arguments in day_arguments}
+                for future in as_completed(futures):
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception as e:
+                        # the worker itself failed (e.g., it was killed)
+                        logging.error(f"The worker of the day {futures[future]} failed: {e!r}")
+                        results[futures[future]] = (None, repr(e))
+    finally:
+        shared_block.close()
+        shared_block.unlink()
+
+    # step 4: aggregate the rules of all days (in the order of the days) and write them
+    formatted_output, day_frames, failed_days = [], [], []
+    for day, _, _ in day_ranges:
+        day_result, error = results[day]
+        if error is not None:
+            formatted_output.append(f"=== Day {day} (failed) ===\n{error}")
+            failed_days.append(day)
+            continue
+        formatted_rules, day_frame, transaction_count = day_result
+        formatted_output.append(f"=== Day {day} ({transaction_count} transactions) ===\n{formatted_rules}")
+        day_frame.insert(0, "day", day)
+        day_frames.append(day_frame)
+
+    mining_rules_file = os.path.join(output_dir, "generated_rules_per_day.txt")
+    with open(mining_rules_file, "w") as file:
+        file.write("\n\n".join(formatted_output))
+
+    rules_csv_file = os.path.join(output_dir, "generated_rules_per_day.csv")
+    if day_frames:
+        pd.concat(day_frames, ignore_index=True).to_csv(rules_csv_file, index=False)
+    logging.info(f"Formatted per-day rules generated and saved in {mining_rules_file} and {rules_csv_file}")
+    if failed_days:
+        logging.warning(f"{len(failed_days)} of {len(day_ranges)} days failed and have no rules: {failed_days}.")
+
+    return formatted_output
+
+def split_by_day(times):
+    """
+  This function returns the calendar day and the first and last (excluded) row of every day of a sorted time column.
+  """
+    if len(times) == 0:
+        return []
+
+    days = times.astype("datetime64[D]")
+    starts = np.concatenate(([0], np.flatnonzero(days[1:] != days[:-1]) + 1))
+    ends = np.append(starts[1:], len(days))
+    return [(str(days[start]), int(start), int(end)) for start, end in zip(starts, ends)]
+
+def create_shared_block(df):
+    """
+  This function copies the numeric and boolean columns of a DataFrame into one shared memory block. It returns the block
+  and its layout (column name, dtype and byte offset of every column), the other columns are not part of the block.
+  """
+    layout, offset = [], 0
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind in "biuf":
+            layout.append((col, values.dtype.str, offset))
+            # keep every column aligned on 8 bytes
+            offset += -(-values.nbytes // 8) * 8
+
+    shared_block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for col, dtype, column_offset in layout:
+        np.ndarray(len(df), dtype=dtype, buffer=shared_block.buf, offset=column_offset)[:] = df[col].to_numpy()
+    return shared_block, layout
+
+def read_shared_rows(block_name, layout, total_rows, start_row, end_row):
+    """
+  This function reads a row range of the columns stored in a shared memory block as a DataFrame (the rows are copied).
+  """
+    shared_block = shared_memory.SharedMemory(name=block_name)
+    try:
+        columns = {col: np.ndarray(total_rows, dtype=dtype, buffer=shared_block.buf, offset=offset)[start_row:end_row].copy()
+                   for col, dtype, offset in layout}
+    finally:
+        shared_block.close()
+    return pd.DataFrame(columns)
+
+def mine_day(day, block_name, layout, total_rows, start_row, end_row, object_data, column_order, sensors, rule_mining_processing_par, discretization_model):
+    """
+  This function discretizes and mines the rows of one day, it returns the formatted rules, the rules as a DataFrame and the number of transactions.
+  """
+    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, _, sample_size = rule_mining_processing_par
+
+    day_data = read_shared_rows(block_name, layout, total_rows, start_row, end_row)
+    for col in object_data.columns:
+        day_data[col] = object_data[col].to_numpy()
+    day_data = day_data[column_order]
+
+    rule_mining_processor = RuleMiningProcessor(day_data, sensors, None, discretization_model)
+    discretize_data = rule_mining_processor.advanced_preprocessing(method, bins, labels, continuous_sensor_types, sample_size)
+    item_dictionary = rule_mining_processor.build_item_dictionary()
+
+    rules = run_association_rule_mining(discretize_data, min_support, min_confidence, min_lift)
+    logging.info("Rules generated for the day %s (%s transactions).", day, len(discretize_data))
+    return format_rules_output(rules, item_dictionary), rules_to_frame(rules, item_dictionary), len(discretize_data)
+
+# --- Helper Functions ---
+def _mine_day_safely(day, *arguments):
+    """
+  This helper function mines one day and returns its result with None, or None with the error, so a failing day does not stop the others.
+  """
+    try:
+        return mine_day(day, *arguments), None
+    except Exception as e:
+        logging.error(f"Mining the day {day} failed: {e}")
+        return None, str(e)
@@ -0,0 +1,78 @@
+import math
+import logging
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+
+def preview_sample_size(population_rows, margin_of_error, confidence_level):
+    """
+  This function returns the number of rows needed to estimate any support or confidence (a proportion) within
+  "margin_of_error" at "confidence_level", for the worst case p = 0.5 and with the finite population correction.
+  """
+    if population_rows == 0:
+        return 0
+    z = NormalDist().inv_cdf(0.5 + confidence_level / 2)
+    infinite_size = z * z * 0.25 / margin_of_error ** 2
+    return min(population_rows, math.ceil(infinite_size / (1 + (infinite_size - 1) / population_rows)))
+
+def draw_preview_sample(df, time_column, sample_rows, sampling, strata, seed):
+    """
+  This function draws a reproducible sample of "sample_rows" rows (in their original order). With the "stratified"
+  sampling, the rows are split into time intervals of "strata" (e.g., "1h") and every interval gets its proportional
+  share of the sample (largest remainders first), so every part of the time range is represented.
+  """
+    rng = np.random.default_rng(seed)
+    if sample_rows >= len(df):
+        return df
+    if sampling == "random":
+        return df.iloc[np.sort(rng.choice(len(df), sample_rows, replace=False))]
+
+    # step 1: the stratum of every row and the allocation of the sample to the strata
+    times = pd.to_datetime(df[time_column]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    strata_codes = (times - times.min()) // pd.Timedelta(strata).value
+    _, strata_codes = np.unique(strata_codes, return_inverse=True)
+    strata_sizes = np.bincount(strata_codes)
+    exact_shares = strata_sizes * sample_rows / len(df)
+    allocation = np.floor(exact_shares).astype(np.int64)
+    remainders = np.argsort(-(exact_shares - allocation), kind="stable")
+    allocation[remainders[:sample_rows - allocation.sum()]] += 1
+
+    # step 2: the rows with the smallest random keys of every stratum
+    order = np.lexsort((rng.random(len(df)), strata_codes))
+    sorted_codes = strata_codes[order]
+    strata_starts = np.concatenate(([0], np.cumsum(strata_sizes)[:-1]))
+    rank = np.arange(len(df)) - strata_starts[sorted_codes]
+    logging.info(f"Stratified preview sample over {len(strata_sizes)} intervals of {strata}.")
+    return df.iloc[np.sort(order[rank < allocation[sorted_codes]])]
+
+def wilson_interval(proportion, sample_rows, population_rows, confidence_level):
+    """
+  This function returns the Wilson score interval (lower, upper) of proportions estimated from "sample_rows" of
+  "population_rows" rows (vectorized). The finite population correction shrinks the interval, so a sample of the full
+  population gives the exact value.
+  """
+    proportion = np.asarray(proportion, dtype=np.float64)
+    sample_rows = np.asarray(sample_rows, dtype=np.float64)
+    population_rows = np.asarray(population_rows, dtype=np.float64)
+    z = NormalDist().inv_cdf(0.5 + confidence_level / 2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # effective sample size with the finite population correction (infinite for a full census)
+        effective_rows = np.where(sample_rows < population_rows, sample_rows * (population_rows - 1) / (population_rows - sample_rows), np.inf)
+        denominator = 1 + z * z / effective_rows
+        center = (proportion + z * z / (2 * effective_rows)) / denominator
+        half_width = z * np.sqrt(proportion * (1 - proportion) / effective_rows + z * z / (4 * effective_rows ** 2)) / denominator
+    return np.clip(center - half_width, 0.0, 1.0), np.clip(center + half_width, 0.0, 1.0)
+
+def rule_intervals(rules, sample_rows, population_rows, confidence_level):
+    """
+  This function adds the confidence intervals of the support and the confidence of every rule (estimated from the
+  preview sample). The confidence is a proportion of the rows with the antecedents, so its sample and population are
+  the rows with the antecedents.
+  """
+    rules = rules.copy()
+    rules["support_low"], rules["support_high"] = wilson_interval(rules["support"], sample_rows, population_rows, confidence_level)
+    antecedent_support = rules["antecedent support"].to_numpy()
+    rules["confidence_low"], rules["confidence_high"] = wilson_interval(
+        rules["confidence"], sample_rows * antecedent_support, population_rows * antecedent_support, confidence_level)
+    return rules
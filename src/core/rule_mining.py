@@ -1,62 +1,251 @@
 import os
+import math
+import inspect
 import logging
+import importlib
+import numpy as np
+import pandas as pd
 from data_manager.data_processing import DataProcessor
-from mlxtend.frequent_patterns import fpgrowth, association_rules
 from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+from core.preview_sampling import preview_sample_size, draw_preview_sample, rule_intervals
+from utils.stage_cache import file_fingerprint
+from utils.logging_setup import log_and_raise_error
+from utils.instrumentation import instrumented, measure_stage
+from utils.output_writer import get_output_writer
+from utils.memory_governor import get_memory_governor
 
-def get_rules(input_file, output_dir, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, rule_mining_processing_par):
+def get_rules(input_file, output_dir, time_column, time_format, sensors, date_range, core_processing_par, time_processing_par, rule_mining_processing_par, stage_cache=None, full_data_bounds=None, preview=None):
     """
   This function handles the common steps required for a specified time range, or full data options. It processes the data, prepares the data, and then generates the rules.
+  If a stage cache is given, the outputs of the stages are reused when their inputs and config parameters did not change.
+  "full_data_bounds" (start, end, chunk_size) filters the full data while it is read.
+  With "preview" (margin_of_error, confidence_level, sampling, strata, seed), the rules are mined on a sample of the cleaned data instead.
   """
-    # step 1: loads the portion of the data that we need, then process it
-    data_processor = DataProcessor(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par)
+    # step 1: loads the portion of the data that we need, then process it (or get it from the cache)
+    processed_data, cache_key = None, None
+    if stage_cache is not None:
+        # the chunk size does not change the cleaned data, so only the bounds are part of the key
+        loaded_range = date_range or (full_data_bounds[:2] if full_data_bounds else None)
+        cache_key = stage_cache.make_key("cleaned", file_fingerprint(input_file), time_column, time_format, sensors, loaded_range, core_processing_par, time_processing_par)
+        processed_data = stage_cache.get("cleaned", cache_key)
+        if processed_data is not None:
+            get_output_writer().write(processed_data, output_dir, "processed_data")
 
-    if date_range:
-        start_date, end_date = date_range
-        _, _, processed_data = data_processor.process_time_range(start_date, end_date)
-    else:
-        _, _, processed_data = data_processor.process_full_data()
+    if processed_data is None:
+        data_processor = DataProcessor(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par)
 
-    # step 2: preprocess for the rule mining tool
-    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift = rule_mining_processing_par
+        if date_range:
+            start_date, end_date = date_range
+            _, _, processed_data = data_processor.process_time_range(start_date, end_date)
+        else:
+            _, _, processed_data = data_processor.process_full_data(*(full_data_bounds or ()))
 
-    discretize_data = RuleMiningProcessor(processed_data, sensors, time_column)
-    discretize_data = discretize_data.advanced_preprocessing(method, bins, labels, continuous_sensor_types)
+        # the float32 values of a run with a memory budget are not the cleaned data of the other runs, so neither the
+        # cleaned data nor the stages derived from it are stored
+        if stage_cache is not None and get_memory_governor().float32_values:
+            logging.info("The cleaned data has float32 values (memory budget), its stages are not stored in the stage cache.")
+            stage_cache = None
+        if stage_cache is not None:
+            stage_cache.put("cleaned", cache_key, processed_data)
 
-    mining_rules_file = os.path.join(output_dir, "processed_data_mining_rules.csv")
-    discretize_data.to_csv(mining_rules_file, index=False)
+    # step 2: mine the rules, the saved bin edges are reused if a discretization model file is configured
+    model_file = rule_mining_processing_par[7]
+    discretization_model = DiscretizationModel.load(model_file, rule_mining_processing_par[:3]) if model_file else None
 
-    # step 3: run association rule mining
-    rules = run_association_rule_mining(discretize_data, min_support, min_confidence, min_lift)
+    if preview:
+        return mine_and_save_preview_rules(processed_data, output_dir, sensors, time_column, rule_mining_processing_par, discretization_model, preview)
+    return mine_and_save_rules(processed_data, output_dir, sensors, time_column, rule_mining_processing_par, discretization_model, stage_cache, cache_key)
+
+def mine_and_save_rules(processed_data, output_dir, sensors, time_column, rule_mining_processing_par, discretization_model=None, stage_cache=None, cache_key=None):
+    """
+  This function prepares the cleaned data for rule mining, generates the rules, and writes the outputs in the output directory.
+  If a model file is configured but no discretization model was given, the fitted bin edges are saved in it.
+  With a stage cache, "cache_key" is the key of the cleaned data, the discretized data and the frequent itemsets are cached with keys derived from it.
+  """
+    # step 1: preprocess for the rule mining tool
+    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, model_file, sample_size = rule_mining_processing_par
+
+    def discretize():
+        rule_mining_processor = RuleMiningProcessor(processed_data, sensors, time_column, discretization_model)
+        discretize_data = rule_mining_processor.advanced_preprocessing(method, bins, labels, continuous_sensor_types, sample_size)
+        return discretize_data, rule_mining_processor.build_item_dictionary(), rule_mining_processor.discretization_model
+
+    if stage_cache is not None:
+        model_state = discretization_model.to_dict() if discretization_model is not None else None
+        discretize_key = stage_cache.make_key("discretized", cache_key, sensors, method, bins, labels, continuous_sensor_types, sample_size, model_state)
+        (discretize_data, item_dictionary, fitted_model), _ = stage_cache.get_or_compute("discretized", discretize_key, discretize)
+    else:
+        discretize_data, item_dictionary, fitted_model = discretize()
+
+    if model_file and discretization_model is None:
+        fitted_model.save(model_file)
 
-    # step 4: format and display rules
-    formatted_rules = format_rules_output(rules)
+    with measure_stage("write_mining_data", discretize_data):
+        get_output_writer().write(discretize_data, output_dir, "processed_data_mining_rules")
+
+    # step 2: run association rule mining (only the rule generation runs again if only min_confidence or min_lift changed)
+    if stage_cache is not None:
+        itemsets_key = stage_cache.make_key("frequent_itemsets", discretize_key, min_support)
+        frequent_itemsets, _ = stage_cache.get_or_compute("frequent_itemsets", itemsets_key, lambda: find_frequent_itemsets(discretize_data, min_support))
+        rules = frequent_itemsets if frequent_itemsets.empty else generate_association_rules(frequent_itemsets, min_confidence, min_lift)
+    else:
+        rules = run_association_rule_mining(discretize_data, min_support, min_confidence, min_lift)
+
+    # step 3: format and display rules (item IDs are decoded back to names here)
+    formatted_rules = format_rules_output(rules, item_dictionary)
     
-    # step 5: write the rules to a text file
+    # step 4: write the rules to a text file
     mining_rules_file = os.path.join(output_dir, "generated_rules.txt")
-    with open(mining_rules_file, "w") as file:
-        file.write(formatted_rules)
+    with measure_stage("write_rules"):
+        with open(mining_rules_file, "w") as file:
+            file.write(formatted_rules)
     logging.info(f"Formatted rules generated and saved in {mining_rules_file}")
 
     return formatted_rules
 
+def mine_and_save_preview_rules(processed_data, output_dir, sensors, time_column, rule_mining_processing_par, discretization_model, preview):
+    """
+  This function mines the rules on a reproducible sample of the cleaned data, sized so that every support and confidence
+  is estimated within the configured margin of error, and writes them with their confidence intervals in
+  "generated_rules_preview.txt". The bin edges are the ones of a full run (loaded, or fitted on all the cleaned rows), so
+  the items are the same. Nothing of a full run (the mining data, the rules or the discretization model file) is written.
+  """
+    margin_of_error, confidence_level, sampling, strata, seed = preview
+    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, _, sample_size = rule_mining_processing_par
+
+    # step 1: fix the bin edges on all the rows, then draw the sample
+    continuous_columns = [sensor for division, division_sensors in sensors.items() if division in (continuous_sensor_types or []) for sensor in division_sensors]
+    if continuous_columns and (discretization_model is None or not discretization_model.has_columns(continuous_columns)):
+        discretization_model = DiscretizationModel.fit(processed_data, continuous_columns, method, bins, labels, sample_size)
+
+    population_rows = len(processed_data)
+    sample_rows = preview_sample_size(population_rows, margin_of_error, confidence_level)
+    with measure_stage("preview_sampling", processed_data):
+        sample = draw_preview_sample(processed_data, time_column, sample_rows, sampling, strata, seed).copy()
+    logging.info(f"Preview: mining {sample_rows} of {population_rows} rows ({sampling} sample, margin of error {margin_of_error} at {confidence_level:.0%}).")
+
+    # step 2: the normal discretization and mining on the sample
+    rule_mining_processor = RuleMiningProcessor(sample, sensors, time_column, discretization_model)
+    discretize_data = rule_mining_processor.advanced_preprocessing(method, bins, labels, continuous_sensor_types, sample_size)
+    item_dictionary = rule_mining_processor.build_item_dictionary()
+    rules = run_association_rule_mining(discretize_data, min_support, min_confidence, min_lift)
+
+    # step 3: format the rules with the intervals of their support and confidence
+    header = (f"Preview on a {sampling} sample of {sample_rows} of {population_rows} rows, "
+              f"{confidence_level:.0%} confidence intervals (margin of error {margin_of_error}).")
+    if rules.empty:
+        formatted_rules = header + "\nNo valid association rules were generated."
+    else:
+        rules = rule_intervals(rules, sample_rows, population_rows, confidence_level)
+        formatted_output = [header]
+        for index, row in rules.iterrows():
+            formatted_output.append(f"Rule {index + 1}: If {item_dictionary.decode(row['antecedents'])} "
+                                    f"then {item_dictionary.decode(row['consequents'])} "
+                                    f"(Support: {row['support']:.3f} [{row['support_low']:.3f}, {row['support_high']:.3f}], "
+                                    f"Confidence: {row['confidence']:.3f} [{row['confidence_low']:.3f}, {row['confidence_high']:.3f}], "
+                                    f"Lift: {row['lift']:.3f})")
+        formatted_rules = "\n".join(formatted_output)
+
+    preview_rules_file = os.path.join(output_dir, "generated_rules_preview.txt")
+    with measure_stage("write_rules"):
+        with open(preview_rules_file, "w") as file:
+            file.write(formatted_rules)
+    logging.info(f"Preview rules generated and saved in {preview_rules_file}")
+
+    return formatted_rules
+
 def run_association_rule_mining(discretized_data, min_support, min_confidence, min_lift):
     """
   This function runs the FP-Growth algorithm and extracts association rules from the discretized data.
+  The itemsets and rules are made of integer item IDs (the column positions), an ItemDictionary decodes them.
   """
     logging.info(f"Running the FP-Growth algorithm and the extraction of the association rules started.")
 
-    # step 1: run FP-Growth to find frequent itemsets
-    frequent_itemsets = fpgrowth(discretized_data, min_support=min_support, use_colnames=True)
+    # step 1: run FP-Growth to find frequent itemsets (on integer item IDs instead of column names)
+    frequent_itemsets = find_frequent_itemsets(discretized_data, min_support)
 
     # check if frequent itemsets were found
     if frequent_itemsets.empty:
-        logging.warning("No frequent itemsets were found. Consider lowering min_support.")
         return frequent_itemsets  # Return empty result to avoid errors
 
-    logging.info(f"Number of frequent itemsets found: {len(frequent_itemsets)}")
+    return generate_association_rules(frequent_itemsets, min_confidence, min_lift)
+
+@instrumented
+def find_frequent_itemsets(discretized_data, min_support):
+    """
+  This function runs the FP-Growth algorithm on integer item IDs (instead of column names) to find the frequent itemsets.
+  The identical rows (e.g., hours of steady-state operation) are collapsed into weighted transactions first, so the
+  FP-tree is built from the distinct states instead of every row. The itemsets, supports and their order are the same.
+  """
+    # mlxtend is only imported when the rules are mined, so the runs that stop earlier (and the CLI) start faster
+    from mlxtend.frequent_patterns import fpgrowth
+    if len(discretized_data) and min_support > 0.0 and weighted_fpgrowth_supported():
+        unique_transactions, counts = count_transactions(discretized_data)
+        logging.info("Mining %s distinct transactions instead of %s rows.", len(counts), len(discretized_data))
+        frequent_itemsets = weighted_fpgrowth(unique_transactions, counts, min_support)
+    else:
+        frequent_itemsets = fpgrowth(discretized_data, min_support=min_support, use_colnames=False)
+
+    if frequent_itemsets.empty:
+        logging.warning("No frequent itemsets were found. Consider lowering min_support.")
+    else:
+        logging.info(f"Number of frequent itemsets found: {len(frequent_itemsets)}")
+    return frequent_itemsets
+
+def weighted_fpgrowth(unique_transactions, counts, min_support):
+    """
+  This function runs FP-Growth on weighted transactions: every unique transaction is inserted once into the FP-tree
+  with its count, and the tree is mined with the FP-Growth steps of mlxtend. With the unique transactions in the order
+  of their first occurrence (see "count_transactions"), the tree is the same as the one built from every row, so the
+  result is the same as "fpgrowth" with use_colnames=False.
+  """
+    from mlxtend.frequent_patterns import fpcommon
+    fpg_step = importlib.import_module("mlxtend.frequent_patterns.fpgrowth").fpg_step
+    if min_support <= 0.0:
+        log_and_raise_error(f"Invalid 'min_support': must be a positive number within the interval (0, 1], got {min_support}.")
+
+    counts = np.asarray(counts, dtype=np.int64)
+    total_transactions = int(counts.sum())
+
+    # step 1: rank the frequent items (same supports and order as mlxtend computes them from every row)
+    item_support = (counts @ unique_transactions) / float(total_transactions)
+    items = np.nonzero(item_support >= min_support)[0]
+    rank = {item: i for i, item in enumerate(items[item_support[items].argsort()])}
 
-    # step 2: generate association rules
+    # step 2: insert every unique transaction once, with its count
+    tree = fpcommon.FPTree(rank)
+    for transaction, count in zip(unique_transactions, counts):
+        itemset = [item for item in np.where(transaction)[0] if item in rank]
+        itemset.sort(key=rank.get, reverse=True)
+        tree.insert_itemset(itemset, int(count))
+
+    # step 3: mine the tree
+    min_count = math.ceil(min_support * total_transactions)
+    generator = fpg_step(tree, min_count, None, None, 0)
+    return fpcommon.generate_itemsets(generator, total_transactions, None)
+
+def weighted_fpgrowth_supported():
+    """
+  This function checks that the installed mlxtend has the FP-Growth steps used by "weighted_fpgrowth" (otherwise every
+  row is mined with "fpgrowth").
+  """
+    try:
+        from mlxtend.frequent_patterns import fpcommon
+        fpg_step = importlib.import_module("mlxtend.frequent_patterns.fpgrowth").fpg_step
+        return (list(inspect.signature(fpg_step).parameters) == ["tree", "minsup", "colnames", "max_len", "verbose"]
+                and list(inspect.signature(fpcommon.generate_itemsets).parameters) == ["generator", "num_itemsets", "colname_map"]
+                and "count" in inspect.signature(fpcommon.FPTree.insert_itemset).parameters)
+    except (ImportError, AttributeError):
+        return False
+
+@instrumented
+def generate_association_rules(frequent_itemsets, min_confidence, min_lift):
+    """
+  This function generates the association rules from the frequent itemsets and filters them by confidence, support, and lift.
+  """
+    # step 1: generate association rules
+    from mlxtend.frequent_patterns import association_rules
     rules = association_rules(frequent_itemsets, metric="confidence", min_threshold=min_confidence)
 
     # check if rules were generated
@@ -66,7 +255,7 @@ def run_association_rule_mining(discretized_data, min_support, min_confidence, m
 
     logging.info(f"Number of association rules generated: {len(rules)}")
 
-    # step 3: filter rules by confidence, support, and lift
+    # step 2: filter rules by confidence, support, and lift
     rules = rules[(rules['confidence'] > 0) & (rules['support'] > 0)]
     
     if min_lift:
@@ -74,18 +263,121 @@ def run_association_rule_mining(discretized_data, min_support, min_confidence, m
 
     return rules
 
-def format_rules_output(rules):
+@instrumented
+def count_transactions(discretized_data):
+    """
+  This function collapses the identical rows (transactions) of the discretized data into unique rows and their counts.
+  The unique rows are in the order of their first occurrence. If a dense copy of all the rows does not fit in the memory
+  budget, the rows are counted in blocks and the counts of the blocks are merged (e.g., for sparse or spilled data).
+  """
+    item_count = discretized_data.shape[1]
+    if len(discretized_data) == 0:
+        return np.zeros((0, item_count), dtype=bool), np.zeros(0, dtype=np.int64)
+    block_rows = get_memory_governor().counting_block_rows(len(discretized_data), item_count) or len(discretized_data)
+
+    # step 1: the unique rows of every block, packed into bytes, so they are compared as short byte strings
+    packed_blocks, block_first_rows, block_counts = [], [], []
+    for start in range(0, len(discretized_data), block_rows):
+        packed = np.ascontiguousarray(np.packbits(discretized_data.iloc[start:start + block_rows].to_numpy(dtype=bool), axis=1))
+        _, first_rows, counts = np.unique(_packed_rows(packed), return_index=True, return_counts=True)
+        packed_blocks.append(packed[first_rows])
+        block_first_rows.append(first_rows + start)
+        block_counts.append(counts)
+
+    # step 2: merge the blocks, a row seen in several blocks keeps its first occurrence and the sum of its counts
+    packed, first_rows, counts = packed_blocks[0], block_first_rows[0], block_counts[0]
+    if len(packed_blocks) > 1:
+        packed, first_rows, counts = np.concatenate(packed_blocks), np.concatenate(block_first_rows), np.concatenate(block_counts)
+        _, unique_positions, inverse = np.unique(_packed_rows(packed), return_index=True, return_inverse=True)
+        merged_first_rows = np.full(len(unique_positions), len(discretized_data))
+        np.minimum.at(merged_first_rows, inverse, first_rows)
+        packed, first_rows, counts = packed[unique_positions], merged_first_rows, np.bincount(inverse, weights=counts).astype(np.int64)
+
+    order = np.argsort(first_rows)
+    return np.unpackbits(packed[order], axis=1, count=item_count).astype(bool), counts[order].astype(np.int64)
+
+@instrumented
+def mine_frequent_itemsets_from_counts(unique_transactions, counts, min_support, total_transactions=None):
+    """
+  This function finds the frequent itemsets (level-wise, Apriori style) from unique transactions and their counts.
+  It returns the same layout as fpgrowth with use_colnames=False ("support" and "itemsets" of integer item IDs).
+  """
+    counts = np.asarray(counts, dtype=np.int64)
+    total_transactions = int(counts.sum()) if total_transactions is None else int(total_transactions)
+    if total_transactions == 0:
+        return pd.DataFrame({"support": [], "itemsets": []})
+
+    min_count = min_support * total_transactions
+    supports, itemsets = [], []
+
+    # step 1: frequent single items, each one keeps the mask of the unique transactions that contain it
+    item_counts = counts @ unique_transactions
+    level = {}
+    for item in np.flatnonzero(item_counts >= min_count):
+        level[(int(item),)] = unique_transactions[:, item]
+        supports.append(item_counts[item] / total_transactions)
+        itemsets.append(frozenset([int(item)]))
+
+    # step 2: extend the frequent itemsets of the previous level by one item at a time
+    while level:
+        previous = sorted(level)
+        next_level = {}
+        for i, first in enumerate(previous):
+            for second in previous[i + 1:]:
+                if first[:-1] != second[:-1]:
+                    break
+                candidate = first + (second[-1],)
+                # every subset of a frequent itemset must be frequent as well
+                if any(candidate[:j] + candidate[j + 1:] not in level for j in range(len(candidate) - 2)):
+                    continue
+                mask = level[first] & unique_transactions[:, second[-1]]
+                candidate_count = counts[mask].sum()
+                if candidate_count >= min_count:
+                    next_level[candidate] = mask
+                    supports.append(candidate_count / total_transactions)
+                    itemsets.append(frozenset(candidate))
+        level = next_level
+
+    return pd.DataFrame({"support": supports, "itemsets": itemsets})
+
+@instrumented
+def format_rules_output(rules, item_dictionary=None):
     """
   This function formats the association rules into a more user-friendly output.
+  If an item dictionary is given, the integer item IDs are decoded into their column names.
   """
     if rules.empty:
         return "No valid association rules were generated."
 
+    decode = item_dictionary.decode if item_dictionary is not None else list
+
     formatted_output = []
     for index, row in rules.iterrows():
-        rule_str = (f"Rule {index + 1}: If {list(row['antecedents'])} "
-                    f"then {list(row['consequents'])} "
+        rule_str = (f"Rule {index + 1}: If {decode(row['antecedents'])} "
+                    f"then {decode(row['consequents'])} "
                     f"(Support: {row['support']:.3f}, Confidence: {row['confidence']:.3f}, Lift: {row['lift']:.3f})")
         formatted_output.append(rule_str)
 
     return '\n'.join(formatted_output)
+
+def rules_to_frame(rules, item_dictionary):
+    """
+  This function converts the association rules into a flat DataFrame with decoded item names (e.g., to write them as CSV).
+  """
+    columns = ["antecedents", "consequents", "support", "confidence", "lift"]
+    if rules.empty:
+        return pd.DataFrame(columns=columns)
+
+    return pd.DataFrame({
+        "antecedents": [", ".join(item_dictionary.decode(itemset)) for itemset in rules["antecedents"]],
+        "consequents": [", ".join(item_dictionary.decode(itemset)) for itemset in rules["consequents"]],
+        "support": rules["support"].to_numpy(),
+        "confidence": rules["confidence"].to_numpy(),
+        "lift": rules["lift"].to_numpy()})
+
+# --- Helper Functions ---
+def _packed_rows(packed):
+    """
+  This helper function views every row of packed bits as one byte string, so "np.unique" compares whole rows.
+  """
+    return packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
@@ -0,0 +1,104 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from data_manager.data_processing import DataProcessor
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+from core.rule_mining import mine_frequent_itemsets_from_counts, generate_association_rules, format_rules_output, rules_to_frame
+
+def get_window_rules(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par, rule_mining_processing_par, window, step):
+    """
+  This function generates the rules of every sliding window (e.g., weekly windows moving by one day) in one pass.
+  The data is loaded, cleaned and discretized once (so all windows share the same bin edges), and the counts of the
+  unique transactions are updated as rows enter and leave the window instead of mining every window from scratch.
+  """
+    # step 1: load and clean the full data once
+    data_processor = DataProcessor(input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par)
+    _, _, processed_data = data_processor.process_full_data()
+    times = pd.to_datetime(processed_data[time_column]).to_numpy(dtype="datetime64[ns]")
+
+    # step 2: discretize once and give every row the code of its unique transaction
+    method, bins, labels, continuous_sensor_types, min_support, min_confidence, min_lift, model_file, sample_size = rule_mining_processing_par
+    discretization_model = DiscretizationModel.load(model_file, (method, bins, labels)) if model_file else None
+
+    rule_mining_processor = RuleMiningProcessor(processed_data, sensors, time_column, discretization_model)
+    discretize_data = rule_mining_processor.advanced_preprocessing(method, bins, labels, continuous_sensor_types, sample_size)
+    item_dictionary = rule_mining_processor.build_item_dictionary()
+
+    if model_file and discretization_model is None:
+        rule_mining_processor.discretization_model.save(model_file)
+
+    unique_transactions, transaction_codes = np.unique(discretize_data.to_numpy(dtype=bool), axis=0, return_inverse=True)
+    transaction_codes = transaction_codes.reshape(-1)
+    logging.info(f"{len(transaction_codes)} transactions collapsed into {len(unique_transactions)} unique transactions.")
+
+    # step 3: slide the window and mine the rules of every window from the updated counts
+    formatted_output, window_frames = [], []
+    for window_start, window_end, counts in iterate_window_counts(times, transaction_codes, len(unique_transactions), window, step):
+        transaction_count = int(counts.sum())
+        if transaction_count == 0:
+            logging.info("Window %s to %s has no data, skipping.", window_start, window_end)
+            continue
+        header = f"=== Window {window_start} to {window_end} ({transaction_count} transactions) ==="
+
+        present = counts > 0
+        frequent_itemsets = mine_frequent_itemsets_from_counts(unique_transactions[present], counts[present], min_support, transaction_count)
+        if frequent_itemsets.empty:
+            logging.warning("No frequent itemsets were found for the window %s to %s. Consider lowering min_support.", window_start, window_end)
+            rules = frequent_itemsets
+        else:
+            rules = generate_association_rules(frequent_itemsets, min_confidence, min_lift)
+
+        formatted_output.append(f"{header}\n{format_rules_output(rules, item_dictionary)}")
+        window_frame = rules_to_frame(rules, item_dictionary)
+        window_frame.insert(0, "window_end", window_end)
+        window_frame.insert(0, "window_start", window_start)
+        window_frames.append(window_frame)
+
+    logging.info(f"Rules generated for {len(window_frames)} windows.")
+
+    # step 4: write the rules of all windows
+    mining_rules_file = os.path.join(output_dir, "generated_rules_windows.txt")
+    with open(mining_rules_file, "w") as file:
+        file.write("\n\n".join(formatted_output))
+
+    rules_csv_file = os.path.join(output_dir, "generated_rules_windows.csv")
+    if window_frames:
+        pd.concat(window_frames, ignore_index=True).to_csv(rules_csv_file, index=False)
+    logging.info(f"Formatted window rules generated and saved in {mining_rules_file} and {rules_csv_file}")
+
+    return formatted_output
+
+def iterate_window_counts(times, transaction_codes, num_unique, window, step):
+    """
+  This function yields the start, end and the unique transaction counts of every window [start, start + window).
+  The windows start at the first timestamp and move by "step" until a window reaches the last timestamp. As the
+  times are sorted, only the rows that leave and enter the window are subtracted from and added to the counts.
+  """
+    if len(times) == 0:
+        return
+
+    window = np.timedelta64(pd.Timedelta(window).value, "ns")
+    step = np.timedelta64(pd.Timedelta(step).value, "ns")
+    counts = np.zeros(num_unique, dtype=np.int64)
+    previous_start_row, previous_end_row = 0, 0
+
+    window_start = times[0]
+    while True:
+        window_end = window_start + window
+        start_row = int(np.searchsorted(times, window_start, side="left"))
+        end_row = int(np.searchsorted(times, window_end, side="left"))
+
+        # rows that left the window, then rows that entered it (the windows can also be disjoint if step > window)
+        leaving = transaction_codes[previous_start_row:min(start_row, previous_end_row)]
+        entering = transaction_codes[max(start_row, previous_end_row):end_row]
+        counts -= np.bincount(leaving, minlength=num_unique)
+        counts += np.bincount(entering, minlength=num_unique)
+        previous_start_row, previous_end_row = start_row, end_row
+
+        yield pd.Timestamp(window_start), pd.Timestamp(window_end), counts.copy()
+
+        if window_end > times[-1]:
+            break
+        window_start = window_start + step
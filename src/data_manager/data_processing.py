@@ -1,7 +1,11 @@
-import os
-from data_manager.prepare_data.get_full_data import FullDataLoader
+import pandas as pd
+from data_manager.prepare_data.get_full_data import FullDataLoader, DEFAULT_PREFETCH_CHUNKS
 from data_manager.preprocessing.core_preprocessor import DataChecker
+from data_manager.preprocessing.resampler import Resampler
 from data_manager.prepare_data.filter_by_date_range import PartialDataLoader
+from utils.instrumentation import instrumented
+from utils.output_writer import get_output_writer
+from utils.memory_governor import get_memory_governor
 
 class DataProcessor:
     def __init__(self, input_file, output_dir, time_column, time_format, sensors, core_processing_par, time_processing_par):
@@ -12,6 +16,7 @@ class DataProcessor:
         self.sensors_dict = sensors
         self.core_processing_par = core_processing_par
         self.time_processing_par = time_processing_par
+        self.loaded_times = None
 
     def _get_sensors(self):
         """
@@ -34,12 +39,12 @@ class DataProcessor:
             organized_sensors[division] = [processed_data[col] for col in division_sensors if col in processed_data.columns]
         return organized_sensors
 
+    @instrumented
     def _save_processed_data(self, processed_data):
         """
       This method saves the processed data
       """
-        processed_data_file = os.path.join(self.output_dir, "processed_data.csv")
-        processed_data.to_csv(processed_data_file, index=False)
+        get_output_writer().write(processed_data, self.output_dir, "processed_data")
     
     def process_time_range(self, start_date, end_date=None):
         """
@@ -50,37 +55,62 @@ class DataProcessor:
         dates_data_preparer = PartialDataLoader(self.input_file, sensors_combined, self.time_column, self.time_format, self.time_processing_par)
         filtered_data = dates_data_preparer.get_filtered_data(start_date, end_date)
 
-        # step 2: preprocess and clean the filtered data
-        data_checker = DataChecker(filtered_data, sensors_combined, self.time_column)
-        processed_data = data_checker.full_validation(self.core_processing_par)
-        
-        # save the processed data
-        self._save_processed_data(processed_data)
+        # step 2: preprocess, clean and save the filtered data
+        return self.process_loaded_data(filtered_data)
 
-        # step 3: prepare the components needed for further analysis
-        time = processed_data[self.time_column]
-        organized_sensors = self._organize_sensors(processed_data)
+    def process_data_after(self, watermark, watermark_rows=None):
+        """
+      This method prepares only the rows appended after the "watermark" timestamp (and its first "watermark_rows" rows).
+      It returns None if there are no new rows.
+      """
+        # step 1: partially load the data (returns only the needed columns and the new rows)
+        sensors_combined = self._get_sensors()
+        dates_data_preparer = PartialDataLoader(self.input_file, sensors_combined, self.time_column, self.time_format, self.time_processing_par)
+        new_data = dates_data_preparer.get_data_after(watermark, watermark_rows)
+        if new_data is None:
+            return None
 
-        return time, organized_sensors, processed_data
+        # step 2: preprocess, clean and save the new data
+        return self.process_loaded_data(new_data)
 
-    def process_full_data(self):
+    def process_full_data(self, start=None, end=None, chunk_size=None, prefetch_chunks=DEFAULT_PREFETCH_CHUNKS):
         """
       This method prepares the data by loading only the specified columns for the full dataset after initial filtering.
+      With "start" and/or "end", only the rows within these bounds are kept while the file is read in chunks of "chunk_size" rows
+      (up to "prefetch_chunks" chunks are read ahead while the current one is filtered).
       """
         # step 1: load the data (for only the needed columns)
         sensors_combined = self._get_sensors()
         dates_data_preparer = FullDataLoader(self.input_file, sensors_combined, self.time_column, self.time_format, self.time_processing_par)
-        filtered_data = dates_data_preparer.get_filtered_data()
+        filtered_data = dates_data_preparer.get_filtered_data(start, end, chunk_size, prefetch_chunks)
+
+        # step 2: preprocess, clean and save the filtered data
+        return self.process_loaded_data(filtered_data)
+
+    def process_loaded_data(self, filtered_data):
+        """
+      This method cleans data that was already loaded (e.g., a slice of a dataset shared by several jobs) and saves it.
+      The timestamps of the loaded rows (before the cleaning drops any) are kept in "loaded_times".
+      """
+        self.loaded_times = pd.to_datetime(filtered_data[self.time_column]).to_numpy(dtype="datetime64[ns]", copy=True)
+
+        # step 1: resample the data to the configured time grid (optional), then preprocess and clean it
+        resample_par = self.time_processing_par[3] if len(self.time_processing_par) > 3 else None
+        if resample_par:
+            rule, aggregations = resample_par
+            filtered_data = Resampler(filtered_data, self.sensors_dict, self.time_column).resample(rule, aggregations)
 
-        # step 2: preprocess and clean the filtered data
+        # the sensor values are converted to float32 if cleaning them does not fit in the memory budget
+        sensors_combined = self._get_sensors()
+        filtered_data = get_memory_governor().plan_cleaning(filtered_data, sensors_combined)
         data_checker = DataChecker(filtered_data, sensors_combined, self.time_column)
         processed_data = data_checker.full_validation(self.core_processing_par)
         
         # save the processed data
         self._save_processed_data(processed_data)
 
-        # step 3: prepare the components needed for further analysis
+        # step 2: prepare the components needed for further analysis
         time = processed_data[self.time_column]
         organized_sensors = self._organize_sensors(processed_data)
-        
+
         return time, organized_sensors, processed_data
@@ -9,4 +9,10 @@ class BaseFileReader(ABC):
 
     @abstractmethod
     def read_file(self, columns=None):
-        pass
\ No newline at end of file
+        pass
+
+    def read_chunks(self, columns=None, chunk_size=100_000):
+        """
+      This method yields the file in chunks of rows. Readers that can not read a file in chunks yield it as one chunk.
+      """
+        yield self.read_file(columns)
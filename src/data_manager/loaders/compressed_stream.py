@@ -0,0 +1,221 @@
+import io
+import os
+import zlib
+import struct
+from itertools import chain
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    # optional, only needed for ".zst" inputs
+    zstandard = None
+
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+BGZF_HEADER = b"\x1f\x8b\x08\x04"
+ZSTD_MAGIC = 0xFD2FB528
+ZSTD_SKIPPABLE_MAGICS = range(0x184D2A50, 0x184D2A60)
+BATCH_BYTES = 1024 * 1024
+
+def get_compression(file_path):
+    """
+  This function returns the compression of a file based on its extension (e.g., "gzip" for ".csv.gz"), or None.
+  """
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(str(file_path))[1])
+
+def strip_compression_extension(file_path):
+    """
+  This function returns the file path without its compression extension (e.g., "data.csv" for "data.csv.zst").
+  """
+    file_path = str(file_path)
+    return os.path.splitext(file_path)[0] if get_compression(file_path) else file_path
+
+def open_source(file_path, max_workers=None):
+    """
+  This function returns a context manager with the source that pandas reads. Files made of independent frames
+  (BGZF ".gz" files, e.g., written by bgzip, and multi-frame ".zst" files) are decompressed in parallel by a thread pool
+  while they are read. Plain files and the other compressed files are read by pandas directly (the decompression is
+  streamed, nothing is written to disk).
+  """
+    compression = get_compression(file_path)
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("Reading '.zst' files requires the 'zstandard' package (pip install zstandard).")
+
+    frames = None
+    if compression == "gzip":
+        frames = _multiple_frames(_bgzf_frames(file_path))
+        decompress = _inflate_gzip_members
+    elif compression == "zstd":
+        frames = _multiple_frames(_zstd_frames(file_path))
+        decompress = _decompress_zstd_frames
+
+    if frames is None:
+        return nullcontext(file_path)
+    reader = ParallelFrameReader(file_path, frames, decompress, max_workers or os.cpu_count() or 1)
+    return io.BufferedReader(reader, buffer_size=BATCH_BYTES)
+
+class ParallelFrameReader(io.RawIOBase):
+    """
+  This class is a readable stream of the decompressed content of a file made of independent compressed frames.
+  The frames are grouped into batches of about 1 MB, which are decompressed by a thread pool (zlib and zstandard release
+  the GIL) and returned in their order. Only a few batches are decompressed ahead, so the memory stays bounded and a
+  reader that stops early (e.g., "nrows" of pandas) does not decompress the rest of the file.
+  """
+    def __init__(self, file_path, frames, decompress, max_workers):
+        self._file = open(file_path, "rb")
+        self._batches = _batch_frames(frames, BATCH_BYTES)
+        self._decompress = decompress
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lookahead = 2 * max_workers
+        self._pending = deque()
+        self._buffer = memoryview(b"")
+        self._submit_batches()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not len(self._buffer):
+            if not self._pending:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+            self._submit_batches()
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._batches.close()
+            self._file.close()
+        super().close()
+
+    # --- Helper Methods ---
+    def _submit_batches(self):
+        """
+      This helper method reads the next batches of compressed frames and submits their decompression.
+      """
+        while len(self._pending) < self._lookahead:
+            batch = next(self._batches, None)
+            if batch is None:
+                return
+            offset, frame_sizes = batch
+            self._file.seek(offset)
+            data = self._file.read(sum(frame_sizes))
+            self._pending.append(self._executor.submit(self._decompress, data, frame_sizes))
+
+# --- Helper Functions ---
+def _multiple_frames(frames):
+    """
+  This helper function returns the frames if there are at least two of them (otherwise the file is read as one stream),
+  or None if the file is not made of independent frames.
+  """
+    try:
+        first, second = next(frames, None), next(frames, None)
+    except (ValueError, IndexError, struct.error):
+        return None
+    if first is None or second is None:
+        return None
+    return chain([first, second], frames)
+
+def _batch_frames(frames, batch_bytes):
+    """
+  This helper function groups contiguous frames into batches (offset, frame sizes) of at least "batch_bytes"
+  (a gap, e.g., a skippable zstd frame, starts a new batch).
+  """
+    offset, frame_sizes, batch_size = None, [], 0
+    for frame_offset, frame_size in frames:
+        if offset is not None and frame_offset != offset + batch_size:
+            yield offset, frame_sizes
+            offset, frame_sizes, batch_size = None, [], 0
+        if offset is None:
+            offset = frame_offset
+        frame_sizes.append(frame_size)
+        batch_size += frame_size
+        if batch_size >= batch_bytes:
+            yield offset, frame_sizes
+            offset, frame_sizes, batch_size = None, [], 0
+    if frame_sizes:
+        yield offset, frame_sizes
+
+def _bgzf_frames(file_path):
+    """
+  This helper function yields the offset and size of the gzip members of a BGZF file (the size of every member is
+  stored in its "BC" extra field). It raises a ValueError if the file is not a BGZF file.
+  """
+    with open(file_path, "rb") as f:
+        offset = 0
+        while True:
+            f.seek(offset)
+            header = f.read(18)
+            if not header:
+                return
+            if len(header) < 18 or header[:4] != BGZF_HEADER or header[12:14] != b"BC":
+                raise ValueError(f"{file_path} is not a BGZF file.")
+            member_size = struct.unpack("<H", header[16:18])[0] + 1
+            yield offset, member_size
+            offset += member_size
+
+def _zstd_frames(file_path):
+    """
+  This helper function yields the offset and size of the zstd frames of a file, using the frame and block headers
+  (skippable frames are skipped). It raises a ValueError if a frame is not a zstd frame.
+  """
+    with open(file_path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        offset = 0
+        while offset < file_size:
+            f.seek(offset)
+            magic = struct.unpack("<I", f.read(4))[0]
+            if magic in ZSTD_SKIPPABLE_MAGICS:
+                offset += 8 + struct.unpack("<I", f.read(4))[0]
+                continue
+            if magic != ZSTD_MAGIC:
+                raise ValueError(f"Invalid zstd frame at byte {offset} of {file_path}.")
+
+            # frame header: magic, descriptor, window descriptor, dictionary id and content size
+            descriptor = f.read(1)[0]
+            single_segment = (descriptor >> 5) & 1
+            content_size_bytes = (single_segment, 2, 4, 8)[descriptor >> 6]
+            position = offset + 5 + (1 - single_segment) + (0, 1, 2, 4)[descriptor & 3] + content_size_bytes
+
+            # blocks: 3-byte header (last block flag, type, size), RLE blocks store a single byte
+            last_block = False
+            while not last_block:
+                f.seek(position)
+                block_header = int.from_bytes(f.read(3), "little")
+                last_block, block_type, block_size = block_header & 1, (block_header >> 1) & 3, block_header >> 3
+                position += 3 + (1 if block_type == 1 else block_size)
+
+            # optional content checksum
+            position += 4 if (descriptor >> 2) & 1 else 0
+            yield offset, position - offset
+            offset = position
+
+def _inflate_gzip_members(data, member_sizes):
+    """
+  This helper function decompresses consecutive gzip members.
+  """
+    chunks, start = [], 0
+    for member_size in member_sizes:
+        chunks.append(zlib.decompress(data[start:start + member_size], 31))
+        start += member_size
+    return b"".join(chunks)
+
+def _decompress_zstd_frames(data, frame_sizes):
+    """
+  This helper function decompresses consecutive zstd frames (a decompressor is not shared between threads).
+  """
+    decompressor = zstandard.ZstdDecompressor()
+    chunks, start = [], 0
+    for frame_size in frame_sizes:
+        chunks.append(decompressor.decompressobj().decompress(data[start:start + frame_size]))
+        start += frame_size
+    return b"".join(chunks)
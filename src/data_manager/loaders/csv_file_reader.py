@@ -2,14 +2,20 @@ import logging
 import pandas as pd
 from utils.logging_setup import log_and_raise_error
 from data_manager.loaders.base_file_reader import BaseFileReader
+from data_manager.loaders.compressed_stream import open_source
 
 class CSVFileReader(BaseFileReader):
+    """
+  This class reads CSV files, also compressed ones (".csv.gz", ".csv.bz2", ".csv.xz" and ".csv.zst"). The decompression
+  is streamed while the file is parsed, so a compressed file is never decompressed to disk or completely into memory.
+  """
     def read_file(self, columns=None, skiprows=None, nrows=None):
         """
       This method reads a CSV file with options to select columns and limit rows.
       """
         try:
-            data = pd.read_csv(self.file_path, usecols=columns, skiprows=skiprows, nrows=nrows)
+            with open_source(self.file_path) as source:
+                data = pd.read_csv(source, usecols=columns, skiprows=skiprows, nrows=nrows)
             if not skiprows and not nrows and len(columns) == 1:
                 logging.info(f"Successfully read CSV file: {self.file_path} with only the '{columns[0]}' column.")
             else:
@@ -20,4 +26,15 @@ class CSVFileReader(BaseFileReader):
         # TODO: add dask
 
         except Exception as e:
-            log_and_raise_error(f"Failed to read CSV file {self.file_path}: {e}")
\ No newline at end of file
+            log_and_raise_error(f"Failed to read CSV file {self.file_path}: {e}")
+
+    def read_chunks(self, columns=None, chunk_size=100_000):
+        """
+      This method reads a CSV file in chunks of "chunk_size" rows, so a caller can filter the rows while reading.
+      The chunks keep the row numbers of the file as index.
+      """
+        try:
+            with open_source(self.file_path) as source, pd.read_csv(source, usecols=columns, chunksize=chunk_size) as reader:
+                yield from reader
+        except Exception as e:
+            log_and_raise_error(f"Failed to read CSV file {self.file_path} in chunks: {e}")
@@ -1,15 +1,19 @@
 from utils.logging_setup import log_and_raise_error
 from data_manager.loaders.csv_file_reader import CSVFileReader
 from data_manager.loaders.excel_file_reader import ExcelFileReader
+from data_manager.loaders.compressed_stream import get_compression, strip_compression_extension
 
 def load_data(file_path):
     """
-  This function determines if the file is Excel or CSV based on its extension.
+  This function determines if the file is Excel or CSV based on its extension. CSV files can also be compressed
+  (e.g., ".csv.gz" or ".csv.zst").
   """
     file_path = str(file_path)
     if file_path.endswith(".xlsx") or file_path.endswith(".xls"):
         return ExcelFileReader(file_path)
-    elif file_path.endswith(".csv"):
+    elif strip_compression_extension(file_path).endswith(".csv"):
         return CSVFileReader(file_path)
+    elif get_compression(file_path):
+        log_and_raise_error("Unsupported compressed file format, only compressed csv files (e.g., '.csv.gz') are supported")
     else:
         log_and_raise_error("Unsupported file format, please choose a csv or excel file")
@@ -0,0 +1,155 @@
+import mmap
+import logging
+import numpy as np
+import pandas as pd
+
+SEGMENT_BYTES = 16 * 1024 * 1024
+# byte positions of (year, month, day) and of the separators in the accepted time formats (all are 19 characters long)
+FORMAT_LAYOUTS = {
+    "%Y-%m-%d %H:%M:%S": ((0, 5, 8), {4: "-", 7: "-"}),
+    "%d/%m/%Y %H:%M:%S": ((6, 3, 0), {2: "/", 5: "/"}),
+    "%m-%d-%Y %H:%M:%S": ((6, 0, 3), {2: "-", 5: "-"})}
+TIME_LAYOUT = {10: " ", 13: ":", 16: ":"}
+FIELD_LENGTH = 19
+# the default NA strings of pandas.read_csv (these fields are missing values, not failed conversions)
+NA_STRINGS = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>", "N/A",
+              "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+def scan_time_column(file_path, time_column, time_format):
+    """
+  This function reads the time column of a plain CSV file without parsing the other fields. The file is memory-mapped,
+  the byte span of the time field on every line is found with vectorized delimiter searches, and only these bytes are
+  converted into timestamps. It returns the timestamps (a datetime64 Series, NaT for the missing and the failed values,
+  with the row numbers of "pandas.read_csv" as index) and the mask of the missing values. It returns None if the file
+  can not be scanned this way (e.g., compressed, quoted fields, blank lines or an unsupported time format), the caller
+  then reads the column with pandas.
+  """
+    file_path = str(file_path)
+    if not file_path.endswith(".csv") or time_format not in FORMAT_LAYOUTS:
+        return None
+
+    try:
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _scan_mapped(mapped, time_column, time_format)
+    except (OSError, ValueError) as e:
+        # e.g., an empty file can not be memory-mapped
+        logging.debug("The time column of %s can not be scanned (%s), it is read with pandas.", file_path, e)
+        return None
+
+# --- Helper Functions ---
+def _scan_mapped(mapped, time_column, time_format):
+    """
+  This helper function scans the memory-mapped file segment by segment (every segment ends at a line end), so the
+  temporary position arrays stay small for large files.
+  """
+    header_end = mapped.find(b"\n")
+    if header_end < 0:
+        return None
+    header = bytes(mapped[:header_end]).decode("utf-8-sig").rstrip("\r").split(",")
+    if time_column not in header or len(set(header)) != len(header):
+        return None
+    field_index, field_count = header.index(time_column), len(header)
+
+    buffer = np.frombuffer(mapped, dtype=np.uint8)
+    times, missing = [], []
+    start = header_end + 1
+    while start < len(buffer):
+        end = mapped.find(b"\n", min(start + SEGMENT_BYTES, len(buffer)) - 1)
+        end = len(buffer) if end < 0 else end + 1
+        scanned = _scan_segment(buffer[start:end], field_index, field_count, time_format)
+        if scanned is None:
+            return None
+        times.append(scanned[0])
+        missing.append(scanned[1])
+        start = end
+
+    if not times:
+        return None
+    times, missing = np.concatenate(times), np.concatenate(missing)
+    return pd.Series(times, name=time_column), missing
+
+def _scan_segment(segment, field_index, field_count, time_format):
+    """
+  This helper function finds the time field of every line of a segment and converts it. It returns None if a line has
+  quotes, is blank or does not have the number of fields of the header.
+  """
+    if (segment == ord('"')).any():
+        return None
+
+    line_ends = np.flatnonzero(segment == ord("\n"))
+    if not len(line_ends) or line_ends[-1] != len(segment) - 1:
+        # the last line of the file has no line break
+        line_ends = np.append(line_ends, len(segment))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    carriage_returns = (line_ends > line_starts) & (segment[line_ends - 1] == ord("\r"))
+    line_ends = line_ends - carriage_returns
+    if (line_ends == line_starts).any():
+        # blank lines are skipped by pandas, so the row numbers would not match
+        return None
+
+    commas = np.flatnonzero(segment == ord(","))
+    first_comma = np.searchsorted(commas, line_starts)
+    if ((np.searchsorted(commas, line_ends) - first_comma) != field_count - 1).any():
+        return None
+
+    field_starts = line_starts if field_index == 0 else commas[first_comma + field_index - 1] + 1
+    field_ends = line_ends if field_index == field_count - 1 else commas[first_comma + field_index]
+    return _parse_fields(segment, field_starts, field_ends, time_format)
+
+def _parse_fields(segment, field_starts, field_ends, time_format):
+    """
+  This helper function converts the time fields into int64 timestamps (ns). The fields that have exactly the layout of
+  the time format are converted with vectorized digit arithmetic, the few other ones (e.g., missing, invalid or not
+  zero-padded values) are converted by pandas like in the time preprocessing.
+  """
+    (year_pos, month_pos, day_pos), date_separators = FORMAT_LAYOUTS[time_format]
+    lengths = field_ends - field_starts
+    times = np.full(len(field_starts), np.iinfo(np.int64).min, dtype=np.int64)
+    missing = lengths == 0
+
+    # one row per character position (contiguous), so every digit is a contiguous array
+    fixed_rows = np.flatnonzero(lengths == FIELD_LENGTH)
+    fields = segment[np.arange(FIELD_LENGTH)[:, None] + field_starts[fixed_rows]]
+    # the bytes below "0" wrap around, so every non-digit byte is above 9
+    digits = fields - np.uint8(ord("0"))
+
+    separators = {**date_separators, **TIME_LAYOUT}
+    valid = np.ones(len(fixed_rows), dtype=bool)
+    for pos in range(FIELD_LENGTH):
+        valid &= fields[pos] == ord(separators[pos]) if pos in separators else digits[pos] <= 9
+
+    number = lambda pos, width: sum(digits[pos + i].astype(np.int64) * 10 ** (width - 1 - i) for i in range(width))
+    year, month, day = number(year_pos, 4), number(month_pos, 2), number(day_pos, 2)
+    hour, minute, second = number(11, 2), number(14, 2), number(17, 2)
+
+    # calendar checks, the other values (e.g., "2024-02-30") are left to pandas (which sets them to NaT)
+    leap_year = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = DAYS_IN_MONTH[np.clip(month, 0, 12)] + ((month == 2) & leap_year)
+    valid &= (year >= 1678) & (year <= 2261) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    valid &= (hour < 24) & (minute < 60) & (second < 60)
+
+    seconds = _days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second
+    times[fixed_rows[valid]] = seconds[valid] * 1_000_000_000
+
+    # the other fields are converted by pandas
+    other_rows = np.setdiff1d(np.flatnonzero(~missing), fixed_rows[valid], assume_unique=True)
+    if len(other_rows):
+        values = [bytes(segment[field_starts[row]:field_ends[row]]).decode("utf-8", errors="replace") for row in other_rows]
+        na_values = np.array([value in NA_STRINGS for value in values], dtype=bool)
+        missing[other_rows[na_values]] = True
+        converted = pd.to_datetime(pd.Series(values)[~na_values], format=time_format, errors="coerce")
+        times[other_rows[~na_values]] = converted.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    return times.view("datetime64[ns]"), missing
+
+def _days_from_civil(year, month, day):
+    """
+  This helper function returns the days since 1970-01-01 of proleptic Gregorian dates (vectorized).
+  """
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
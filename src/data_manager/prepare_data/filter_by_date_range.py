@@ -2,7 +2,9 @@ import logging
 import pandas as pd
 from utils.logging_setup import log_and_raise_error
 from data_manager.loaders.data_loader import load_data
+from data_manager.loaders.time_column_scanner import scan_time_column
 from data_manager.preprocessing.time_preprocessor import TimePreprocessor
+from utils.instrumentation import instrumented
 
 class PartialDataLoader:
     def __init__(self, file_path, sensors, time_column, time_format, time_processing_par):
@@ -18,12 +20,16 @@ class PartialDataLoader:
         """
       This method initializes and filters only the time column using DataChecker.
       """
-        # load only the time column from the dataset
-        time_data = load_data(self.file_path).read_file(columns=[self.time_column])
+        # load only the time column from the dataset (a plain CSV is scanned without parsing the other fields)
+        scanned = scan_time_column(self.file_path, self.time_column, self.time_format)
+        if scanned is not None:
+            time_data, missing = scanned[0].to_frame(), scanned[1]
+        else:
+            time_data, missing = load_data(self.file_path).read_file(columns=[self.time_column]), None
 
         # process the time column
         self.time_data_checker = TimePreprocessor(time_data, self.time_column, self.time_format)
-        processed_time = self.time_data_checker.process_time_column(self.time_processing_par)
+        processed_time = self.time_data_checker.process_time_column(self.time_processing_par, missing)
 
         # after cleaning, reset index with new filtered rows
         processed_time.reset_index(inplace=True)
@@ -68,6 +74,7 @@ class PartialDataLoader:
         logging.info(f"Extracted date range from {start_time} (row {start_row_index}) till {end_time} (row {end_row_index}).")
         return (start_row_index, end_row_index), matching_rows
 
+    @instrumented
     def get_filtered_data(self, start_date, end_date=None):
         """
       This method loads the final filtered data based on start and end rows and required columns.
@@ -76,15 +83,45 @@ class PartialDataLoader:
         (start_row_index, end_row_index), filtered_time = self._find_date_rows(start_date, end_date)
 
         # step 2: load only the necessary rows and columns based on these indices
+        return self._load_rows(start_row_index, end_row_index, filtered_time)
+
+    @instrumented
+    def get_data_after(self, watermark, watermark_rows=None):
+        """
+      This method loads only the rows appended since the last run: the rows newer than the "watermark" timestamp, and the
+      rows at the watermark after the first "watermark_rows" ones (already processed). With "watermark_rows" None, all the
+      rows at the watermark are skipped. It returns None if there are no new rows.
+      """
+        self._initialize_time_column()
+
+        watermark = pd.to_datetime(watermark)
+        matching_rows = self.filtered_time[self.filtered_time >= watermark]
+        at_watermark = matching_rows.index[matching_rows == watermark]
+        matching_rows = matching_rows.drop(at_watermark if watermark_rows is None else at_watermark[:watermark_rows])
+
+        if matching_rows.empty:
+            logging.info(f"No new rows found after {watermark}.")
+            return None
+
+        start_row_index = matching_rows.index.min()
+        end_row_index = matching_rows.index.max()
+        logging.info(f"Found {len(matching_rows)} new rows from {watermark} (rows {start_row_index} to {end_row_index}).")
+        return self._load_rows(start_row_index, end_row_index, matching_rows)
+
+    def _load_rows(self, start_row_index, end_row_index, filtered_time):
+        """
+      This helper method loads the rows between the start and end row indices for the required columns and aligns the time column.
+      """
+        # step 1: load only the necessary rows and columns based on these indices
         data = load_data(self.file_path).read_file(
             skiprows=range(1, start_row_index + 1),
             nrows=end_row_index - start_row_index + 1,
             columns=self.sensors)
 
-        # step 3: align time column
+        # step 2: align time column
         data[self.time_column] = filtered_time.values
 
-        # step 4: reorder columns to make the time column the first one
+        # step 3: reorder columns to make the time column the first one
         columns_order = [self.time_column] + [col for col in data.columns if col != self.time_column]
         data = data[columns_order]
 
@@ -3,6 +3,12 @@ import pandas as pd
 from utils.logging_setup import log_and_raise_error
 from data_manager.loaders.data_loader import load_data
 from data_manager.preprocessing.time_preprocessor import TimePreprocessor
+from utils.instrumentation import instrumented
+from utils.stage_pipeline import run_pipeline
+from utils.memory_governor import get_memory_governor, downcast_float_columns
+
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_PREFETCH_CHUNKS = 2
 
 class FullDataLoader:
     def __init__(self, file_path, sensors, time_column, time_format, check_duplicates_keep):
@@ -14,31 +20,101 @@ class FullDataLoader:
         self.filtered_time = None
         self.time_data_checker = None
 
-    def get_filtered_data(self):
+    @instrumented
+    def get_filtered_data(self, start=None, end=None, chunk_size=None, prefetch_chunks=DEFAULT_PREFETCH_CHUNKS):
         """
-      This method loads the final filtered data based on start and end rows and required columns.
+      This method loads the final filtered data for the required columns. With "start" and/or "end" (inclusive timestamps),
+      the rows are filtered while the file is read in chunks, so the rows outside the bounds are never kept in memory.
+      Up to "prefetch_chunks" chunks are read ahead while the current one is filtered (0: read and filter one after the other).
+      With a memory budget, the memory governor can read the whole file in chunks too, and convert the values to float32.
       """
-        # step 1: load all required columns
+        # step 1: load all required columns (only the rows within the bounds, if there are any)
         columns = [self.time_column] + self.sensors
-        data = load_data(self.file_path).read_file(columns)
+        bounded = start is not None or end is not None
+        chunk_size, float32 = get_memory_governor().plan_reading(self.file_path, len(self.sensors), chunk_size or DEFAULT_CHUNK_SIZE, prefetch_chunks, bounded)
+        if chunk_size is None:
+            data = load_data(self.file_path).read_file(columns)
+        else:
+            data = self._read_rows_within(columns, start, end, chunk_size, prefetch_chunks, float32)
 
         # step 2: process the time column and update data
         self.time_data_checker = TimePreprocessor(data[[self.time_column]], self.time_column, self.time_format)
         processed_df = self.time_data_checker.process_time_column(self.check_duplicates_keep)
         data[self.time_column] = processed_df[self.time_column]
-        
-        # step 3: apply the mask for the date range
-        start_date = pd.to_datetime(data[self.time_column].min())
-        end_date = pd.to_datetime(data[self.time_column].max())
 
-        # create the mask and filter the data
-        date_mask = (data[self.time_column] >= start_date) & (data[self.time_column] <= end_date)
-        filtered_data = data[date_mask]
+        # step 3: drop the rows removed by the time processing (they are NaT after the alignment), the other rows keep their order
+        if len(processed_df) < len(data):
+            data = data[data[self.time_column].notna()]
 
         # check if the filtered data is empty
-        if filtered_data.empty:
+        if data.empty:
             log_and_raise_error("The input DataFrame is empty. Please provide a valid DataFrame.")
 
-        logging.info(f"Extracted date range from {start_date} to {end_date}.")
+        logging.info(f"Extracted date range from {processed_df[self.time_column].iloc[0]} to {processed_df[self.time_column].iloc[-1]}.")
         logging.info(f"DataFrame was filtered to the needed date range and columns.")
-        return filtered_data
+        return data
+
+    # --- Helper Methods ---
+    def _read_rows_within(self, columns, start, end, chunk_size, prefetch_chunks, float32=False):
+        """
+      This helper method reads the file in chunks and keeps only the rows whose timestamp is within the bounds (all the
+      rows with a valid timestamp without bounds). The time column of the kept rows is already converted to datetime,
+      and the sensor values to float32 with "float32". The missing and failed timestamps of the whole file are counted,
+      so "handle_missing" and "action" of the time processing parameters still apply to all the rows.
+      With "prefetch_chunks", the chunks are read by a reader thread and filtered by a worker thread of a stage pipeline.
+      """
+        start = pd.to_datetime(start) if start is not None else None
+        end = pd.to_datetime(end) if end is not None else None
+        if start is not None and end is not None and start > end:
+            log_and_raise_error(f"Invalid date range: start {start} is greater than end {end}")
+
+        def filter_chunk(chunk):
+            missing = chunk[self.time_column].isna()
+            times = pd.to_datetime(chunk[self.time_column], format=self.time_format, errors="coerce")
+            within = times.notna()
+            if start is not None:
+                within &= times >= start
+            if end is not None:
+                within &= times <= end
+            kept = None
+            if within.any():
+                chunk[self.time_column] = times
+                kept = chunk[within]
+                if float32:
+                    kept = downcast_float_columns(kept, self.sensors)
+            return kept, len(chunk), int(missing.sum()), int((times.isna() & ~missing).sum())
+
+        chunks = load_data(self.file_path).read_chunks(columns, chunk_size)
+        if prefetch_chunks:
+            filtered_chunks = run_pipeline("full_data_read", chunks, [("filter", filter_chunk)], prefetch_chunks)
+        else:
+            filtered_chunks = map(filter_chunk, chunks)
+
+        kept_chunks, total_rows, missing_count, failed_count = [], 0, 0, 0
+        for kept, rows, missing, failed in filtered_chunks:
+            total_rows += rows
+            missing_count += missing
+            failed_count += failed
+            if kept is not None:
+                kept_chunks.append(kept)
+
+        self._check_skipped_times(missing_count, failed_count)
+        if not kept_chunks:
+            log_and_raise_error(f"No data found between {start} and {end}.")
+
+        data = pd.concat(kept_chunks) if len(kept_chunks) > 1 else kept_chunks[0]
+        logging.info("Kept %s of %s rows between %s and %s while reading %s.", len(data), total_rows, start, end, self.file_path)
+        return data
+
+    def _check_skipped_times(self, missing_count, failed_count):
+        """
+      This helper method applies the time processing parameters to the missing and failed timestamps found while reading.
+      """
+        handle_missing, action = self.check_duplicates_keep[1], self.check_duplicates_keep[2]
+        if missing_count and handle_missing == "error":
+            log_and_raise_error(f"The time column '{self.time_column}' contains {missing_count} missing (NaN) values. "
+                                "Please clean the data or set 'handle_missing' to 'drop'.")
+        if failed_count and action == "error":
+            log_and_raise_error(f"Failed to convert {failed_count} rows to datetime. Inspect or clean these rows.")
+        if missing_count or failed_count:
+            logging.warning("Dropped %s rows with a missing and %s rows with an invalid timestamp while reading.", missing_count, failed_count)
@@ -0,0 +1,125 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from utils.logging_setup import log_and_raise_error
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows, the code tables file is then updated without a lock
+    fcntl = None
+
+class CategoricalEncoder:
+    """
+  This class holds the code tables of the categorical columns (the values in the order of their integer codes). Every
+  column is factorized in one vectorized pass and its values are looked up once per distinct value, so the codes of a
+  value never change once it is in the table: the unseen values of new chunks or files are appended to the table. A new
+  table uses the order of appearance for two values (e.g., ON/OFF) and the sorted order for more values.
+  """
+    VERSION = 1
+
+    def __init__(self, code_tables=None):
+        self.code_tables = code_tables or {}
+        self.changed = False
+
+    def encode(self, series, column):
+        """
+      This method encodes the values of a column into their integer codes (-1 for the missing values). It returns the
+      codes and the index of the most frequent value in the code table (the smallest value on ties, like "Series.mode"),
+      or None if the column has no values.
+      """
+        # step 1: factorize once, the distinct values are sorted so the first maximum count is the mode
+        codes, uniques = pd.factorize(series, sort=True)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+        # step 2: the code table of the column, the unseen values are appended
+        table = self.code_tables.get(column)
+        if table is None:
+            table = self.code_tables[column] = self._new_table(series, uniques)
+            self.changed = True
+        values = [self._to_python(value) for value in uniques]
+        positions = {value: code for code, value in enumerate(table)}
+        for value in values:
+            if value not in positions:
+                positions[value] = len(table)
+                table.append(value)
+                self.changed = True
+
+        # step 3: remap the factorized codes to the codes of the table
+        remap = np.array([positions[value] for value in values] + [-1], dtype=np.int64)
+        mode_code = remap[np.argmax(counts)] if len(uniques) else None
+        return remap[codes], mode_code
+
+    def to_dict(self):
+        """
+      This method converts the code tables into a serializable dictionary.
+      """
+        return {"version": self.VERSION, "code_tables": self.code_tables}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+      This method recreates an encoder from the output of "to_dict".
+      """
+        if data.get("version") != cls.VERSION:
+            log_and_raise_error(f"Unsupported categorical code tables version: {data.get('version')}.")
+        return cls(data["code_tables"])
+
+    def save(self, codes_file):
+        """
+      This method saves the code tables as JSON.
+      """
+        temp_file = f"{codes_file}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temp_file, codes_file)
+        self.changed = False
+        logging.info(f"Categorical code tables saved in {codes_file}.")
+
+    @classmethod
+    def load(cls, codes_file):
+        """
+      This method loads the code tables saved with "save". It returns an empty encoder if the file does not exist.
+      """
+        if not os.path.exists(codes_file):
+            return cls()
+        try:
+            with open(codes_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log_and_raise_error(f"Failed to read the categorical code tables file {codes_file}: {e}")
+        return cls.from_dict(data)
+
+    @classmethod
+    @contextmanager
+    def locked(cls, codes_file):
+        """
+      This method loads the code tables for an update and saves them afterwards if values were appended. The file is
+      locked in the meantime, so parallel jobs (e.g., the batch mode) do not give the same code to different values.
+      """
+        with open(f"{codes_file}.lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            encoder = cls.load(codes_file)
+            yield encoder
+            if encoder.changed:
+                encoder.save(codes_file)
+
+    # --- Helper Methods ---
+    def _new_table(self, series, uniques):
+        """
+      This helper method creates the code table of a column that is not in the tables yet.
+      """
+        if len(uniques) == 2:
+            return [self._to_python(value) for value in series.dropna().unique()]
+        return [self._to_python(value) for value in uniques]
+
+    @staticmethod
+    def _to_python(value):
+        """
+      This helper method converts NumPy scalars into Python values, so the values can be saved as JSON.
+      """
+        return value.item() if isinstance(value, np.generic) else value
@@ -1,25 +1,42 @@
 import logging
+import numpy as np
 import pandas as pd
 from utils.logging_setup import log_and_raise_error, log_and_raise_exception
+from utils.instrumentation import instrumented
+from data_manager.preprocessing.categorical_encoder import CategoricalEncoder
 
 class DataChecker:
-    def __init__(self, df, sensors=None, time_column=None):
+    """
+  This class cleans and validates the loaded data. It owns the DataFrame it is given: every step changes "self.df" in
+  place (or replaces it with a smaller frame, e.g., after dropping rows) instead of working on copies, so the caller
+  must not use the frame afterwards and has to pass a copy if it still needs the original data.
+  """
+    def __init__(self, df, sensors=None, time_column=None, categorical_encoder=None):
         self.df = df
         self.sensors = sensors if sensors is not None else []
         self.time_column = time_column
+        self.categorical_encoder = categorical_encoder if categorical_encoder is not None else CategoricalEncoder()
 
+    @instrumented
     def full_validation(self, core_processing_par):
         """
       This method performs a full validation and cleaning process.
       """
         logging.info("Starting the data cleaning and validation process for the loaded dataset.")
         
-        strategy, fill_method, fill_value, time_window, outliers_method, threshold = core_processing_par
+        strategy, fill_method, fill_value, time_window, outliers_method, threshold = core_processing_par[:6]
+        codes_file = core_processing_par[6] if len(core_processing_par) > 6 else None
 
         self.validate_columns()
         self.standardize_column_names()
         self.handle_missing_values(strategy, fill_method, fill_value, time_window)
-        self.encode_categorical_and_booleans()
+        if codes_file:
+            # the codes of the categorical values are kept in the code tables file, so every run, chunk or file uses the same codes
+            with CategoricalEncoder.locked(codes_file) as categorical_encoder:
+                self.categorical_encoder = categorical_encoder
+                self.encode_categorical_and_booleans()
+        else:
+            self.encode_categorical_and_booleans()
         self.validate_data_types()
         self.detect_outliers(outliers_method, threshold)
         self.last_emptness_check()
@@ -27,6 +44,7 @@ class DataChecker:
         logging.info("Main data cleaning and validation process completed.")
         return self.df
 
+    @instrumented
     def validate_columns(self):
         """
       This method checks if the DataFrame contains the required columns.
@@ -47,6 +65,7 @@ class DataChecker:
 
         return self.df
     
+    @instrumented
     def standardize_column_names(self):
         """
       This method standardizes column names by making them lowercase, tripping leading/trailing spaces, 
@@ -68,6 +87,7 @@ class DataChecker:
         
         return self.df
 
+    @instrumented
     def handle_missing_values(self, strategy, fill_method, fill_value=None, time_window=None):
         """
       This method handles missing values in the DataFrame for all columns.
@@ -78,7 +98,8 @@ class DataChecker:
         time_window: Optional. A Pandas offset string (e.g., "1min", "5min") to specify a rolling window for calculating replacement values.
       """
         self._validate_time_column()
-        self.df = self.df.set_index(self.time_column)
+        # the time column is moved to the index (and back) in place, without copying the sensor columns
+        self.df.set_index(self.time_column, inplace=True)
 
         numeric_columns = self._get_numeric_columns()
 
@@ -90,64 +111,66 @@ class DataChecker:
             log_and_raise_error(f"Unknown strategy '{strategy}' provided for handling missing values.")
 
         # reset index to restore the time column
-        self.df = self.df.reset_index()
+        self.df.reset_index(inplace=True)
 
         return self.df
 
+    @instrumented
     def encode_categorical_and_booleans(self):
         """
         This method encodes non-numeric columns into numerical representations.
         - Boolean-like values (True/False) are converted to 1/0.
-        - Binary categorical values (e.g., ON/OFF) are mapped to 1/0.
-        - Multi-class categorical values are encoded as integers.
+        - Categorical values (e.g., ON/OFF or multi-class) are encoded with the codes of the categorical encoder.
         - Missing values in non-numeric columns are filled with the mode.
         """
         for column in self.df.columns:
             if column == self.time_column:
                 continue
 
-            # check for missing values and fill with mode if necessary
-            missing_count = self.df[column].isna().sum()
-            if missing_count > 0:
-                mode_value = self.df[column].mode()
-                if not mode_value.empty:
-                    logging.warning(f"Filling {missing_count} missing values in column '{column}' with mode value '{mode_value.iloc[0]}'.")
-                    self.df[column] = self.df[column].fillna(mode_value.iloc[0])
-                else:
-                    logging.warning(f"Cannot compute mode for column '{column}' due to empty or invalid data; missing values remain.")
-
             col_dtype = self.df[column].dtype
-
-            # boolean columns
-            if col_dtype == "bool":
+            missing_count = self.df[column].isna().sum()
+            is_text = col_dtype == "object" or str(col_dtype).startswith("string")
+
+            # boolean values (also with missing values, which make the column an object column), inferred in one vectorized pass
+            if col_dtype == "bool" or (is_text and pd.api.types.infer_dtype(self.df[column], skipna=True) == "boolean"):
+                values = self.df[column].astype("boolean")
+                if missing_count > 0:
+                    mode_value = bool(values.sum() * 2 > values.count())
+                    logging.warning(f"Filling {missing_count} missing values in column '{column}' with mode value '{mode_value}'.")
+                    values = values.fillna(mode_value)
                 logging.info(f"Encoding boolean column '{column}' as integers (0/1).")
-                self.df[column] = self.df[column].astype("int8")
-
-            # object or string-based columns
-            elif col_dtype == "object" or str(col_dtype).startswith("string"):
-                unique_values = self.df[column].dropna().unique()
+                self.df[column] = values.astype("int8")
+
+            # object or string-based columns (one factorization per column, the codes come from the code tables)
+            elif is_text:
+                codes, mode_code = self.categorical_encoder.encode(self.df[column], column)
+                table = self.categorical_encoder.code_tables[column]
+                if missing_count > 0:
+                    if mode_code is None:
+                        logging.warning(f"Cannot compute mode for column '{column}' due to empty or invalid data; missing values are encoded as -1.")
+                    else:
+                        logging.warning(f"Filling {missing_count} missing values in column '{column}' with mode value '{table[mode_code]}'.")
+                        codes[codes < 0] = mode_code
+                logging.info(f"Encoding categorical column '{column}' with {len(table)} codes.")
+                self.df[column] = codes.astype(np.min_scalar_type(-max(len(table), 1)))
 
-                # binary categorical (e.g., ON/OFF, Yes/No)
-                if len(unique_values) == 2:
-                    logging.info(
-                        f"Encoding binary categorical column '{column}' as integers (0/1) with mapping: "
-                        f"{{'{unique_values[0]}': 0, '{unique_values[1]}': 1}}.")
-                    self.df[column] = (self.df[column].map({unique_values[0]: 0, unique_values[1]: 1}).astype("int8"))
-
-                # multi-class categorical
-                else:
-                    logging.info(f"Encoding multi-class categorical column '{column}' with unique values: {unique_values}.")
-                    self.df[column] = self.df[column].astype("category").cat.codes.astype("int8")
-
-                    for idx, value in enumerate(unique_values):
-                        logging.info(f"Encoded value '{value}' as {idx} in column '{column}'.")
-
-            # handle any unexpected non-numeric data types
-            elif not pd.api.types.is_numeric_dtype(col_dtype):
-                logging.warning(f"Unexpected non-numeric column '{column}' detected with dtype '{col_dtype}'. No encoding applied.")
+            else:
+                # check for missing values and fill with mode if necessary
+                if missing_count > 0:
+                    mode_value = self.df[column].mode()
+                    if not mode_value.empty:
+                        logging.warning(f"Filling {missing_count} missing values in column '{column}' with mode value '{mode_value.iloc[0]}'.")
+                        self.df[column] = self.df[column].fillna(mode_value.iloc[0])
+                    else:
+                        logging.warning(f"Cannot compute mode for column '{column}' due to empty or invalid data; missing values remain.")
+
+                # handle any unexpected non-numeric data types
+                if not pd.api.types.is_numeric_dtype(col_dtype):
+                    logging.warning(f"Unexpected non-numeric column '{column}' detected with dtype '{col_dtype}'. No encoding applied.")
 
         return self.df
 
+    @instrumented
     def validate_data_types(self):
         """
       This method validates that the columns have expected data types.
@@ -172,6 +195,7 @@ class DataChecker:
 
         return self.df
 
+    @instrumented
     def detect_outliers(self, method, threshold):
         """
       This method detects outliers in sensor columns based on the specified method.
@@ -205,6 +229,7 @@ class DataChecker:
                 logging.warning(f"Sensor column '{col}' not found in DataFrame.")
         return self.df
 
+    @instrumented
     def last_emptness_check(self):
         """
       This method checks for any remaining empty values in the DataFrame after the cleaning process.
@@ -238,14 +263,21 @@ class DataChecker:
         """
       This helper method drops rows with missing values in the specified columns.
       """
-        missing_counts = self.df[columns].isna().sum()
-        total_missing_rows = self.df[columns].isna().any(axis=1).sum()
+        # the mask is built column by column ("self.df[columns]" would copy all the columns)
+        missing_rows = np.zeros(len(self.df), dtype=bool)
+        missing_counts = {}
+        for column in columns:
+            missing = self.df[column].isna().to_numpy()
+            missing_counts[column] = int(missing.sum())
+            missing_rows |= missing
+
+        total_missing_rows = int(missing_rows.sum())
         if total_missing_rows > 0:
-            missing_rows_timestamps = self.df[self.df[columns].isna().any(axis=1)].index.tolist()
-            logging.warning(
-                f"Found {total_missing_rows} rows to be dropped with missing values in these columns: {missing_counts.to_dict()}. "
-                f"for the following timestamps: {missing_rows_timestamps}.")
-            self.df = self.df.dropna(subset=columns)
+            logging.warning("Found %s rows to be dropped with missing values in these columns: %s.", total_missing_rows, missing_counts)
+            # the timestamps can be a very long list, they are only collected when the debug level is enabled
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("Timestamps of the dropped rows: %s.", self.df.index[missing_rows].tolist())
+            self.df = self.df.take(np.flatnonzero(~missing_rows))
 
     def _fill_missing_values(self, columns, fill_method, fill_value, time_window):
         """
@@ -267,10 +299,9 @@ class DataChecker:
             if missing_count == 0:
                 continue
             
-            missing_rows_timestamps = self.df[self.df[column].isna()].index.tolist()
-            logging.warning(
-                f"{missing_count} missing values found in '{column}', handling with '{fill_method}'. "
-                f"Timestamps of missing rows: {missing_rows_timestamps}.")
+            logging.warning("%s missing values found in '%s', handling with '%s'.", missing_count, column, fill_method)
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("Timestamps of missing rows in '%s': %s.", column, self.df[self.df[column].isna()].index.tolist())
 
             try:
                 if time_window is None:
@@ -337,27 +368,28 @@ class DataChecker:
       """
         window_offset = pd.Timedelta(time_window) / 2
 
+        # called for every missing value, so the logs are formatted lazily (%-style) by the logging thread
         def centered_rolling(row):
             current_time = row.name
             start_time = max(current_time - window_offset, self.df.index.min())
             end_time = min(current_time + window_offset, self.df.index.max())
 
             if not (start_time <= end_time):
-                logging.info(f"At timestamp '{current_time}', no valid window found. Skipping.")
+                logging.info("At timestamp '%s', no valid window found. Skipping.", current_time)
                 return None
 
             window_data = self.df.loc[start_time:end_time, column]
             if window_data.empty:
-                logging.info(f"At timestamp '{current_time}', window is empty. Skipping.")
+                logging.info("At timestamp '%s', window is empty. Skipping.", current_time)
                 return None
 
             if fill_method == "mean":
                 new_value = round(window_data.mean(), 1)
-                logging.info(f"At timestamp '{current_time}', filled using mean: {new_value} (window: {start_time} to {end_time}).")
+                logging.info("At timestamp '%s', filled using mean: %s (window: %s to %s).", current_time, new_value, start_time, end_time)
                 return new_value
             elif fill_method == "median":
                 new_value = round(window_data.median(), 1)
-                logging.info(f"At timestamp '{current_time}', filled using median: {new_value} (window: {start_time} to {end_time}).")
+                logging.info("At timestamp '%s', filled using median: %s (window: %s to %s).", current_time, new_value, start_time, end_time)
                 return new_value
 
         try:
@@ -0,0 +1,155 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+
+class DiscretizationModel:
+    """
+  This class holds the bin edges and labels of the continuous sensors. It is fitted once (optionally on a random sample
+  of the rows) and can then be applied to any chunk, file or time range with "np.searchsorted", so every part of the data
+  is binned with the same edges. The bins are right-closed like "pd.cut", values outside the edges fall into the outer bins.
+  """
+    VERSION = 1
+
+    def __init__(self, method, bins, bin_edges=None, bin_labels=None):
+        self.method = method
+        self.bins = bins
+        self.bin_edges = bin_edges or {}
+        self.bin_labels = bin_labels or {}
+
+    @classmethod
+    def fit(cls, df, columns, method, bins, labels=None, sample_size=None, random_state=0):
+        """
+      This method computes the bin edges of the given columns ("equal_width" like "pd.cut", "quantile" like "pd.qcut").
+      If "sample_size" is given and smaller than the data, the edges are computed from a reproducible random sample of the rows.
+      """
+        if method not in ["equal_width", "quantile"]:
+            log_and_raise_error("Invalid method. Choose 'equal_width' or 'quantile'.")
+
+        if sample_size and len(df) > sample_size:
+            df = df.sample(n=sample_size, random_state=random_state)
+            logging.info(f"Fitting the discretization model on a sample of {sample_size} rows.")
+
+        model = cls(method, bins)
+        for col in columns:
+            values = df[col].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                log_and_raise_error(f"Cannot compute bin edges for column '{col}', it has no values.")
+
+            if method == "equal_width":
+                edges = cls._equal_width_edges(values, bins)
+            else:
+                # duplicated edges are dropped, so a column can end up with fewer bins
+                edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+                if edges.size < 2:
+                    edges = cls._equal_width_edges(values, 1)
+
+            num_bins = len(edges) - 1
+            col_labels = list(labels) if labels is not None and len(labels) == num_bins else [f"bin_{i}" for i in range(num_bins)]
+            model.bin_edges[col] = [float(edge) for edge in edges]
+            model.bin_labels[col] = col_labels
+
+        logging.info(f"Discretization model fitted for {len(columns)} columns using method: {method}, bins: {bins}.")
+        return model
+
+    def transform(self, series):
+        """
+      This method bins a column with the stored edges and returns it as a categorical with the stored labels (NaN stays empty).
+      """
+        col = series.name
+        if col not in self.bin_edges:
+            log_and_raise_error(f"The discretization model has no bin edges for column '{col}'.")
+
+        values = series.to_numpy(dtype=float)
+        inner_edges = np.asarray(self.bin_edges[col][1:-1], dtype=float)
+        codes = np.searchsorted(inner_edges, values, side="left").astype(np.int16)
+        codes[np.isnan(values)] = -1
+
+        categories = pd.Index(self.bin_labels[col])
+        return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=col)
+
+    def has_columns(self, columns):
+        """
+      This method checks if the model has bin edges for all the given columns.
+      """
+        return all(col in self.bin_edges for col in columns)
+
+    def matches(self, method, bins, labels=None):
+        """
+      This method checks if the model was fitted with the given method, number of bins and labels (the labels of a column
+      with fewer bins, e.g., after dropping duplicated quantile edges, are the default ones like in "fit").
+      """
+        if method != self.method or bins != self.bins:
+            return False
+        for col_labels in self.bin_labels.values():
+            num_bins = len(col_labels)
+            expected_labels = list(labels) if labels is not None and len(labels) == num_bins else [f"bin_{i}" for i in range(num_bins)]
+            if list(col_labels) != expected_labels:
+                return False
+        return True
+
+    def to_dict(self):
+        """
+      This method converts the model into a serializable dictionary.
+      """
+        return {"version": self.VERSION, "method": self.method, "bins": self.bins,
+                "bin_edges": self.bin_edges, "bin_labels": self.bin_labels}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+      This method recreates a model from the output of "to_dict".
+      """
+        if data.get("version") != cls.VERSION:
+            log_and_raise_error(f"Unsupported discretization model version: {data.get('version')}.")
+        return cls(data["method"], data["bins"], data["bin_edges"], data["bin_labels"])
+
+    def save(self, model_file):
+        """
+      This method saves the model as JSON.
+      """
+        temp_file = f"{model_file}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temp_file, model_file)
+        logging.info(f"Discretization model saved in {model_file}.")
+
+    @classmethod
+    def load(cls, model_file, settings=None):
+        """
+      This method loads a model saved with "save". It returns None if the file does not exist, or if "settings" (method,
+      bins, labels) are given and the model was fitted with other ones, so the callers fit it again and overwrite the file.
+      """
+        if not os.path.exists(model_file):
+            return None
+        try:
+            with open(model_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log_and_raise_error(f"Failed to read the discretization model file {model_file}: {e}")
+        model = cls.from_dict(data)
+        if settings is not None and not model.matches(*settings):
+            logging.warning(f"The discretization model in {model_file} was fitted with other settings (method: {model.method}, bins: {model.bins}), "
+                            f"the bin edges are fitted again.")
+            return None
+        logging.info(f"Discretization model loaded from {model_file}.")
+        return model
+
+    # --- Helper Methods ---
+    @staticmethod
+    def _equal_width_edges(values, bins):
+        """
+      This helper method computes equal width edges the same way as "pd.cut" (the lowest edge is extended by 0.1% of the range).
+      """
+        mn, mx = float(values.min()), float(values.max())
+        if mn == mx:
+            mn -= 0.001 * abs(mn) if mn != 0 else 0.001
+            mx += 0.001 * abs(mx) if mx != 0 else 0.001
+            return np.linspace(mn, mx, bins + 1, endpoint=True)
+
+        edges = np.linspace(mn, mx, bins + 1, endpoint=True)
+        edges[0] -= (mx - mn) * 0.001
+        return edges
@@ -0,0 +1,93 @@
+import logging
+import numpy as np
+from utils.logging_setup import log_and_raise_error
+
+class ItemDictionary:
+    """
+  This class maps the one-hot encoded rule mining columns (e.g., "sensor1_bin_0") to compact int32 item IDs.
+  Each item ID is the position of its column in the rule mining DataFrame, so the miners can work on integer
+  itemsets, while the sensor name, bin label and bin edges are kept here and only used to decode the output.
+  """
+    def __init__(self, columns, sensors, labels, bin_edges):
+        self.item_ids = np.arange(len(columns), dtype=np.int32)
+        self.columns = np.asarray(columns, dtype=object)
+        self.sensors = np.asarray(sensors, dtype=object)
+        self.labels = np.asarray(labels, dtype=object)
+        self.bin_edges = list(bin_edges)
+
+    @classmethod
+    def from_columns(cls, columns, sensors_dict, bin_edges=None, bin_labels=None):
+        """
+      This method builds the item dictionary from the columns of the rule mining DataFrame.
+      A column is matched to the longest sensor name it starts with, the rest of the name is its label,
+      and continuous sensors get the (lower, upper) edges of their bin.
+      """
+        bin_edges = bin_edges or {}
+        bin_labels = bin_labels or {}
+        known_sensors = sorted({sensor for division in sensors_dict.values() for sensor in division}, key=len, reverse=True)
+
+        sensors, labels, edges = [], [], []
+        for column in columns:
+            column = str(column)
+            sensor, label = column, None
+            if column not in known_sensors:
+                for candidate in known_sensors:
+                    if column.startswith(f"{candidate}_"):
+                        sensor, label = candidate, column[len(candidate) + 1:]
+                        break
+
+            item_edges = None
+            if sensor in bin_edges and label in bin_labels.get(sensor, []):
+                position = list(bin_labels[sensor]).index(label)
+                item_edges = (float(bin_edges[sensor][position]), float(bin_edges[sensor][position + 1]))
+
+            sensors.append(sensor)
+            labels.append(label)
+            edges.append(item_edges)
+
+        logging.info(f"Item dictionary created with {len(sensors)} items.")
+        return cls(list(columns), sensors, labels, edges)
+
+    def __len__(self):
+        return len(self.item_ids)
+
+    def encode(self, columns):
+        """
+      This method returns the int32 item IDs of the given column names.
+      """
+        lookup = {column: item_id for column, item_id in zip(self.columns, self.item_ids)}
+        missing = [column for column in columns if column not in lookup]
+        if missing:
+            log_and_raise_error(f"Unknown items for the item dictionary: {missing}")
+        return np.array([lookup[column] for column in columns], dtype=np.int32)
+
+    def decode(self, item_ids):
+        """
+      This method returns the column names of the given item IDs (e.g., an antecedent or consequent frozenset).
+      """
+        return [self.columns[int(item_id)] for item_id in sorted(item_ids)]
+
+    def describe(self, item_id):
+        """
+      This method returns the sensor, label and bin edges of a single item ID.
+      """
+        item_id = int(item_id)
+        return {"item_id": item_id, "column": self.columns[item_id], "sensor": self.sensors[item_id],
+                "label": self.labels[item_id], "bin_edges": self.bin_edges[item_id]}
+
+    def to_dict(self):
+        """
+      This method converts the item dictionary into a serializable dictionary.
+      """
+        return {"columns": [str(column) for column in self.columns],
+                "sensors": [str(sensor) for sensor in self.sensors],
+                "labels": [None if label is None else str(label) for label in self.labels],
+                "bin_edges": [None if item_edges is None else list(item_edges) for item_edges in self.bin_edges]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+      This method recreates an item dictionary from the output of "to_dict".
+      """
+        bin_edges = [None if item_edges is None else tuple(item_edges) for item_edges in data["bin_edges"]]
+        return cls(data["columns"], data["sensors"], data["labels"], bin_edges)
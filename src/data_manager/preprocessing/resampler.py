@@ -0,0 +1,108 @@
+import logging
+import numpy as np
+import pandas as pd
+from utils.logging_setup import log_and_raise_error
+from utils.instrumentation import instrumented
+
+AGGREGATIONS = ["mean", "min", "max", "first", "last", "mode"]
+NUMERIC_AGGREGATIONS = ["mean", "min", "max"]
+DEFAULT_AGGREGATIONS = {"ordinal": "last", "categorical": "mode"}
+DEFAULT_CONTINUOUS_AGGREGATION = "mean"
+
+class Resampler:
+    """
+  This class resamples the loaded data to a regular time grid (e.g., 1 Hz readings to 1-minute rows) before the data is
+  cleaned and mined, with one aggregation per sensor division. Every row gets the start of its interval (intervals of
+  "rule" starting at midnight of the first day, like "DataFrame.resample"), and every interval with at least one row
+  becomes one row. The aggregations are computed on the sorted interval boundaries with "reduceat"-style kernels.
+  """
+    def __init__(self, df, sensors, time_column):
+        self.df = df
+        self.sensors = sensors
+        self.time_column = time_column
+
+    @instrumented
+    def resample(self, rule, aggregations):
+        """
+      This method resamples the data with the "rule" offset (e.g., "1min") and the aggregation of every division
+      ("aggregations", e.g., {"temperature": "mean", "categorical": "mode"}). The missing values are skipped by the
+      aggregations, an interval with only missing values of a sensor stays missing.
+      """
+        step = pd.Timedelta(rule).value
+        if step <= 0:
+            log_and_raise_error(f"Invalid resampling rule '{rule}': must be a positive fixed offset.")
+        input_rows = len(self.df)
+
+        # step 1: sort the timestamps and assign every row to its interval
+        times = pd.to_datetime(self.df[self.time_column]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        order = None if (np.diff(times) >= 0).all() else np.argsort(times, kind="stable")
+        if order is not None:
+            times = times[order]
+        origin = times[0] - times[0] % (24 * 3600 * 10**9)
+        buckets = (times - origin) // step
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+
+        # step 2: aggregate every sensor over the intervals
+        resampled = {self.time_column: (origin + buckets[starts] * step).view("datetime64[ns]")}
+        for division, division_sensors in self.sensors.items():
+            aggregation = aggregations.get(division, DEFAULT_AGGREGATIONS.get(division, DEFAULT_CONTINUOUS_AGGREGATION))
+            # the missing sensor columns are reported by the data cleaning
+            for sensor in [sensor for sensor in division_sensors if sensor in self.df.columns]:
+                values = self.df[sensor].to_numpy()
+                resampled[sensor] = self._aggregate(values if order is None else values[order], starts, aggregation, sensor)
+
+        columns = [col for col in self.df.columns if col in resampled]
+        self.df = pd.DataFrame(resampled)[columns]
+        logging.info("Resampled %s rows into %s rows of %s (%.1fx fewer rows).", input_rows, len(self.df), rule, input_rows / max(len(self.df), 1))
+        return self.df
+
+    # --- Helper Methods ---
+    def _aggregate(self, values, starts, aggregation, sensor):
+        """
+      This helper method aggregates the values of one sensor over the intervals starting at "starts".
+      """
+        if aggregation in NUMERIC_AGGREGATIONS:
+            if not pd.api.types.is_numeric_dtype(values):
+                log_and_raise_error(f"The '{aggregation}' resampling aggregation needs numeric values, sensor '{sensor}' is not numeric.")
+            values = values.astype(np.float64)
+            valid = ~np.isnan(values)
+            if aggregation == "mean":
+                sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+                counts = np.add.reduceat(valid.astype(np.int64), starts)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    return np.where(counts > 0, sums / counts, np.nan)
+            reduce = np.fmin if aggregation == "min" else np.fmax
+            return reduce.reduceat(values, starts)
+
+        # first, last and mode work on the codes of the values, so they keep the values (and types) of any column
+        codes, uniques = pd.factorize(values, sort=True)
+        if aggregation == "mode":
+            result_codes = self._mode_codes(codes, starts, len(uniques))
+        else:
+            positions = np.arange(len(codes))
+            if aggregation == "first":
+                positions = np.minimum.reduceat(np.where(codes >= 0, positions, len(codes)), starts)
+                result_codes = np.where(positions < len(codes), codes[np.minimum(positions, len(codes) - 1)], -1)
+            else:
+                positions = np.maximum.reduceat(np.where(codes >= 0, positions, -1), starts)
+                result_codes = np.where(positions >= 0, codes[positions], -1)
+
+        result = pd.Series(uniques.take(np.maximum(result_codes, 0)) if len(uniques) else np.full(len(starts), np.nan))
+        return result.where(result_codes >= 0).to_numpy() if (result_codes < 0).any() else result.to_numpy()
+
+    def _mode_codes(self, codes, starts, code_count):
+        """
+      This helper method returns the most frequent code of every interval (the smallest value on ties, like
+      "Series.mode"), or -1 if the interval has only missing values.
+      """
+        interval = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(codes))))
+        valid = codes >= 0
+        keys, counts = np.unique(interval[valid] * max(code_count, 1) + codes[valid], return_counts=True)
+        key_intervals, key_codes = keys // max(code_count, 1), keys % max(code_count, 1)
+
+        # per interval: highest count first, then the smallest code
+        order = np.lexsort((key_codes, -counts, key_intervals))
+        first = np.concatenate(([True], np.diff(key_intervals[order]) != 0))
+        result_codes = np.full(len(starts), -1, dtype=np.int64)
+        result_codes[key_intervals[order][first]] = key_codes[order][first]
+        return result_codes
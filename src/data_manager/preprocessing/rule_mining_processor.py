@@ -1,23 +1,36 @@
 import logging
+import numpy as np
 import pandas as pd
 from utils.logging_setup import log_and_raise_error
+from data_manager.preprocessing.item_dictionary import ItemDictionary
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+from utils.instrumentation import instrumented
+from utils.memory_governor import get_memory_governor
 
 class RuleMiningProcessor:
-    def __init__(self, df, sensors_dict, time_column):
+    """
+  This class turns the cleaned data into the binary (one-hot encoded) data of the rule mining. Like the DataChecker, it
+  owns the DataFrame it is given: the encoded columns are replaced in place by their one-hot columns, the other columns
+  are never copied, so the caller must not use the frame afterwards (or has to pass a copy).
+  """
+    def __init__(self, df, sensors_dict, time_column, discretization_model=None):
         self.df = df
         self.sensors_dict = sensors_dict
         self.time_column = time_column
+        self.discretization_model = discretization_model
         self.discretized_info = {}
 
-    def advanced_preprocessing(self, method, bins, labels, continuous_sensor_types):
+    @instrumented
+    def advanced_preprocessing(self, method, bins, labels, continuous_sensor_types, sample_size=None):
         """
       This method performs data preprocessing for association rule mining.
+      If a fitted discretization model was given, its bin edges are reused instead of being computed from this data.
       """
         logging.info("Starting the data cleaning and preprocessing process for association rule mining.")
         ordinal_sensors = "ordinal"
         categorical_sensors = "categorical"
 
-        self.discretize_and_encode(continuous_sensor_types, method, bins, labels)
+        self.discretize_and_encode(continuous_sensor_types, method, bins, labels, sample_size)
         self.clean_and_encode_ordinal(ordinal_sensors)
         self.convert_categorical_to_bool(categorical_sensors)
         self.last_emptness_check()
@@ -25,61 +38,57 @@ class RuleMiningProcessor:
         logging.info("Data cleaning and discretization completed for association rule mining.")
         return self.df
 
-    def discretize_and_encode(self, continuous_sensor_types, method, bins, labels):
+    @instrumented
+    def discretize_and_encode(self, continuous_sensor_types, method, bins, labels, sample_size=None):
         """ 
       This method discretizes the continuous columns and one-hot encodes the resulting categories.
+      The bin edges come from the discretization model, it is fitted on this data (or a sample of it) if it is missing.
       """
         logging.info(f"Starting discretization using method: {method}, bins: {bins}.")
 
         if continuous_sensor_types:
-            df_discretized = self.df.copy()
-            
             # get only the columns to discretize (continuous sensors)
             continuous_columns = self._get_sensors_by_type(continuous_sensor_types)
-            labels = [f"bin_{i}" for i in range(bins)] if labels is None else labels
 
+            # fit the bin edges only if no model (or a model without these columns or with other settings) was given
+            if (self.discretization_model is None or not self.discretization_model.has_columns(continuous_columns)
+                    or not self.discretization_model.matches(method, bins, labels)):
+                self.discretization_model = DiscretizationModel.fit(self.df, continuous_columns, method, bins, labels, sample_size)
+            else:
+                logging.info("Using the given discretization model, bin edges are not recomputed.")
+
+            discretized_columns = {}
             for col in continuous_columns:
-                if method == "equal_width":
-                    df_discretized[col], bin_edges = pd.cut(
-                        self.df[col], bins=bins, labels=labels, retbins=True)
-                elif method == "quantile":
-                    df_discretized[col], bin_edges = pd.qcut(
-                        self.df[col], q=bins, retbins=True, duplicates="drop")
-                    num_bins = len(bin_edges) - 1
-                    if len(labels) != num_bins:
-                        labels = [f"bin_{i}" for i in range(num_bins)]
-                    df_discretized[col] = pd.qcut(
-                        self.df[col], q=num_bins, labels=labels, retbins=False, duplicates="drop")
-                else:
-                    log_and_raise_error("Invalid method. Choose 'equal_width' or 'quantile'.")
-
-                self.discretized_info[col] = self._format_bin_info(bin_edges)
+                discretized_columns[col] = self.discretization_model.transform(self.df[col])
+                self.discretized_info[col] = self._format_bin_info(self.discretization_model.bin_edges[col])
             logging.info(f"Discretization completed. Bin information: {self.discretized_info}")
 
             # one-hot encode the discretized columns
-            self.df = pd.get_dummies(df_discretized, columns=continuous_columns)
+            self._one_hot_encode(continuous_columns, discretized_columns)
 
         else:
             logging.info(f"One-hot encoding skipped for continuous columns, none are specified")
 
+    @instrumented
     def clean_and_encode_ordinal(self, ordinal_sensor_types):
         """
       This method removes the time column and one-hot encodes ordinal columns.
       """
         # remove the time column if present
         if self.time_column in self.df.columns:
-            self.df.drop(columns=[self.time_column], inplace=True)
+            del self.df[self.time_column]
             logging.info(f"Removed '{self.time_column}' column from the dataset.")
         if ordinal_sensor_types:
             # get columns to encode (ordinal columns)
             ordinal_columns = self._get_sensors_by_type(ordinal_sensor_types)
             # one-hot encode ordinal columns
-            self.df = pd.get_dummies(self.df, columns=ordinal_columns)
+            self._one_hot_encode(ordinal_columns)
 
             logging.info(f"One-hot encoding completed for ordinal columns: {ordinal_columns}")
         else:
             logging.info(f"One-hot encoding skipped for ordinal columns, none are specified")
 
+    @instrumented
     def convert_categorical_to_bool(self, categorical_sensors):
         """
       This method converts categorical columns to boolean (True/False) type. It ensures that columns with
@@ -88,16 +97,19 @@ class RuleMiningProcessor:
         categorical_columns = self._get_sensors_by_type(categorical_sensors)
         
         # convert columns to boolean type
-        self.df[categorical_columns] = self.df[categorical_columns].astype(bool)
+        for col in categorical_columns:
+            self.df[col] = self.df[col].astype(bool)
 
         if isinstance(categorical_columns, list) and categorical_columns:
             logging.info(f"Converted categorical columns to boolean: {categorical_columns}")
 
+    @instrumented
     def last_emptness_check(self):
         """
       This method checks for any remaining empty values and ensures all columns are binary (0/1).
       """
-        empty_values = self.df.isna().sum()
+        # counted column by column, "self.df.isna()" would allocate a mask of the whole frame
+        empty_values = pd.Series({col: int(self.df[col].isna().sum()) for col in self.df.columns}, dtype="int64")
         total_empty = empty_values.sum()
 
         if total_empty > 0:
@@ -114,6 +126,14 @@ class RuleMiningProcessor:
         
         logging.info("Empty value check passed, and all columns are confirmed to be binary.")
 
+    def build_item_dictionary(self):
+        """
+      This method builds the item dictionary (int32 item IDs <-> sensor/bin labels and bin edges) for the processed columns.
+      """
+        bin_edges = self.discretization_model.bin_edges if self.discretization_model is not None else {}
+        bin_labels = self.discretization_model.bin_labels if self.discretization_model is not None else {}
+        return ItemDictionary.from_columns(self.df.columns, self.sensors_dict, bin_edges, bin_labels)
+
     # --- Helper Methods ---
     def _get_sensors_by_type(self, types):
         """
@@ -127,6 +147,60 @@ class RuleMiningProcessor:
                 sensors_combined.extend(sensors)
         return sensors_combined
 
+    def _one_hot_encode(self, columns, encoded_values=None):
+        """
+      This helper method replaces the columns with their one-hot encoded columns ("<column>_<value>", appended at the end
+      like "pd.get_dummies": one bool column per category, in the category order, or in the sorted order of the values if
+      it is not a categorical). The values to encode can be given (e.g., the discretized columns), otherwise the column is used.
+      All the one-hot columns are written in a single bool block, the other columns are not copied (the encoded columns
+      are deleted in place and the frames are concatenated without copy). If the block does not fit in the memory budget,
+      the columns are sparse, or the block is spilled to a memory-mapped temporary file.
+      """
+        if not columns:
+            return
+        encoded_values = encoded_values or {}
+        encodings = [self._get_encoding(encoded_values[col] if col in encoded_values else self.df[col]) for col in columns]
+
+        dummy_columns = [f"{col}_{category}" for col, (_, _, categories) in zip(columns, encodings) for category in categories]
+        index = self.df.index
+        memory_governor = get_memory_governor()
+        storage = memory_governor.transaction_storage(len(self.df), len(dummy_columns), len(columns))
+        if storage == "sparse":
+            # only the True values are stored (at most one per row and encoded column)
+            sparse_columns = {}
+            names = iter(dummy_columns)
+            for values, targets, _ in encodings:
+                for target in targets:
+                    sparse_columns[next(names)] = pd.arrays.SparseArray(np.equal(values, target), fill_value=False)
+            dummies = pd.DataFrame(sparse_columns, index=index)
+        else:
+            shape = (len(self.df), len(dummy_columns))
+            matrix = memory_governor.spill_array(shape, bool) if storage == "spill" else np.empty(shape, dtype=bool)
+            position = 0
+            for values, targets, _ in encodings:
+                np.equal(values[:, None], targets, out=matrix[:, position:position + len(targets)])
+                position += len(targets)
+            dummies = pd.DataFrame(matrix, index=index, columns=dummy_columns)
+
+        for col in columns:
+            del self.df[col]
+        self.df = pd.concat([self.df, dummies], axis=1, copy=False)
+
+    def _get_encoding(self, values):
+        """
+      This helper method returns the array to compare, the value of every one-hot column in it and the category names
+      of a column. The categoricals are compared by code, the numeric columns by value (no codes are allocated for them).
+      """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy(), np.arange(len(values.cat.categories)), values.cat.categories
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            array = values.to_numpy()
+            categories = np.unique(array)
+            categories = categories[~pd.isna(categories)]
+            return array, categories, categories
+        categorical = pd.Categorical(values)
+        return categorical.codes, np.arange(len(categorical.categories)), categorical.categories
+
     def _format_bin_info(self, bin_edges, precision=2):
         """
       This helper method formats bin ranges into a readable string with rounded values.
@@ -1,6 +1,7 @@
 import logging
 import pandas as pd
 from utils.logging_setup import log_and_raise_error, log_and_raise_exception
+from utils.instrumentation import instrumented
 
 class TimePreprocessor:
     def __init__(self, df, time_column, time_format):
@@ -8,9 +9,12 @@ class TimePreprocessor:
         self.time_column = time_column
         self.time_format = time_format
 
-    def process_time_column(self, time_processing_par):
+    @instrumented
+    def process_time_column(self, time_processing_par, missing=None):
         """
       This is the initial filtering step that processes the time column by converting to datetime, sorting, checking duplicates, and validating.
+      "missing" is the mask of the missing values if the time column was already converted (e.g., by the time column scanner),
+      so the missing values and the failed conversions (both NaT) are still handled separately.
       """
         keep = time_processing_par[0]
         handle_missing = time_processing_par[1]
@@ -19,7 +23,7 @@ class TimePreprocessor:
         logging.info(f"Starting the initial filtering and processing of the '{self.time_column}' column.")
 
         self.validate_time_column()
-        self.handle_missing_values(handle_missing)
+        self.handle_missing_values(handle_missing, missing)
         self.convert_to_datetime()
         self.handle_failed_datetime_conversion(action)
         self.order_time_column()
@@ -28,6 +32,7 @@ class TimePreprocessor:
         logging.info(f"The '{self.time_column}' column has been processed, indexed, and converted into a time-series.")
         return self.df
 
+    @instrumented
     def validate_time_column(self):
         """
       This method validates that the time column exists and contains valid data types.
@@ -47,21 +52,24 @@ class TimePreprocessor:
                 log_and_raise_error(f"The time column '{self.time_column}' contains unsupported data types. "
                                     "Supported types are string, datetime, or numeric.")
 
-    def handle_missing_values(self, method):
+    @instrumented
+    def handle_missing_values(self, method, missing=None):
         """
       This method handles missing values in the time column based on the specified method (error or drop).
       """
-        if self.df[self.time_column].isna().any():
-            missing_count = self.df[self.time_column].isna().sum()
+        missing = self.df[self.time_column].isna() if missing is None else pd.Series(missing, index=self.df.index)
+        if missing.any():
+            missing_count = missing.sum()
             if method == "drop":
                 logging.warning(f"Dropping {missing_count} rows with missing values in the '{self.time_column}' column.")
-                self.df = self.df.dropna(subset=[self.time_column])
+                self.df = self.df[~missing]
             elif method == "error":
                 log_and_raise_error(f"The time column '{self.time_column}' contains {missing_count} missing (NaN) values. "
                                     "Please clean the data or set 'handle_missing' to 'drop'.")
             else:
                 log_and_raise_error(f"Invalid method: '{method}' for handling missing values in time column preprocessing, allowed method: error or drop.")               
 
+    @instrumented
     def convert_to_datetime(self, errors="coerce"):
         """
       This method converts the date column to datetime format using the specified time format.
@@ -71,6 +79,7 @@ class TimePreprocessor:
         except Exception as e:
             log_and_raise_exception(f"Error converting '{self.time_column}' to datetime: {e}")
 
+    @instrumented
     def handle_failed_datetime_conversion(self, action):
         """
       This method handles rows where datetime conversion failed (set to NaT). Logs details and drops or raises an error.
@@ -79,7 +88,7 @@ class TimePreprocessor:
         if failed_count > 0:
             failed_rows = self.df[self.df[self.time_column].isna()]
             logging.warning(f"{failed_count} rows failed datetime conversion and have been set to NaT.")
-            logging.debug(f"Rows with failed datetime conversion: {failed_rows}")
+            logging.debug("Rows with failed datetime conversion: %s", failed_rows)
             
             if action == "drop":
                 self.df = self.df.dropna(subset=[self.time_column])
@@ -89,12 +98,14 @@ class TimePreprocessor:
             else:
                 raise ValueError("Invalid action specified. Use 'error' or 'drop'.")
 
+    @instrumented
     def order_time_column(self):
         """
       This method orders the DataFrame by the time column in ascending order.
       """
         self.df = self.df.sort_values(by=self.time_column)
 
+    @instrumented
     def check_duplicates(self, keep):
         """
       This method checks for and removes duplicates based on a specific column.
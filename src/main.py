@@ -1,37 +1,163 @@
 import os
-from core.mode_runner import run_analysis
-from config.config_loader import load_validate_config
+import sys
+import json
+import logging
+import argparse
+from config.config_loader import load_config
+from config.validate_config import validate_config, EXPLICIT_MODES
 from utils.logging_setup import initialize_logging, log_and_raise_error
 
-def main():
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CONFIG = os.path.join(SRC_DIR, "..", "config.yaml")
+DATE_MODES = ["single_day", "time_range", "full_data"]
+MODES = DATE_MODES + EXPLICIT_MODES
+
+def main(argv=None):
     """
-  This is the main function that reads the configuration from the config.yaml file, extracts the mode, 
-  and then calls the appropriate function to run (e.g., single day static, everyday static, etc.).
-  If the mode is not recognized, it logs an error and exits.  
+  This is the main function of the command line interface. "run" (the default, so "python main.py" still runs the
+  analysis of "config.yaml") loads and validates the configuration, applies the command line overrides and then runs
+  the analysis of the selected mode (e.g., single day, time range, etc.), "run --dry-run" and "validate" stop before
+  the analysis. pandas and mlxtend are only imported when the analysis runs, so these commands start fast.
+  It returns the exit code (0 if the command succeeded, 1 if the configuration or the inputs are invalid).
   """
-    # initialize logging
-    initialize_logging(level="INFO")
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    config_file = os.path.abspath(args.config)
 
-    # load and validate the configuration file
-    config_path = os.path.join("..", "config.yaml")
-    try:
-        config = load_validate_config(config_path)
-    except Exception as e:
-        log_and_raise_error(f"Error loading configuration: {e}")
-
-    # get the needed var to start the plotting process
-    mode = config.get("mode")
-    mode_mapping = {
-        "single_day": lambda: run_analysis(config, "single_day"),
-        "time_range": lambda: run_analysis(config, "time_range"),
-        "full_data": lambda: run_analysis(config, "full_data")
-    }
-
-    # run the function based on the mode
-    if mode in mode_mapping:
-        mode_mapping[mode]()
+    # the relative paths of the config (input_file, output_dir, etc.) are resolved from the src directory
+    os.chdir(SRC_DIR)
+
+    # step 1: set up logging (only a full run creates a logging session in "system_logs")
+    if args.command == "run" and not args.dry_run:
+        initialize_logging(level=args.log_level)
     else:
-        log_and_raise_error(f"Unknown mode '{mode}'. Available modes: {', '.join(mode_mapping.keys())}.")
+        logging.basicConfig(level=getattr(logging, args.log_level.upper()), format="%(levelname)s - %(message)s")
+
+    # step 2: load the configuration, apply the overrides and validate it
+    try:
+        config = load_run_config(config_file, args)
+        if args.command == "validate":
+            print(f"Configuration {config_file} is valid (mode: {config['mode']}).")
+            return 0
+        if args.dry_run:
+            plan = get_run_plan(config, config_file)
+            print(json.dumps(plan, indent=2))
+            return 0 if plan["input_file_exists"] else 1
+    except ValueError:
+        # the error was already logged
+        return 1
+
+    # step 3: run the analysis
+    run_mode(config, config["mode"])
+    return 0
+
+def parse_args(argv):
+    """
+  This function parses the command line arguments. Without arguments, the "run" command is used.
+  """
+    parser = argparse.ArgumentParser(prog="main.py", description="Mine association rules from sensor data with DataSense.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=DEFAULT_CONFIG, help="Configuration file (default: config.yaml in the project directory).")
+    common.add_argument("--mode", choices=MODES, default=None, help="Mode of the analysis, overrides the mode (and the dates) of the config.")
+    common.add_argument("--start", default=None, help="Day (YYYY-MM-DD) of a 'single_day' run, or the first day of a 'time_range' run with --end.")
+    common.add_argument("--end", default=None, help="Last day (YYYY-MM-DD) of a 'time_range' run.")
+    common.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Logging level (default: INFO).")
+
+    run_parser = subparsers.add_parser("run", parents=[common], help="Run the analysis (default command).")
+    run_parser.add_argument("--dry-run", action="store_true", help="Validate the config and show the resolved inputs without running the analysis.")
+    run_parser.add_argument("--profile", action="store_true", help="Profile the run (same as 'profiling.enabled' in the config).")
+    run_parser.add_argument("--profile-stages", action="store_true", help="Profile every top-level stage separately (same as 'profiling.per_stage').")
+    subparsers.add_parser("validate", parents=[common], help="Only validate the config (with the overrides).")
+
+    return parser.parse_args(argv or ["run"])
+
+def load_run_config(config_file, args):
+    """
+  This function loads the YAML config, applies the command line overrides and validates the result.
+  """
+    config = load_config(config_file)
+    if isinstance(config, dict):
+        apply_overrides(config, args)
+
+    logging.info("Validating configuration...")
+    validate_config(config)
+    if args.mode is not None and config["mode"] != args.mode:
+        log_and_raise_error(f"The '{args.mode}' mode needs other date fields (resolved mode: '{config['mode']}'). "
+                            "Use --start for 'single_day' and --start with --end for 'time_range'.")
+    logging.info("Configuration validated successfully.")
+    return config
+
+def apply_overrides(config, args):
+    """
+  This function applies the command line overrides to a config. The dates replace the date fields of the config
+  (the "single_day"/"time_range" modes are derived from them), "--mode" sets or removes the explicit "mode" key.
+  """
+    if args.end is not None and args.start is None:
+        log_and_raise_error("--end can only be used together with --start.")
+
+    if args.start is not None:
+        for key in ["date", "start_date", "end_date"]:
+            config.pop(key, None)
+        if args.end is not None:
+            config["start_date"], config["end_date"] = args.start, args.end
+        else:
+            config["date"] = args.start
+
+    if args.mode is not None:
+        if args.mode in EXPLICIT_MODES or args.mode == "full_data":
+            if args.start is not None:
+                log_and_raise_error(f"--start and --end can not be used with the '{args.mode}' mode.")
+            for key in ["date", "start_date", "end_date"]:
+                config.pop(key, None)
+        # the explicit modes are set with the "mode" key, the date modes are derived from the dates by the validation
+        if args.mode in EXPLICIT_MODES:
+            config["mode"] = args.mode
+        else:
+            config.pop("mode", None)
+
+    if getattr(args, "profile", False) or getattr(args, "profile_stages", False):
+        profiling = config.get("profiling") or {}
+        profiling["enabled"] = True
+        if args.profile_stages:
+            profiling["per_stage"] = True
+        config["profiling"] = profiling
+
+def get_run_plan(config, config_file):
+    """
+  This function returns what a run would do (mode, resolved paths, dates and optional features) without loading any data.
+  """
+    input_file = os.path.abspath(config["input_file"])
+    plan = {
+        "config_file": config_file,
+        "mode": config["mode"],
+        "input_file": input_file,
+        "input_file_exists": os.path.isfile(input_file),
+        "output_dir": os.path.abspath(config["output_dir"]),
+        "sensors": sum(len(sensors or []) for sensors in config["sensors"].values()),
+        "rule_mining": bool(config["pre_processing"].get("rule_mining"))}
+
+    for key in ["date", "start_date", "end_date"]:
+        if config.get(key):
+            plan[key] = str(config[key])
+    if config["mode"] == "batch":
+        plan["batch_jobs"] = len(config["batch"].get("jobs", []))
+    for section in ["full_data", "stage_cache", "instrumentation", "profiling"]:
+        if config.get(section) is not None:
+            plan[section] = config[section]
+
+    if not plan["input_file_exists"]:
+        logging.error(f"Input file {input_file} does not exist.")
+    return plan
+
+def run_mode(config, mode):
+    """
+  This function runs the analysis of a mode. The analysis modules (and pandas/mlxtend with them) are imported here.
+  """
+    from core.mode_runner import run_analysis
+    if mode not in MODES:
+        log_and_raise_error(f"Unknown mode '{mode}'. Available modes: {', '.join(MODES)}.")
+    run_analysis(config, mode)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
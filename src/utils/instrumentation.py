@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import logging
+import functools
+import threading
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager, nullcontext
+import pandas as pd
+from utils.profiling import profile_stage, stage_profiling_enabled
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, the peak RSS is then not reported
+    resource = None
+
+_active_report = None
+
+class RunReport:
+    """
+  This class collects the measurements of the pipeline stages of one run (wall time, CPU time, peak RSS, traced memory
+  and the rows/columns going in and out) and writes them as "run_report.json". The stages are measured only while a
+  report is active, otherwise the instrumented functions run without any overhead.
+  """
+    def __init__(self, mode=None, trace_memory=False):
+        self.mode = mode
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add_stage(self, record):
+        with self._lock:
+            self.stages.append(record)
+
+    def stage_stack(self):
+        """
+      This method returns the stack of the running stages of the current thread (used for the depth and the traced peaks).
+      """
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def to_dict(self, status="succeeded", error=None):
+        """
+      This method converts the report into a serializable dictionary.
+      """
+        report = {
+            "mode": self.mode,
+            "status": status,
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "wall_time_s": round(time.perf_counter() - self.start_wall, 4),
+            "cpu_time_s": round(time.process_time() - self._start_cpu, 4),
+            "peak_rss_mb": get_peak_rss_mb(),
+            # the stages are recorded when they finish, they are listed in the order they started
+            "stages": sorted(self.stages, key=lambda record: record["start_s"])}
+        if error is not None:
+            report["error"] = error
+        return report
+
+def get_peak_rss_mb():
+    """
+  This function returns the peak resident memory of the process in MB (None if it is not available on the platform).
+  """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB on Linux
+    return round(peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024, 2)
+
+def start_run_report(mode=None, trace_memory=False):
+    """
+  This function starts collecting the stage measurements of a run. With "trace_memory", the Python allocations of
+  every stage are traced with tracemalloc (more precise than the peak RSS, but it slows down the run).
+  """
+    global _active_report
+    _active_report = RunReport(mode, trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _active_report
+
+def finish_run_report(output_dir, status="succeeded", error=None):
+    """
+  This function stops collecting the measurements and writes the run report in "output_dir/run_report.json".
+  """
+    global _active_report
+    report, _active_report = _active_report, None
+    if report is None:
+        return None
+    if report.trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    report_file = os.path.join(output_dir, "run_report.json")
+    with open(report_file, "w") as f:
+        json.dump(report.to_dict(status, error), f, indent=2, default=str)
+    logging.info(f"Run report with {len(report.stages)} measured stages saved in {report_file}")
+    return report_file
+
+@contextmanager
+def measure_stage(stage, data=None):
+    """
+  This context manager measures a block of code as a stage of the active run report. "data" is the DataFrame going in,
+  the yielded dictionary can get the DataFrame going out with the "data_out" key and extra measurements with the
+  "metrics" key (e.g., the queue depths of a stage pipeline).
+  """
+    report = _active_report
+    if report is None:
+        yield {}
+        return
+
+    stack = report.stage_stack()
+    record = {"stage": stage, "depth": len(stack)}
+    _add_shape(record, "in", data)
+    frame = {"data_out": None}
+
+    if report.trace_memory and tracemalloc.is_tracing():
+        # the peak of the running parent stage is kept before the peak is reset for this stage
+        if stack:
+            stack[-1]["traced_peak"] = max(stack[-1]["traced_peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame["traced_start"] = frame["traced_peak"] = tracemalloc.get_traced_memory()[0]
+    stack.append(frame)
+
+    peak_rss_before = get_peak_rss_mb()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    record["start_s"] = round(start_wall - report.start_wall, 6)
+    # the top-level stages are also profiled separately if the stage profiling is enabled
+    profile = profile_stage(stage) if record["depth"] == 0 and stage_profiling_enabled() else nullcontext()
+    try:
+        with profile:
+            yield frame
+    finally:
+        record["wall_time_s"] = round(time.perf_counter() - start_wall, 6)
+        record["cpu_time_s"] = round(time.process_time() - start_cpu, 6)
+        peak_rss = get_peak_rss_mb()
+        record["peak_rss_mb"] = peak_rss
+        record["peak_rss_delta_mb"] = round(peak_rss - peak_rss_before, 2) if peak_rss is not None else None
+
+        stack.pop()
+        if "traced_start" in frame:
+            traced_peak = max(frame["traced_peak"], tracemalloc.get_traced_memory()[1])
+            record["traced_peak_delta_mb"] = round((traced_peak - frame["traced_start"]) / (1024 * 1024), 3)
+            if stack:
+                stack[-1]["traced_peak"] = max(stack[-1]["traced_peak"], traced_peak)
+
+        _add_shape(record, "out", frame["data_out"])
+        if frame.get("metrics") is not None:
+            record["metrics"] = frame["metrics"]
+        report.add_stage(record)
+
+def instrumented(func):
+    """
+  This decorator measures a function or a method as a stage of the active run report (named after its qualified name).
+  The rows/columns going in are taken from "self.df" or the first DataFrame argument, the ones going out from the
+  returned DataFrame (or "self.df" after the call).
+  """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active_report is None:
+            return func(*args, **kwargs)
+
+        owner = args[0] if args and isinstance(getattr(args[0], "df", None), pd.DataFrame) else None
+        data_in = owner.df if owner is not None else next((arg for arg in args if isinstance(arg, pd.DataFrame)), None)
+        with measure_stage(func.__qualname__, data_in) as frame:
+            result = func(*args, **kwargs)
+            data_out = _find_dataframe(result)
+            frame["data_out"] = data_out if data_out is not None else getattr(owner, "df", None)
+        return result
+    return wrapper
+
+# --- Helper Functions ---
+def _find_dataframe(value):
+    """
+  This helper function returns the DataFrame of a return value (the last one if it is a tuple).
+  """
+    if isinstance(value, pd.DataFrame):
+        return value
+    if isinstance(value, tuple):
+        return next((item for item in reversed(value) if isinstance(item, pd.DataFrame)), None)
+    return None
+
+def _add_shape(record, direction, data):
+    """
+  This helper function adds the rows and columns of a DataFrame to a stage record.
+  """
+    if isinstance(data, pd.DataFrame):
+        record[f"rows_{direction}"], record[f"columns_{direction}"] = data.shape
@@ -1,13 +1,36 @@
 import os
+import copy
+import queue
+import atexit
 import logging
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from utils.file_management import create_output_dir, cleanup_old_logs
 
+_session_log_dir = None
+_log_listener = None
+_output_handlers = []
+
+class DeferredQueueHandler(QueueHandler):
+    """
+  This class puts the log records in the queue with their message merged but not formatted by the handlers, the
+  timestamp, level and traceback are formatted by the listener thread. The %-style arguments are merged when the record
+  is logged, because the pipeline changes its frames and arrays in place, so they could show later values in the listener.
+  """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 def initialize_logging(level="INFO", log_dir_name="system_logs", max_bytes=5*1024*1024, backup_count=5):
     """
   This function initializes logging with the specified level, console and file logging, and log rotation.
+  The records are only put in a queue by the logging calls, a background thread (QueueListener) formats them and
+  writes them to the console and the log file, so the log I/O does not slow down the processing.
+  It returns the directory of the logging session (also used for other session files, e.g., the profiles).
   """
+    global _session_log_dir, _log_listener, _output_handlers
     # create the logs dir if it does not exist
     log_dir = os.path.join("..", log_dir_name)
     create_output_dir(log_dir)
@@ -15,7 +38,8 @@ def initialize_logging(level="INFO", log_dir_name="system_logs", max_bytes=5*102
     # clean up old log directories if there are more than 5
     cleanup_old_logs(log_dir, max_logs=4)
 
-    # remove any existing handlers to avoid duplicate logs
+    # stop the listener of a previous session and remove any existing handlers to avoid duplicate logs
+    stop_logging()
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
 
@@ -26,17 +50,36 @@ def initialize_logging(level="INFO", log_dir_name="system_logs", max_bytes=5*102
 
     log_file = os.path.join(log_path, "run.log")
 
-    # set up basic configuration for logging to console
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),  
-            RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-        ]
-    )
-    
+    # the console and file handlers are driven by the listener thread, the root logger only gets the queue handler
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    _output_handlers = [logging.StreamHandler(), RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)]
+    for handler in _output_handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *_output_handlers, respect_handler_level=True)
+    _log_listener.start()
+    logging.basicConfig(level=getattr(logging, level.upper()), handlers=[DeferredQueueHandler(log_queue)])
+
     logging.info("Logging initialized. Logs are being saved to %s", log_file)
+    _session_log_dir = log_path
+    return log_path
+
+def stop_logging():
+    """
+  This function writes the records still in the queue and stops the listener thread. It is called at exit, so the
+  last logs of a run (e.g., the error that stopped it) are never lost.
+  """
+    global _log_listener
+    listener, _log_listener = _log_listener, None
+    if listener is not None:
+        listener.stop()
+
+def get_session_log_dir():
+    """
+  This function returns the directory of the current logging session, or None if the logging was not initialized.
+  """
+    return _session_log_dir
 
 def log_and_raise_error(message):
     """
@@ -51,3 +94,23 @@ def log_and_raise_exception(message):
   """
     logging.error(message)
     raise Exception(message)
+
+# --- Helper Functions ---
+def _log_directly_in_child():
+    """
+  This helper function replaces the queue handler in a forked worker process (batch, per_day) with the console and
+  file handlers, the listener thread of the parent does not exist in the child, so its queued records would be lost.
+  """
+    global _log_listener
+    if _log_listener is None:
+        return
+    _log_listener = None
+    for handler in logging.root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            logging.root.removeHandler(handler)
+    for handler in _output_handlers:
+        logging.root.addHandler(handler)
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_log_directly_in_child)
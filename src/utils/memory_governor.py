@@ -0,0 +1,251 @@
+import os
+import bz2
+import gzip
+import lzma
+import logging
+import tempfile
+import numpy as np
+from utils.instrumentation import get_peak_rss_mb
+# the compression of the inputs is detected like in the loaders, "zstandard" is None if it is not installed
+from data_manager.loaders.compressed_stream import get_compression, zstandard
+
+MB = 2**20
+# typical size of the decompressed content per byte of a compressed input
+COMPRESSION_RATIOS = {"gzip": 5, "bz2": 6, "xz": 7, "zstd": 5}
+COMPRESSED_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+# bytes of the start of a file used to estimate the length of its rows
+HEAD_SAMPLE_BYTES = 1024 * 1024
+# memory per row of a timestamp read as text (Python string and its pointer) and after its conversion to datetime
+TIME_TEXT_BYTES = 80
+TIME_BYTES = 8
+# the CSV parser needs about twice the size of the frame it returns
+READ_OVERHEAD = 2
+# the cleaning steps allocate up to one more frame (masks, filled columns, the frame without the dropped rows)
+CLEANING_OVERHEAD = 1.0
+# memory per True value of a sparse boolean column (its int32 position and the value)
+SPARSE_BYTES_PER_VALUE = 5
+# share of the budget used by the read-ahead chunks of the reading and the blocks of the transaction counting
+BUFFER_BUDGET_SHARE = 0.1
+MIN_CHUNK_ROWS = 10_000
+MIN_BLOCK_ROWS = 10_000
+TRANSACTION_STORAGES = {"dense": "a dense matrix", "sparse": "a sparse matrix", "spill": "a matrix spilled to disk"}
+
+_memory_governor = None
+
+class MemoryGovernor:
+    """
+  This class keeps a run within "max_memory_mb". Before the steps that allocate the most (reading the full data,
+  cleaning, one-hot encoding and counting the transactions), it projects the memory of the step from the current
+  resident memory and the size of its inputs. If the projection exceeds the budget, the step degrades to a leaner path:
+  chunked reading with chunks sized from the budget, float32 sensor values, a sparse transaction matrix, or a transaction
+  matrix spilled to a temporary file (memory-mapped, so the OS pages it out instead of the run getting killed). Every
+  choice is logged and kept in "plan", and "float32_values" tells if the sensor values were converted to float32.
+  Without a budget, every step keeps its usual path.
+  """
+    def __init__(self, max_memory_mb=None, spill_dir=None):
+        self.max_memory_mb = max_memory_mb
+        self.spill_dir = spill_dir
+        self.plan = {}
+        self.float32_values = False
+
+    def plan_reading(self, file_path, sensor_count, chunk_size, prefetch_chunks, bounded):
+        """
+      This method chooses how the full data is read. It returns the chunk size (None: the whole file at once, the
+      rows within bounds are always read in chunks) and if the sensor values are converted to float32 while reading.
+      """
+        if self.max_memory_mb is None or str(file_path).endswith((".xls", ".xlsx")):
+            return (chunk_size if bounded else None), False
+
+        available_mb = self._available_mb()
+        rows = estimate_file_rows(file_path)
+        text_row_bytes = (TIME_TEXT_BYTES + 8 * sensor_count) * READ_OVERHEAD
+        whole_file_mb = rows * text_row_bytes / MB
+        if not bounded and whole_file_mb <= available_mb:
+            self._choose("reading", "the whole file", whole_file_mb, available_mb)
+            return None, False
+
+        # the chunks that are read ahead or wait in the pipeline get a share of the budget
+        buffer_rows = int(self.max_memory_mb * MB * BUFFER_BUDGET_SHARE / (text_row_bytes * (prefetch_chunks + 2)))
+        chunk_size = min(chunk_size, max(buffer_rows, MIN_CHUNK_ROWS))
+        buffers_mb = chunk_size * text_row_bytes * (prefetch_chunks + 2) / MB
+
+        # the kept chunks and their concatenation, with float32 values if float64 ones do not fit
+        float32 = False
+        kept_mb = 2 * rows * (TIME_BYTES + 8 * sensor_count) / MB
+        if not bounded and kept_mb + buffers_mb > available_mb:
+            float32 = True
+            self.float32_values = True
+            kept_mb = 2 * rows * (TIME_BYTES + 4 * sensor_count) / MB
+        self._choose("reading", f"chunks of {chunk_size} rows" + (" with float32 values" if float32 else ""),
+                     buffers_mb if bounded else kept_mb + buffers_mb, available_mb)
+        return chunk_size, float32
+
+    def plan_cleaning(self, df, sensors):
+        """
+      This method converts the float64 sensor columns of the loaded data to float32 if cleaning them does not fit in the
+      budget. It returns the data (a new frame if columns were converted).
+      """
+        if self.max_memory_mb is None:
+            return df
+        float_columns = [col for col in sensors if col in df.columns and df[col].dtype == np.float64]
+        available_mb = self._available_mb()
+        cleaning_mb = df.memory_usage(index=True).sum() * CLEANING_OVERHEAD / MB
+        if cleaning_mb <= available_mb or not float_columns:
+            self._choose("cleaning", "float64 values" if float_columns else "the loaded values", cleaning_mb, available_mb)
+            return df
+
+        df = downcast_float_columns(df, float_columns)
+        self.float32_values = True
+        self._choose("cleaning", f"float32 values ({len(float_columns)} columns)", cleaning_mb, available_mb)
+        return df
+
+    def transaction_storage(self, rows, columns, values_per_row):
+        """
+      This method chooses how the one-hot columns of "rows" x "columns" are stored, with at most "values_per_row" True
+      values per row: "dense" (a bool matrix), "sparse" (the positions of the True values) or "spill" (a bool matrix in a
+      memory-mapped temporary file).
+      """
+        if self.max_memory_mb is None:
+            return "dense"
+        available_mb = self._available_mb()
+        dense_mb = rows * columns / MB
+        sparse_mb = rows * values_per_row * SPARSE_BYTES_PER_VALUE / MB
+        if dense_mb <= available_mb:
+            storage, projected_mb = "dense", dense_mb
+        elif sparse_mb < dense_mb and sparse_mb <= available_mb:
+            storage, projected_mb = "sparse", sparse_mb
+        else:
+            storage, projected_mb = "spill", dense_mb
+        self._choose("transactions", TRANSACTION_STORAGES[storage], projected_mb, available_mb)
+        return storage
+
+    def spill_array(self, shape, dtype):
+        """
+      This method allocates an array in a temporary file of "spill_dir" (the system temporary directory by default).
+      The file is deleted when the array is freed.
+      """
+        with tempfile.TemporaryFile(dir=self.spill_dir) as spill_file:
+            # the mapping keeps the data of the (already unlinked) file
+            return np.memmap(spill_file, dtype=dtype, mode="w+", shape=shape)
+
+    def counting_block_rows(self, rows, columns):
+        """
+      This method returns the rows per block of the transaction counting (None: all the rows at once). The rows are
+      counted in blocks if a dense copy of all the transactions, their packed bits and the sort do not fit in the budget.
+      """
+        if self.max_memory_mb is None:
+            return None
+        available_mb = self._available_mb()
+        row_bytes = columns + columns / 8 + 16
+        counting_mb = rows * row_bytes / MB
+        if counting_mb <= available_mb:
+            self._choose("counting", "all rows at once", counting_mb, available_mb)
+            return None
+        block_rows = max(int(self.max_memory_mb * MB * BUFFER_BUDGET_SHARE / row_bytes), MIN_BLOCK_ROWS)
+        self._choose("counting", f"blocks of {block_rows} rows", block_rows * row_bytes / MB, available_mb)
+        return block_rows
+
+    def fits(self, size_bytes, purpose):
+        """
+      This method checks if "size_bytes" more bytes fit in the budget (e.g., a copy of a frame for a background write).
+      """
+        if self.max_memory_mb is None:
+            return True
+        available_mb = self._available_mb()
+        fits = size_bytes / MB <= available_mb
+        if not fits:
+            self._choose(purpose, "no copy", size_bytes / MB, available_mb)
+        return fits
+
+    # --- Helper Methods ---
+    def _available_mb(self):
+        """
+      This helper method returns the memory left in the budget, based on the current resident memory of the process.
+      """
+        return self.max_memory_mb - (get_current_rss_mb() or 0)
+
+    def _choose(self, step, choice, projected_mb, available_mb):
+        """
+      This helper method records and logs the choice of a step.
+      """
+        self.plan[step] = choice
+        logging.info("Memory governor: %s with %s (projected %.0f MB, %.0f MB of %s MB available).",
+                     step, choice, projected_mb, available_mb, self.max_memory_mb)
+
+def configure_memory_governor(max_memory_mb=None, spill_dir=None):
+    """
+  This function sets the memory governor of the run.
+  """
+    global _memory_governor
+    _memory_governor = MemoryGovernor(max_memory_mb, spill_dir)
+    if max_memory_mb is not None:
+        logging.info(f"Memory budget of the run: {max_memory_mb} MB.")
+    return _memory_governor
+
+def get_memory_governor():
+    """
+  This function returns the memory governor of the run (one without a budget if none was configured).
+  """
+    return _memory_governor if _memory_governor is not None else MemoryGovernor()
+
+def finish_memory_governor():
+    """
+  This function logs the plan of the run with its peak memory and removes its memory governor.
+  """
+    global _memory_governor
+    governor, _memory_governor = _memory_governor, None
+    if governor is None or governor.max_memory_mb is None:
+        return
+    peak_rss_mb = get_peak_rss_mb()
+    plan = ", ".join(f"{step}: {choice}" for step, choice in governor.plan.items()) or "no step needed a choice"
+    logging.info(f"Memory plan of the run ({plan}), peak RSS {peak_rss_mb} MB of {governor.max_memory_mb} MB.")
+    if peak_rss_mb is not None and peak_rss_mb > governor.max_memory_mb:
+        logging.warning(f"The run used more memory ({peak_rss_mb} MB) than its budget ({governor.max_memory_mb} MB).")
+
+def get_current_rss_mb():
+    """
+  This function returns the current resident memory of the process in MB (on Linux), or its peak on the other platforms.
+  """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, AttributeError):
+        return get_peak_rss_mb()
+
+def estimate_file_rows(file_path):
+    """
+  This function estimates the number of rows of a CSV file (optionally compressed) from the length of the lines at its
+  start and its size (decompressed with a typical ratio). The count is exact for the files shorter than the sample.
+  """
+    compression = get_compression(file_path)
+    try:
+        if compression == "zstd":
+            if zstandard is None:
+                raise ImportError("zstandard is not installed")
+            source = zstandard.open(file_path, "rb")
+        else:
+            source = COMPRESSED_OPENERS.get(compression, open)(file_path, "rb")
+        with source:
+            head = source.read(HEAD_SAMPLE_BYTES + 1)
+        file_bytes = estimate_decompressed_size(file_path)
+    except Exception as e:
+        logging.warning(f"The rows of {file_path} can not be estimated ({e}).")
+        return 0
+
+    if len(head) <= HEAD_SAMPLE_BYTES:
+        # the whole file was read, its lines without the header
+        return max(len(head.splitlines()) - 1, 0)
+    return int(file_bytes * head.count(b"\n") / len(head))
+
+def estimate_decompressed_size(file_path):
+    """
+  This function estimates the size in bytes of the content of a file, decompressed with a typical ratio if it is compressed.
+  """
+    return os.path.getsize(file_path) * COMPRESSION_RATIOS.get(get_compression(file_path), 1)
+
+def downcast_float_columns(df, columns):
+    """
+  This function converts the float64 columns of "columns" to float32 (the other columns are not copied).
+  """
+    columns = [col for col in columns if col in df.columns and df[col].dtype == np.float64]
+    return df.astype({col: np.float32 for col in columns}, copy=False) if columns else df
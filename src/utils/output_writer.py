@@ -0,0 +1,180 @@
+import os
+import logging
+import threading
+import importlib.util
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from utils.logging_setup import log_and_raise_error
+from utils.instrumentation import measure_stage
+from utils.memory_governor import get_memory_governor
+
+OUTPUT_FILE_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+CSV_COMPRESSION_EXTENSIONS = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz", "zstd": ".zst"}
+# cells per formatted block of the boolean CSV writer
+BOOL_CSV_BLOCK_CELLS = 2_000_000
+
+_output_writer = None
+# the output writers set for one thread only (e.g., for one request of the service)
+_thread_writers = threading.local()
+
+class OutputWriter:
+    """
+  This class writes the output DataFrames (the processed data and the data prepared for rule mining) as CSV (optionally
+  compressed), Parquet or Feather. Boolean frames (the one-hot mining data) are formatted into CSV bytes with NumPy in
+  parallel blocks instead of by pandas, with the same bytes. With "background", the frames are written by a thread while
+  the pipeline continues ("wait" waits for them), and the outputs in "disabled_outputs" are not written at all.
+  """
+    def __init__(self, file_format="csv", compression=None, background=False, disabled_outputs=()):
+        if file_format in ["parquet", "feather"] and importlib.util.find_spec("pyarrow") is None:
+            log_and_raise_error(f"The '{file_format}' output format needs the optional pyarrow package.")
+        self.file_format = file_format
+        self.compression = compression
+        self.background = background
+        self.disabled_outputs = set(disabled_outputs)
+        self._executor = None
+        self._pending = []
+        self._pid = os.getpid()
+
+    def write(self, df, output_dir, name):
+        """
+      This method writes "df" as "<output_dir>/<name>" with the extension of the format. It returns the file path, or
+      None if the output is disabled.
+      """
+        if name in self.disabled_outputs:
+            logging.info(f"Writing {name} is disabled.")
+            return None
+
+        file_path = os.path.join(output_dir, name + OUTPUT_FILE_EXTENSIONS[self.file_format])
+        if self.file_format == "csv" and self.compression:
+            file_path += CSV_COMPRESSION_EXTENSIONS[self.compression]
+
+        # the worker processes (e.g., of the batch mode) write directly, the thread pool belongs to the main process,
+        # and a frame is written directly if its copy does not fit in the memory budget
+        if self.background and os.getpid() == self._pid and get_memory_governor().fits(df.memory_usage(index=True).sum(), f"background_write_{name}"):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output_writer")
+            # the pipeline changes its frames in place, so the thread writes a copy
+            self._pending.append(self._executor.submit(self._write_in_background, df.copy(), file_path, name))
+        else:
+            self._write_file(df, file_path, name)
+        return file_path
+
+    def wait(self):
+        """
+      This method waits for the background writes, the error of a failed write is raised here.
+      """
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    # --- Helper Methods ---
+    def _write_in_background(self, df, file_path, name):
+        """
+      This helper method writes one frame in the background thread (measured as its own stage of the run report).
+      """
+        with measure_stage(f"background_write_{name}", df):
+            self._write_file(df, file_path, name)
+
+    def _write_file(self, df, file_path, name):
+        """
+      This helper method writes one frame in the configured format.
+      """
+        if self.file_format == "parquet":
+            df.reset_index(drop=True).to_parquet(file_path, index=False, compression=self.compression or "snappy")
+        elif self.file_format == "feather":
+            df.reset_index(drop=True).to_feather(file_path, compression=self.compression)
+        elif not self.compression and len(df.columns) and all(dtype in (bool, pd.SparseDtype(bool, False)) for dtype in df.dtypes):
+            self._write_bool_csv(df, file_path)
+        else:
+            df.to_csv(file_path, index=False, compression=self.compression)
+        logging.info(f"{name} saved in {file_path}.")
+
+    def _write_bool_csv(self, df, file_path):
+        """
+      This helper method writes a boolean frame (dense or sparse) as CSV ("True"/"False" like "to_csv"). The rows are
+      converted and formatted in blocks by a thread pool (NumPy releases the GIL) and the blocks are written in order,
+      so only a few blocks of the frame are dense at a time.
+      """
+        block_rows = max(BOOL_CSV_BLOCK_CELLS // max(len(df.columns), 1), 1)
+        starts = range(0, len(df), block_rows)
+        max_workers = min(os.cpu_count() or 1, max(len(starts), 1))
+        with open(file_path, "wb") as f:
+            f.write(df.iloc[:0].to_csv(index=False).encode())
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for first in range(0, len(starts), max_workers):
+                    blocks = [df.iloc[start:start + block_rows].to_numpy(dtype=bool) for start in starts[first:first + max_workers]]
+                    for block in executor.map(_format_bool_rows, blocks):
+                        f.write(block)
+
+def configure_output_writer(file_format="csv", compression=None, background=False, disabled_outputs=()):
+    """
+  This function sets the output writer of the run.
+  """
+    global _output_writer
+    _output_writer = OutputWriter(file_format, compression, background, disabled_outputs)
+    return _output_writer
+
+def get_output_writer():
+    """
+  This function returns the output writer of the current thread or of the run (a plain CSV writer if none was configured).
+  """
+    writer = getattr(_thread_writers, "writer", None) or _output_writer
+    return writer if writer is not None else OutputWriter()
+
+@contextmanager
+def thread_output_writer(file_format="csv", compression=None, background=False, disabled_outputs=()):
+    """
+  This function sets an output writer for the current thread only, so the threads (e.g., the requests of the service)
+  can use other output settings next to each other. Its background writes are waited for at the end of the block.
+  """
+    writer = OutputWriter(file_format, compression, background, disabled_outputs)
+    _thread_writers.writer = writer
+    try:
+        yield writer
+        writer.wait()
+    finally:
+        _thread_writers.writer = None
+        try:
+            writer.wait()
+        except Exception as e:
+            logging.error(f"Failed to write the outputs: {e}")
+
+def finish_output_writer(raise_errors=True):
+    """
+  This function waits for the background writes of the run and removes its output writer.
+  """
+    global _output_writer
+    writer, _output_writer = _output_writer, None
+    if writer is None:
+        return
+    try:
+        writer.wait()
+    except Exception as e:
+        if raise_errors:
+            log_and_raise_error(f"Failed to write the outputs: {e}")
+        logging.error(f"Failed to write the outputs: {e}")
+
+# --- Helper Functions ---
+def _format_bool_rows(values):
+    """
+  This helper function formats the rows of a boolean array into CSV bytes. Every cell gets its token with the comma (or
+  the line terminator in the last column), padded with zero bytes to the same width, and the padding is removed at the end.
+  """
+    line_terminator = os.linesep.encode()
+    width = len(b"False") + len(line_terminator)
+    tokens = np.zeros((2, 2, width), dtype=np.uint8)
+    for last_column, separator in enumerate([b",", line_terminator]):
+        for value, word in enumerate([b"False", b"True"]):
+            token = word + separator
+            tokens[last_column, value, :len(token)] = np.frombuffer(token, dtype=np.uint8)
+
+    cells = np.empty(values.shape + (width,), dtype=np.uint8)
+    cells[:, :-1] = tokens[0][values[:, :-1].view(np.uint8)]
+    cells[:, -1] = tokens[1][values[:, -1].view(np.uint8)]
+    cells = cells.ravel()
+    return cells[cells != 0].tobytes()
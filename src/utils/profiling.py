@@ -0,0 +1,101 @@
+import os
+import re
+import sys
+import time
+import cProfile
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+_stage_profiling = None
+
+class StackSampler(threading.Thread):
+    """
+  This class samples the call stack of one thread at a fixed interval and counts the identical stacks, the result is
+  written in the collapsed-stack format ("outer;inner;innermost count", one stack per line) that flamegraph tools read.
+  """
+    def __init__(self, thread_id, interval=0.005):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write_collapsed(self, collapsed_file):
+        """
+      This method writes the sampled stacks in the collapsed-stack format.
+      """
+        with open(collapsed_file, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+@contextmanager
+def profile_block(profile_dir, name, sample_interval=0.005):
+    """
+  This context manager profiles a block of code with cProfile and samples its call stacks at the same time. It writes
+  "<name>.prof" (open it with pstats, snakeviz, etc.) and "<name>.collapsed.txt" (flamegraph input) in "profile_dir".
+  """
+    os.makedirs(profile_dir, exist_ok=True)
+    file_name = re.sub(r"[^\w.-]", "_", name)
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident(), sample_interval)
+
+    sampler.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+
+        profile_file = os.path.join(profile_dir, f"{file_name}.prof")
+        collapsed_file = os.path.join(profile_dir, f"{file_name}.collapsed.txt")
+        profiler.dump_stats(profile_file)
+        sampler.write_collapsed(collapsed_file)
+        logging.info(f"Profile of '{name}' ({elapsed:.3f} s) saved in {profile_file} and {collapsed_file}")
+
+def start_stage_profiling(profile_dir, sample_interval=0.005):
+    """
+  This function profiles every top-level stage of the run report separately (one file per stage instead of one for the run).
+  """
+    global _stage_profiling
+    _stage_profiling = {"profile_dir": profile_dir, "sample_interval": sample_interval, "count": 0}
+
+def stop_stage_profiling():
+    global _stage_profiling
+    _stage_profiling = None
+
+@contextmanager
+def profile_stage(stage):
+    """
+  This context manager profiles a stage if the stage profiling is enabled, otherwise it does nothing.
+  """
+    settings = _stage_profiling
+    if settings is None:
+        yield
+        return
+
+    settings["count"] += 1
+    with profile_block(settings["profile_dir"], f"{settings['count']:03d}_{stage}", settings["sample_interval"]):
+        yield
+
+def stage_profiling_enabled():
+    return _stage_profiling is not None
@@ -0,0 +1,120 @@
+import os
+import json
+import pickle
+import hashlib
+import logging
+
+def file_fingerprint(file_path):
+    """
+  This function returns the fingerprint of a file (absolute path, size and modification time), any change of the file changes it.
+  """
+    file_stat = os.stat(file_path)
+    return [os.path.abspath(file_path), file_stat.st_size, file_stat.st_mtime_ns]
+
+class StageCache:
+    """
+  This class stores the outputs of the pipeline stages on disk. Every entry is addressed by a hash of the stage inputs
+  (the key of the previous stage plus the config parameters used by the stage), so a re-run only computes the stages
+  after the deepest entry that is still valid. The least recently used entries are evicted above "max_size_mb".
+  """
+    def __init__(self, cache_dir, max_size_mb=1024):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts):
+        """
+      This method hashes the given parts (JSON serializable values, e.g., the previous key and config parameters) into a key.
+      """
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, stage, key):
+        """
+      This method returns the cached output of a stage, or None if there is no valid entry for the key.
+      """
+        entry_file = self._entry_file(stage, key)
+        try:
+            with open(entry_file, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logging.warning(f"Removing the unreadable cache entry {entry_file}: {e}")
+            self._remove(entry_file)
+            return None
+
+        # the modification time is the last use of the entry for the LRU eviction
+        os.utime(entry_file)
+        logging.info(f"Stage '{stage}' loaded from the cache ({key[:12]}).")
+        return value
+
+    def put(self, stage, key, value):
+        """
+      This method stores the output of a stage (written atomically) and evicts the least recently used entries if needed.
+      """
+        entry_file = self._entry_file(stage, key)
+        temp_file = f"{entry_file}.tmp"
+        try:
+            with open(temp_file, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, entry_file)
+        except (OSError, pickle.PicklingError) as e:
+            # a failing cache must never fail the run
+            logging.warning(f"The output of the stage '{stage}' could not be cached: {e}")
+            self._remove(temp_file)
+            return
+        logging.info(f"Stage '{stage}' saved in the cache ({key[:12]}).")
+        self.evict()
+
+    def get_or_compute(self, stage, key, compute):
+        """
+      This method returns the cached output of a stage, or computes and caches it. The second value tells if it was cached.
+      """
+        value = self.get(stage, key)
+        if value is not None:
+            return value, True
+
+        value = compute()
+        self.put(stage, key, value)
+        return value, False
+
+    def evict(self):
+        """
+      This method removes the least recently used entries until the cache fits in "max_size_mb".
+      """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            entry_file = os.path.join(self.cache_dir, name)
+            try:
+                entry_stat = os.stat(entry_file)
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry_file))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_file in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            self._remove(entry_file)
+            total_size -= size
+            logging.info(f"Cache entry {os.path.basename(entry_file)} evicted.")
+
+    # --- Helper Methods ---
+    def _entry_file(self, stage, key):
+        """
+      This helper method returns the file of a cache entry.
+      """
+        return os.path.join(self.cache_dir, f"{stage}-{key}.pkl")
+
+    @staticmethod
+    def _remove(file_path):
+        """
+      This helper method removes a file if it exists.
+      """
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
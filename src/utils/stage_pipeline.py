@@ -0,0 +1,131 @@
+import time
+import queue
+import logging
+import threading
+from utils.instrumentation import measure_stage
+
+# the end of the items of a queue
+_END = object()
+
+class StageQueue:
+    """
+  This class is a bounded queue between two stages of a pipeline: a full queue blocks the stage before it
+  (back-pressure), so at most "maxsize" items wait between two stages. It measures the queue depth and how long the
+  stages were blocked on it.
+  """
+    def __init__(self, name, maxsize, stop_event):
+        self.name = name
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop_event = stop_event
+        self.items = 0
+        self.max_depth = 0
+        self._depth_sum = 0
+        self.put_blocked_s = 0.0
+        self.get_waited_s = 0.0
+
+    def put(self, item):
+        """
+      This method adds an item, it waits while the queue is full (and gives up if the pipeline is stopped).
+      """
+        start = time.perf_counter()
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        else:
+            return
+        self.put_blocked_s += time.perf_counter() - start
+        if item is not _END:
+            depth = self._queue.qsize()
+            self.items += 1
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_sum += depth
+
+    def get(self):
+        """
+      This method returns the next item, it waits while the queue is empty (the end of the items if the pipeline is stopped).
+      """
+        start = time.perf_counter()
+        item = _END
+        while True:
+            try:
+                item = self._queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    break
+        self.get_waited_s += time.perf_counter() - start
+        return item
+
+    def metrics(self):
+        """
+      This method returns the measurements of the queue (the depth is sampled after every put).
+      """
+        return {"queue": self.name, "items": self.items, "max_depth": self.max_depth,
+                "mean_depth": round(self._depth_sum / self.items, 3) if self.items else 0.0,
+                "producer_blocked_s": round(self.put_blocked_s, 6), "consumer_waited_s": round(self.get_waited_s, 6)}
+
+def run_pipeline(name, source, stages, queue_size=2):
+    """
+  This function runs a stage pipeline: a reader thread takes the items of "source" (e.g., the chunks of a file), every
+  function of "stages" (name, function) runs in its own thread on the output of the previous one, and the caller gets
+  the results in order (e.g., to collect or write them). The stages are connected by bounded queues of "queue_size"
+  items, so the next chunk is read while the current one is processed, without reading ahead of the slowest stage.
+  An error of any stage is raised in the caller. The queue depths and waits are logged and added to the run report.
+  """
+    stop_event = threading.Event()
+    queues = [StageQueue(f"read->{stages[0][0]}" if stages else "read->consumer", queue_size, stop_event)]
+    for i, (stage_name, _) in enumerate(stages):
+        queues.append(StageQueue(f"{stage_name}->{stages[i + 1][0] if i + 1 < len(stages) else 'consumer'}", queue_size, stop_event))
+    errors = []
+
+    def read():
+        try:
+            for item in source:
+                if stop_event.is_set():
+                    return
+                queues[0].put(item)
+        except BaseException as e:
+            # the other stages stop at their next item
+            errors.append(e)
+            stop_event.set()
+        finally:
+            queues[0].put(_END)
+            if hasattr(source, "close"):
+                source.close()
+
+    def process(function, input_queue, output_queue):
+        try:
+            while (item := input_queue.get()) is not _END:
+                output_queue.put(function(item))
+        except BaseException as e:
+            errors.append(e)
+            stop_event.set()
+        finally:
+            output_queue.put(_END)
+
+    threads = [threading.Thread(target=read, name=f"{name}_read", daemon=True)]
+    threads += [threading.Thread(target=process, args=(function, queues[i], queues[i + 1]), name=f"{name}_{stage_name}", daemon=True)
+                for i, (stage_name, function) in enumerate(stages)]
+
+    with measure_stage(f"pipeline_{name}") as frame:
+        for thread in threads:
+            thread.start()
+        try:
+            while (item := queues[-1].get()) is not _END and not errors:
+                yield item
+        finally:
+            # the caller stopped early or a stage failed: the threads stop at their next item
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+            metrics = [stage_queue.metrics() for stage_queue in queues]
+            frame["metrics"] = metrics
+            for stage_metrics in metrics:
+                logging.info("Pipeline %s queue %s: %s items, max depth %s, mean depth %s, producer blocked %.3fs, consumer waited %.3fs.",
+                             name, stage_metrics["queue"], stage_metrics["items"], stage_metrics["max_depth"], stage_metrics["mean_depth"],
+                             stage_metrics["producer_blocked_s"], stage_metrics["consumer_waited_s"])
+    if errors:
+        raise errors[0]
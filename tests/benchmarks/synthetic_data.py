@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks")))
+from synthetic_data import generate_historian
+
+class TestSyntheticData(unittest.TestCase):
+
+    def test_generator_is_deterministic(self):
+        """
+      This test checks that the same arguments always generate the same data and that another seed changes it.
+      """
+        first, sensors = generate_historian(1000, seed=3)
+        second, _ = generate_historian(1000, seed=3)
+        other, _ = generate_historian(1000, seed=4)
+
+        pd.testing.assert_frame_equal(first, second)
+        self.assertFalse(first.equals(other))
+        self.assertEqual(list(first.columns), ["time"] + [sensor for division in sensors.values() for sensor in division])
+
+    def test_generator_knobs(self):
+        """
+      This test checks the number of sensors per division, the gaps, the duplicated timestamps and the unsorted rows.
+      """
+        df, sensors = generate_historian(20000, sensors_per_division={"temperature": 3, "ordinal": 1}, gap_rate=0.1,
+                                         duplicate_rate=0.05, unsorted_fraction=0.2, seed=1)
+        times = pd.to_datetime(df["time"])
+
+        self.assertEqual(sensors, {"temperature": ["temperature_1", "temperature_2", "temperature_3"], "ordinal": ["ordinal_1"]})
+        self.assertAlmostEqual(df["temperature_1"].isna().mean(), 0.1, delta=0.01)
+        self.assertEqual(df["ordinal_1"].isna().sum(), 0)
+        self.assertAlmostEqual(times.duplicated().mean(), 0.05, delta=0.01)
+        self.assertFalse(times.is_monotonic_increasing)
+
+        sorted_df, _ = generate_historian(20000, seed=1)
+        self.assertTrue(pd.to_datetime(sorted_df["time"]).is_monotonic_increasing)
+
+if __name__ == "__main__":
+    unittest.main()
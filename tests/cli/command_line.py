@@ -0,0 +1,86 @@
+import os
+import sys
+import yaml
+import unittest
+import tempfile
+import subprocess
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+sys.path.insert(0, SRC_DIR)
+from main import main, parse_args, load_run_config
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.temp_dir.name, "data.csv")
+        with open(self.input_file, "w") as f:
+            f.write("time,sensor1\n2025-01-01 00:00:00,1.0\n")
+
+        self.config = {
+            "input_file": self.input_file,
+            "output_dir": os.path.join(self.temp_dir.name, "output"),
+            "time_column": "time",
+            "time_format": "%Y-%m-%d %H:%M:%S",
+            "date": "2025-01-01",
+            "sensors": {"temperature": ["sensor1"]},
+            "pre_processing": {
+                "time_col": {"check_duplicates_keep": "first", "handle_missing_values": "drop", "failed_datetime_conversion": "drop"},
+                "handle_missing_values": {"strategy": "fill", "fill_method": "mean", "fill_value": None, "time_window": "5min"}}}
+        self.config_file = self.write_config(self.config)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def write_config(self, config):
+        config_file = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(config_file, "w") as f:
+            yaml.safe_dump(config, f)
+        return config_file
+
+    def test_validate_does_not_import_the_analysis_dependencies(self):
+        """
+      This test checks that the "validate" command succeeds without importing pandas or mlxtend.
+      """
+        code = ("import sys; from main import main; "
+                f"exit_code = main(['validate', '--config', {self.config_file!r}, '--log-level', 'ERROR']); "
+                "print(exit_code, 'pandas' in sys.modules, 'mlxtend' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True)
+
+        self.assertEqual(result.stdout.split()[-3:], ["0", "False", "False"], result.stderr)
+
+    def test_overrides_set_the_mode(self):
+        """
+      This test checks that --start/--end replace the date of the config and that --mode sets an explicit mode.
+      """
+        config = load_run_config(self.config_file, parse_args(["run", "--start", "2025-01-01", "--end", "2025-01-03"]))
+        self.assertEqual((config["mode"], config["start_date"], config["end_date"]), ("time_range", "2025-01-01", "2025-01-03"))
+        self.assertNotIn("date", config)
+
+        config = load_run_config(self.config_file, parse_args(["run", "--mode", "full_data", "--profile"]))
+        self.assertEqual(config["mode"], "full_data")
+        self.assertEqual(config["profiling"], {"enabled": True})
+
+        config = load_run_config(self.config_file, parse_args(["run", "--mode", "per_day"]))
+        self.assertEqual(config["mode"], "per_day")
+        self.assertNotIn("date", config)
+
+        with self.assertRaises(ValueError):
+            load_run_config(self.config_file, parse_args(["run", "--mode", "time_range", "--start", "2025-01-01"]))
+
+    def test_dry_run(self):
+        """
+      This test checks that a dry run exits with 0 for valid inputs, with 1 for a missing input file, and never
+      creates the output directory.
+      """
+        self.assertEqual(main(["run", "--dry-run", "--config", self.config_file, "--log-level", "ERROR"]), 0)
+
+        self.config["input_file"] = os.path.join(self.temp_dir.name, "missing.csv")
+        config_file = self.write_config(self.config)
+        self.assertEqual(main(["run", "--dry-run", "--config", config_file, "--log-level", "ERROR"]), 1)
+        self.assertFalse(os.path.exists(self.config["output_dir"]))
+
+if __name__ == "__main__":
+    unittest.main()
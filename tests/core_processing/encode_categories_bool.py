@@ -1,11 +1,13 @@
 import os
 import sys
 import unittest
+import tempfile
 import pandas as pd
 from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
 from data_manager.preprocessing.core_preprocessor import DataChecker
+from data_manager.preprocessing.categorical_encoder import CategoricalEncoder
 
 class TestEncodeCategoricalAndBooleans(unittest.TestCase):
 
@@ -78,5 +80,38 @@ class TestEncodeCategoricalAndBooleans(unittest.TestCase):
 
         pd.testing.assert_frame_equal(checker.df, expected_df)
 
+    @patch("data_manager.preprocessing.core_preprocessor.logging.warning")
+    def test_encode_all_missing_categorical(self, mock_warning):
+        """
+      This test checks that a text column without any value (no mode) is still encoded, with the code -1 for every row.
+      """
+        df = pd.DataFrame({"time": pd.date_range("2025-01-01", periods=3, freq="D"), "empty_categorical": pd.Series([None, None, None], dtype="object")})
+        checker = DataChecker(df.copy(), sensors=["empty_categorical"], time_column="time")
+        checker.encode_categorical_and_booleans()
+
+        expected_df = df.copy()
+        expected_df["empty_categorical"] = pd.Series([-1, -1, -1], dtype="int8")
+
+        pd.testing.assert_frame_equal(checker.df, expected_df)
+        mock_warning.assert_called_once_with("Cannot compute mode for column 'empty_categorical' due to empty or invalid data; missing values are encoded as -1.")
+
+    def test_persistent_code_tables(self):
+        """
+      This test checks that with a code tables file the known values keep their codes in a later chunk (with another
+      order of appearance) and that the unseen values are appended to the table.
+      """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            codes_file = os.path.join(temp_dir, "codes.json")
+            with CategoricalEncoder.locked(codes_file) as encoder:
+                DataChecker(self.df_3.copy(), sensors=["multi_class_categorical"], time_column="time", categorical_encoder=encoder).encode_categorical_and_booleans()
+
+            chunk = pd.DataFrame({"time": pd.date_range("2025-02-01", periods=4, freq="D"), "multi_class_categorical": ["D", "C", "A", "AA"]})
+            with CategoricalEncoder.locked(codes_file) as encoder:
+                checker = DataChecker(chunk, sensors=["multi_class_categorical"], time_column="time", categorical_encoder=encoder)
+                checker.encode_categorical_and_booleans()
+
+            self.assertEqual(checker.df["multi_class_categorical"].tolist(), [4, 2, 0, 3])
+            self.assertEqual(CategoricalEncoder.load(codes_file).code_tables, {"multi_class_categorical": ["A", "B", "C", "AA", "D"]})
+
 if __name__ == "__main__":
     unittest.main()
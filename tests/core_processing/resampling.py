@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from data_manager.preprocessing.resampler import Resampler
+
+class TestResampling(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        rows = 2000
+        seconds = np.sort(rng.integers(0, 6 * 3600, rows))
+        # a gap of one hour without rows
+        seconds = seconds[(seconds < 3600) | (seconds >= 7200)]
+        self.df = pd.DataFrame({
+            "time": pd.Timestamp("2025-01-01 05:00:00") + pd.to_timedelta(seconds, unit="s"),
+            "sensor_1": rng.normal(20, 2, len(seconds)),
+            "sensor_2": rng.integers(0, 3, len(seconds)).astype(float),
+            "sensor_3": rng.choice(["on", "off", "idle"], len(seconds))})
+        self.df.loc[::7, "sensor_1"] = np.nan
+        self.df.loc[::11, "sensor_2"] = np.nan
+        self.sensors = {"temperature": ["sensor_1"], "ordinal": ["sensor_2"], "categorical": ["sensor_3"]}
+
+    def expected(self, df, rule):
+        grouped = df.set_index("time").sort_index(kind="stable").resample(rule)
+        expected = pd.DataFrame({
+            "sensor_1": grouped["sensor_1"].mean(),
+            "sensor_2": grouped["sensor_2"].last(),
+            "sensor_3": grouped["sensor_3"].agg(lambda values: values.mode().iloc[0] if len(values) else None)})
+        return expected[grouped.size() > 0].reset_index()
+
+    def test_default_aggregations_match_pandas(self):
+        """
+      This test checks that the default aggregations (mean, last and mode) give the same rows as "DataFrame.resample"
+      without the empty intervals, also for unsorted input rows.
+      """
+        for df in [self.df, self.df.sample(frac=1, random_state=1)]:
+            resampled = Resampler(df.copy(), self.sensors, "time").resample("1min", {})
+            pd.testing.assert_frame_equal(resampled, self.expected(df, "1min"), check_dtype=False)
+
+        # one hour without rows gives no rows
+        self.assertEqual(len(Resampler(self.df.copy(), self.sensors, "time").resample("1h", {})), 5)
+
+    def test_configured_aggregations(self):
+        """
+      This test checks the min/max/first aggregations and that a numeric aggregation of text values raises an error.
+      """
+        aggregations = {"temperature": "max", "ordinal": "first", "categorical": "first"}
+        resampled = Resampler(self.df.copy(), self.sensors, "time").resample("15min", aggregations)
+        grouped = self.df.set_index("time").resample("15min")
+        non_empty = grouped.size() > 0
+        np.testing.assert_allclose(resampled["sensor_1"], grouped["sensor_1"].max()[non_empty])
+        np.testing.assert_array_equal(resampled["sensor_2"], grouped["sensor_2"].first()[non_empty])
+        self.assertEqual(resampled["sensor_3"].tolist(), grouped["sensor_3"].first()[non_empty].tolist())
+
+        with self.assertRaises(ValueError):
+            Resampler(self.df.copy(), self.sensors, "time").resample("15min", {"categorical": "mean"})
+
+if __name__ == "__main__":
+    unittest.main()
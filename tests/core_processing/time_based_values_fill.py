@@ -69,7 +69,7 @@ class TestApplyTimeBasedFill(unittest.TestCase):
             "At timestamp '2025-01-04 00:00:00', filled using mean: 6.0 (window: 2025-01-03 00:00:00 to 2025-01-05 00:00:00)."
         ]
 
-        actual_logs = [call.args[0] for call in mock_log_info.call_args_list]
+        actual_logs = [call.args[0] % call.args[1:] for call in mock_log_info.call_args_list]
         self.assertEqual(expected_logs, actual_logs)
 
     @patch("data_manager.preprocessing.core_preprocessor.logging.info")
@@ -97,7 +97,7 @@ class TestApplyTimeBasedFill(unittest.TestCase):
             "At timestamp '2025-01-01 00:00:04', filled using mean: 3.0 (window: 2025-01-01 00:00:02 to 2025-01-01 00:00:05)."
         ]
 
-        actual_logs = [call.args[0] for call in mock_log_info.call_args_list]
+        actual_logs = [call.args[0] % call.args[1:] for call in mock_log_info.call_args_list]
         self.assertEqual(expected_logs, actual_logs)
 
     @patch("data_manager.preprocessing.core_preprocessor.logging.info")
@@ -132,7 +132,7 @@ class TestApplyTimeBasedFill(unittest.TestCase):
             "Forward fill applied at the end of column 'sensor2'.",
         ]
 
-        actual_logs = [call.args[0] for call in mock_log_info.call_args_list]
+        actual_logs = [call.args[0] % call.args[1:] for call in mock_log_info.call_args_list]
         self.assertEqual(expected_logs, actual_logs)
 
     @patch("data_manager.preprocessing.core_preprocessor.logging.info")
@@ -165,7 +165,7 @@ class TestApplyTimeBasedFill(unittest.TestCase):
             "At timestamp '2025-01-10 00:00:00', filled using mean: 9.0 (window: 2025-01-09 00:00:00 to 2025-01-10 00:00:00)."
         ]
 
-        actual_logs = [call.args[0] for call in mock_log_info.call_args_list]
+        actual_logs = [call.args[0] % call.args[1:] for call in mock_log_info.call_args_list]
         self.assertEqual(expected_logs, actual_logs)
 
     @patch("data_manager.preprocessing.core_preprocessor.log_and_raise_error")
@@ -0,0 +1,91 @@
+import os
+import sys
+import gzip
+import zlib
+import struct
+import unittest
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from data_manager.loaders.data_loader import load_data
+from data_manager.loaders.csv_file_reader import CSVFileReader
+from data_manager.loaders.compressed_stream import open_source, zstandard
+from data_manager.prepare_data.filter_by_date_range import PartialDataLoader
+
+def bgzf_member(data):
+    """
+  This function builds one BGZF member (a gzip member with its size in the "BC" extra field), as written by bgzip.
+  """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    body = compressor.compress(data) + compressor.flush()
+    header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00" + struct.pack("<H", 18 + len(body) + 8 - 1)
+    return header + body + struct.pack("<II", zlib.crc32(data), len(data))
+
+class TestCompressedLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data = pd.DataFrame({
+            "time": pd.date_range("2025-01-01", periods=96, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+            "sensor_1": range(96),
+            "sensor_2": [float(i) / 2 for i in range(96)]})
+        self.raw = self.data.to_csv(index=False).encode()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, content):
+        file_path = os.path.join(self.temp_dir.name, name)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+
+    def assert_same_data(self, file_path):
+        reader = load_data(file_path)
+        self.assertIsInstance(reader, CSVFileReader)
+        pd.testing.assert_frame_equal(reader.read_file(list(self.data.columns)), self.data)
+        pd.testing.assert_frame_equal(pd.concat(reader.read_chunks(list(self.data.columns), 10)), self.data)
+
+        # a time range query only reads the rows up to the end of the range
+        loader = PartialDataLoader(file_path, ["sensor_1"], "time", "%Y-%m-%d %H:%M:%S", ["first", "drop", "drop"])
+        filtered_data = loader.get_filtered_data("2025-01-02")
+        self.assertEqual(filtered_data["sensor_1"].tolist(), list(range(24, 48)))
+
+    def test_gzip_and_bgzf_files(self):
+        """
+      This test checks that a gzip file is streamed by pandas, and that a BGZF file (many independent gzip members) is
+      decompressed by the parallel frame reader, with the same rows as the plain CSV.
+      """
+        gzip_file = self.write("data.csv.gz", gzip.compress(self.raw))
+        with open_source(gzip_file) as source:
+            self.assertEqual(source, gzip_file)
+        self.assert_same_data(gzip_file)
+
+        members = [bgzf_member(self.raw[i:i + 500]) for i in range(0, len(self.raw), 500)] + [bgzf_member(b"")]
+        bgzf_file = self.write("data_bgzf.csv.gz", b"".join(members))
+        with open_source(bgzf_file) as source:
+            self.assertNotIsInstance(source, str)
+        self.assert_same_data(bgzf_file)
+
+    @unittest.skipIf(zstandard is None, "the optional zstandard package is not installed")
+    def test_multi_frame_zstd_file(self):
+        """
+      This test checks that a multi-frame zstd file (with a skippable frame and frames without content size) is read
+      with the same rows as the plain CSV.
+      """
+        compressor = zstandard.ZstdCompressor(write_content_size=False, write_checksum=True)
+        frames = [compressor.compress(self.raw[i:i + 700]) for i in range(0, len(self.raw), 700)]
+        frames.insert(2, struct.pack("<II", 0x184D2A50, 3) + b"abc")
+        self.assert_same_data(self.write("data.csv.zst", b"".join(frames)))
+
+    def test_unsupported_compressed_file(self):
+        """
+      This test checks that load_data raises an error for a compressed file that is not a CSV file.
+      """
+        with self.assertRaises(ValueError) as context:
+            load_data("dummy_dataset.xlsx.gz")
+        self.assertIn("only compressed csv files", str(context.exception))
+
+if __name__ == "__main__":
+    unittest.main()
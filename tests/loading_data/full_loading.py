@@ -67,6 +67,41 @@ class TestFullDataLoader(unittest.TestCase):
         # check that the raised error contains the expected message
         self.assertIn("The input DataFrame is empty. Please provide a valid DataFrame.", str(context.exception))
 
+    def test_bounds_are_applied_while_reading(self):
+        """
+      This test checks that the bounds keep the same rows as filtering the full data, also when the file is read in chunks of 2 rows
+      (with and without the chunks read ahead by the stage pipeline).
+      """
+        time_processing_par = ["first", "drop", "drop"]
+        full_data = FullDataLoader(self.csv_file_path, self.sensors, self.time_column, self.time_format, time_processing_par).get_filtered_data()
+        full_data["time"] = pd.to_datetime(full_data["time"])
+        expected = full_data[(full_data["time"] >= "2025-01-01 12:00:00") & (full_data["time"] <= "2025-01-02 11:00:00")]
+
+        loader = FullDataLoader(self.csv_file_path, self.sensors, self.time_column, self.time_format, time_processing_par)
+        for prefetch_chunks in [0, 1, 2]:
+            filtered_data = loader.get_filtered_data("2025-01-01 12:00:00", "2025-01-02 11:00:00", chunk_size=2, prefetch_chunks=prefetch_chunks)
+            pd.testing.assert_frame_equal(filtered_data, expected)
+
+        # only an end bound
+        filtered_data = loader.get_filtered_data(end="2025-01-01 12:00:00", chunk_size=2)
+        self.assertEqual(filtered_data["sensor_1"].tolist(), [10, 20])
+
+    def test_bounds_without_matching_rows(self):
+        """
+      This test checks that an error is raised if no row is within the bounds, and if a timestamp outside the bounds can
+      not be converted while the failed conversions have to raise an error.
+      """
+        loader = FullDataLoader(self.csv_file_path, self.sensors, self.time_column, self.time_format, ["first", "drop", "error"])
+        with self.assertRaises(ValueError) as context:
+            loader.get_filtered_data("2026-01-01", "2026-01-02")
+        self.assertIn("No data found between", str(context.exception))
+
+        with open(self.csv_file_path, "a") as f:
+            f.write("not a date,60,600\n")
+        with self.assertRaises(ValueError) as context:
+            loader.get_filtered_data("2025-01-01", "2025-01-02")
+        self.assertIn("Failed to convert 1 rows to datetime", str(context.exception))
+
     def test_load_data_csv_reader(self):
         """ 
       This test checks that load_data correctly uses CSVFileReader for CSV files.
@@ -101,5 +101,19 @@ class TestPartialDataLoaderWithFile(unittest.TestCase):
         # check that the filtered data matches the expected data
         pd.testing.assert_frame_equal(filtered_data.reset_index(drop=True), expected_data)
 
+    def test_rows_appended_at_the_watermark(self):
+        """ 
+      This test checks that get_data_after skips only the rows at the watermark that were already processed, so a row appended later with the same timestamp is loaded.
+      """
+        appended_row = pd.DataFrame({"time": ["2025-01-03 00:00:00"], "sensor_1": [60], "sensor_2": [600]})
+        appended_row.to_csv(self.file_path, mode="a", header=False, index=False)
+        loader = PartialDataLoader(self.file_path, self.sensors, self.time_column, self.time_format, [None, "drop", "error"])
+
+        new_data = loader.get_data_after("2025-01-03 00:00:00", 1)
+        self.assertEqual(new_data["sensor_1"].tolist(), [60])
+        self.assertIsNone(loader.get_data_after("2025-01-03 00:00:00", 2))
+        self.assertIsNone(loader.get_data_after("2025-01-03 00:00:00"))  # a state without a row count skips all the rows at the watermark
+        self.assertEqual(loader.get_data_after("2025-01-02 11:00:00", 1)["sensor_1"].tolist(), [50, 60])
+
 if __name__ == "__main__":
     unittest.main()
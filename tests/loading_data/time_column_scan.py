@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from data_manager.loaders.time_column_scanner import scan_time_column
+from data_manager.prepare_data.filter_by_date_range import PartialDataLoader
+
+class TestTimeColumnScan(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.time_format = "%Y-%m-%d %H:%M:%S"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, lines, line_break="\n"):
+        file_path = os.path.join(self.temp_dir.name, "data.csv")
+        with open(file_path, "w", newline="") as f:
+            f.write(line_break.join(lines))
+        return file_path
+
+    def assert_same_as_pandas(self, file_path, time_format):
+        times, missing = scan_time_column(file_path, "time", time_format)
+        expected = pd.read_csv(file_path, usecols=["time"])["time"]
+        np.testing.assert_array_equal(missing, expected.isna().to_numpy())
+        pd.testing.assert_series_equal(times, pd.to_datetime(expected, format=time_format, errors="coerce"))
+
+    def test_scan_matches_pandas(self):
+        """
+      This test checks that the scanned timestamps and missing values are the same as reading the column with pandas and
+      converting it, for valid, missing, "NA", invalid, impossible and not zero-padded values (with CRLF line breaks).
+      """
+        lines = ["sensor_1,time,sensor_2", "1,2024-06-01 00:00:00,2", "1,2024-6-1 00:00:01,2", "1,,2", "1,NA,2",
+                 "1,2024-02-30 00:00:00,2", "1,2024-02-29 23:59:59,2", "1,invalid,2", "1,1900-01-01 00:00:00,2",
+                 "1,2024-13-01 00:00:00,2", "1,2024-06-01 25:00:00,2"]
+        self.assert_same_as_pandas(self.write(lines, "\r\n"), self.time_format)
+
+        # the other accepted time formats, with the time column as last column and no line break at the end
+        for time_format in ["%d/%m/%Y %H:%M:%S", "%m-%d-%Y %H:%M:%S"]:
+            times = pd.to_datetime(["2024-01-31 10:11:12", "2000-02-29 00:00:00", "1999-12-31 23:59:59"]).strftime(time_format)
+            self.assert_same_as_pandas(self.write(["sensor_1,time"] + [f"{i},{value}" for i, value in enumerate(times)]), time_format)
+
+    def test_unsupported_files_are_read_with_pandas(self):
+        """
+      This test checks that the scanner gives up (so the column is read with pandas) for quoted fields, blank lines and
+      lines with another number of fields than the header, and that PartialDataLoader still finds the rows of these files.
+      """
+        for lines in [["time,sensor_1", '"2024-06-01 00:00:00",1'],
+                      ["time,sensor_1", "2024-06-01 00:00:00,1", "", "2024-06-01 01:00:00,2"],
+                      ["time,sensor_1", "2024-06-01 00:00:00,1,3"]]:
+            self.assertIsNone(scan_time_column(self.write(lines), "time", self.time_format))
+
+        file_path = self.write(["time,sensor_1", '"2024-06-01 00:00:00",1', "2024-06-02 00:00:00,2"])
+        loader = PartialDataLoader(file_path, ["sensor_1"], "time", self.time_format, ["first", "drop", "drop"])
+        self.assertEqual(loader.get_filtered_data("2024-06-02")["sensor_1"].tolist(), [2])
+
+    def test_missing_and_failed_values_are_handled_separately(self):
+        """
+      This test checks that with scanned timestamps the missing values follow "handle_missing" and the failed
+      conversions follow "action" of the time processing parameters.
+      """
+        file_path = self.write(["time,sensor_1", "2024-06-01 00:00:00,1", ",2", "invalid,3", "2024-06-01 01:00:00,4"])
+
+        loader = PartialDataLoader(file_path, ["sensor_1"], "time", self.time_format, ["first", "drop", "error"])
+        with self.assertRaises(ValueError) as context:
+            loader.get_filtered_data("2024-06-01")
+        self.assertIn("Failed to convert 1 rows to datetime", str(context.exception))
+
+        loader = PartialDataLoader(file_path, ["sensor_1"], "time", self.time_format, ["first", "error", "drop"])
+        with self.assertRaises(ValueError) as context:
+            loader.get_filtered_data("2024-06-01")
+        self.assertIn("contains 1 missing (NaN) values", str(context.exception))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+import unittest
+import tempfile
+import multiprocessing
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.batch_runner import run_batch, select_date_range
+from config.validate_config import validate_batch
+from core import batch_runner
+
+run_job_safely = batch_runner._run_job_safely
+
+def exit_in_worker(job_name, *arguments):
+    # a killed worker (e.g., out of memory) breaks the pool instead of returning an outcome
+    if job_name == "killed":
+        os._exit(1)
+    return run_job_safely(job_name, *arguments)
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(5)
+        times = pd.date_range("2025-01-01", periods=3 * 24, freq="h")
+        self.data = pd.DataFrame({"time": times.strftime("%Y-%m-%d %H:%M:%S"),
+                                  "sensor_1": rng.normal(10, 2, len(times)).round(2),
+                                  "sensor_2": rng.integers(0, 2, len(times))})
+        self.file_path = os.path.join(self.temp_dir.name, "data.csv")
+        self.data.to_csv(self.file_path, index=False)
+
+        self.sensors = {"temperature": ["sensor_1"], "ordinal": ["sensor_2"]}
+        self.core_processing_par = ["fill", "mean", None, None, "z_score", 3]
+        self.time_processing_par = ["first", "drop", "error"]
+        self.rule_mining_par = ["equal_width", 2, None, ["temperature"], 0.1, 0.5, None, None, None]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_select_date_range(self):
+        """
+      This test checks that a single date selects the whole day and that a time range includes its end date.
+      """
+        times = pd.to_datetime(self.data["time"]).to_numpy(dtype="datetime64[ns]")
+
+        one_day = select_date_range(self.data, times, ("2025-01-02", None))
+        self.assertEqual(len(one_day), 24)
+        self.assertEqual(one_day["time"].iloc[0], "2025-01-02 00:00:00")
+
+        time_range = select_date_range(self.data, times, ("2025-01-01", "2025-01-02"))
+        self.assertEqual(len(time_range), 25)
+        self.assertEqual(time_range["time"].iloc[-1], "2025-01-02 00:00:00")
+
+    def test_run_batch_writes_outputs_per_job(self):
+        """
+      This test checks that every job writes its own outputs and that jobs without data are reported as failed.
+      """
+        jobs = [("day_1", ("2025-01-01", None)), ("two_days", ("2025-01-02", "2025-01-03")), ("missing", ("2025-02-01", None))]
+        summary = run_batch(self.file_path, self.temp_dir.name, "time", "%Y-%m-%d %H:%M:%S", self.sensors, self.core_processing_par,
+                            self.time_processing_par, self.rule_mining_par, jobs, max_workers=1)
+
+        self.assertEqual([job["status"] for job in summary], ["succeeded", "succeeded", "failed"])
+        self.assertEqual(summary[0]["rows"], 24)
+        self.assertEqual(summary[1]["rows"], 25)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "day_1", "generated_rules.txt")))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "two_days", "processed_data.csv")))
+
+        with open(os.path.join(self.temp_dir.name, "batch_summary.json")) as f:
+            self.assertEqual(len(json.load(f)), 3)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork", "the patched job runs only in forked workers")
+    def test_killed_worker_keeps_the_summary(self):
+        """
+      This test checks that a worker process that dies is reported as a failed job and that the summary is still written.
+      """
+        jobs = [("day_1", ("2025-01-01", None)), ("killed", ("2025-01-02", None))]
+        with patch("core.batch_runner._run_job_safely", exit_in_worker):
+            summary = run_batch(self.file_path, self.temp_dir.name, "time", "%Y-%m-%d %H:%M:%S", self.sensors, self.core_processing_par,
+                                self.time_processing_par, self.rule_mining_par, jobs, max_workers=2)
+
+        outcomes = {job["job"]: job for job in summary}
+        self.assertEqual(outcomes["killed"]["status"], "failed")
+        self.assertIn("BrokenProcessPool", outcomes["killed"]["error"])
+        with open(os.path.join(self.temp_dir.name, "batch_summary.json")) as f:
+            self.assertEqual([job["job"] for job in json.load(f)], ["day_1", "killed"])
+
+    def test_validate_batch_duplicated_names(self):
+        """
+      This test checks that the batch validation rejects jobs with the same name.
+      """
+        with self.assertRaises(ValueError) as context:
+            validate_batch({"jobs": [{"date": "2025-01-01"}, {"name": "2025-01-01", "date": "2025-01-02"}]})
+        self.assertIn("the job names must be unique", str(context.exception))
+
+if __name__ == "__main__":
+    unittest.main()
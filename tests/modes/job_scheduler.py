@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.job_scheduler import JobScheduler, estimate_job_memory, JOB_BASE_MEMORY_MB, MEMORY_PER_INPUT_BYTE
+
+class TestJobScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(9)
+        times = pd.date_range("2025-01-01", periods=2 * 48, freq="30min")
+        data = pd.DataFrame({"time": times.strftime("%Y-%m-%d %H:%M:%S"),
+                             "sensor_1": rng.normal(10, 2, len(times)).round(2),
+                             "sensor_2": rng.integers(0, 2, len(times)),
+                             "unused_1": rng.normal(0, 1, len(times)),
+                             "unused_2": rng.normal(0, 1, len(times))})
+        self.file_path = os.path.join(self.temp_dir.name, "data.csv")
+        data.to_csv(self.file_path, index=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _config(self, output_name, **overrides):
+        config = {
+            "input_file": self.file_path,
+            "output_dir": os.path.join(self.temp_dir.name, output_name),
+            "time_column": "time",
+            "time_format": "%Y-%m-%d %H:%M:%S",
+            "sensors": {"temperature": ["sensor_1"], "ordinal": ["sensor_2"]},
+            "pre_processing": {
+                "handle_missing_values": {"strategy": "fill", "fill_method": "mean", "fill_value": None, "time_window": "1min"},
+                "detect_outliers": {"method": "z_score", "threshold": 3},
+                "time_col": {"check_duplicates_keep": "first", "handle_missing_values": "drop", "failed_datetime_conversion": "error"},
+                "rule_mining": {"method": "equal_width", "bins": 2, "continuous_sensor_types": ["temperature"],
+                                "min_support": 0.1, "min_confidence": 0.5, "min_lift": 0.5}},
+            "instrumentation": {"run_report": False}}
+        config.update(overrides)
+        return config
+
+    def test_estimates_and_invalid_jobs(self):
+        """
+      This test checks that the memory estimate counts only the share of the columns that are read, that the per_day
+      workers are capped by the CPU budget (also in the config of the job) and that an invalid config is reported as a failed job.
+      """
+        expected = JOB_BASE_MEMORY_MB + int(os.path.getsize(self.file_path) * 3 / 5 * MEMORY_PER_INPUT_BYTE / 2**20)
+        self.assertEqual(estimate_job_memory(self._config("output")), expected)
+
+        scheduler = JobScheduler(max_cpus=2, max_memory_mb=1000)
+        per_day = scheduler.submit(self._config("per_day", mode="per_day", per_day={"max_workers": 4}), priority=1)
+        self.assertEqual((per_day["mode"], per_day["cpus"], per_day["status"]), ("per_day", 2, "queued"))
+
+        # the job starts only the granted workers (the jobs run in threads here, so the config of the call is visible)
+        with patch("core.job_scheduler.ProcessPoolExecutor", ThreadPoolExecutor), patch("core.job_scheduler.run_analysis") as run_analysis:
+            scheduler.run(None)
+        worker_config, mode = run_analysis.call_args.args
+        self.assertEqual((mode, worker_config["per_day"]["max_workers"]), ("per_day", 2))
+
+        invalid = scheduler.submit(self._config("invalid", time_column=None), name="invalid")
+        self.assertEqual(invalid["status"], "failed")
+        self.assertIn("time_column", invalid["error"])
+
+    def test_priorities_and_budgets(self):
+        """
+      This test checks that the jobs start in the order of their priority, that the memory budget limits the running
+      jobs and that the outcomes and queueing statistics are written in the summary file.
+      """
+        summary_file = os.path.join(self.temp_dir.name, "scheduler_summary.json")
+        scheduler = JobScheduler(max_cpus=2, max_memory_mb=150)
+        scheduler.submit(self._config("low"), priority=0, name="low", memory_mb=100)
+        scheduler.submit(self._config("high", date="2025-01-02"), priority=5, name="high", memory_mb=100)
+        scheduler.submit(self._config("large"), priority=1, name="large", memory_mb=500)
+        summary = scheduler.run(summary_file)
+
+        jobs = {job["job"]: job for job in summary["jobs"]}
+        self.assertEqual([job["status"] for job in summary["jobs"]], ["succeeded"] * 3)
+        self.assertEqual([jobs[name]["start_order"] for name in ["high", "large", "low"]], [1, 2, 3])
+        self.assertEqual(jobs["high"]["mode"], "single_day")
+        self.assertEqual(summary["stats"]["max_concurrent_jobs"], 1)
+        self.assertEqual(summary["stats"]["peak_memory_mb"], 500)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "low", "generated_rules.txt")))
+        with open(summary_file) as f:
+            self.assertEqual(json.load(f), summary)
+
+        # a budget for two jobs runs them next to each other
+        scheduler = JobScheduler(max_cpus=2, max_memory_mb=200)
+        for name in ["first", "second"]:
+            scheduler.submit(self._config(name), name=name, memory_mb=100)
+        summary = scheduler.run(None)
+        self.assertEqual(summary["stats"]["max_concurrent_jobs"], 2)
+        self.assertEqual(summary["stats"]["succeeded"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
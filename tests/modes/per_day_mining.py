@@ -0,0 +1,92 @@
+import os
+import sys
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core import per_day_mining
+from core.per_day_mining import get_per_day_rules, split_by_day, create_shared_block, read_shared_rows
+
+class TestPerDayMining(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(11)
+        times = pd.date_range("2025-01-01", periods=3 * 48, freq="30min")
+        self.data = pd.DataFrame({"time": times.strftime("%Y-%m-%d %H:%M:%S"),
+                                  "sensor_1": rng.normal(10, 2, len(times)).round(2),
+                                  "sensor_2": rng.integers(0, 2, len(times))})
+        self.file_path = os.path.join(self.temp_dir.name, "data.csv")
+        self.data.to_csv(self.file_path, index=False)
+
+        self.sensors = {"temperature": ["sensor_1"], "ordinal": ["sensor_2"]}
+        self.core_processing_par = ["fill", "mean", None, None, "z_score", 3]
+        self.time_processing_par = ["first", "drop", "error"]
+        self.rule_mining_par = ["equal_width", 2, None, ["temperature"], 0.1, 0.5, None, None, None]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_split_by_day(self):
+        """
+      This test checks that the row ranges of the days are found on a sorted time column.
+      """
+        times = pd.to_datetime(["2025-01-01 10:00", "2025-01-01 23:59", "2025-01-03 00:00", "2025-01-03 05:00"]).to_numpy()
+        self.assertEqual(split_by_day(times), [("2025-01-01", 0, 2), ("2025-01-03", 2, 4)])
+        self.assertEqual(split_by_day(times[:0]), [])
+
+    def test_shared_block_round_trip(self):
+        """
+      This test checks that the numeric and boolean columns are read back from the shared memory block with their dtypes.
+      """
+        df = pd.DataFrame({"a": [1.5, 2.5, 3.5], "b": np.array([1, 2, 3], dtype=np.int32), "c": [True, False, True], "d": ["x", "y", "z"]})
+        shared_block, layout = create_shared_block(df)
+        try:
+            self.assertEqual([entry[0] for entry in layout], ["a", "b", "c"])
+            rows = read_shared_rows(shared_block.name, layout, len(df), 1, 3)
+        finally:
+            shared_block.close()
+            shared_block.unlink()
+
+        pd.testing.assert_frame_equal(rows, df[["a", "b", "c"]].iloc[1:3].reset_index(drop=True))
+
+    def test_parallel_matches_sequential(self):
+        """
+      This test checks that the per-day rules are the same with a worker pool and without, and that every day is in the output.
+      """
+        outputs = {}
+        for max_workers in (1, 2):
+            output_dir = os.path.join(self.temp_dir.name, f"out_{max_workers}")
+            os.makedirs(output_dir)
+            formatted_output = get_per_day_rules(self.file_path, output_dir, "time", "%Y-%m-%d %H:%M:%S", self.sensors, self.core_processing_par,
+                                                 self.time_processing_par, self.rule_mining_par, max_workers)
+            outputs[max_workers] = (formatted_output, pd.read_csv(os.path.join(output_dir, "generated_rules_per_day.csv")))
+
+        self.assertEqual(outputs[1][0], outputs[2][0])
+        pd.testing.assert_frame_equal(outputs[1][1], outputs[2][1])
+        self.assertEqual(sorted(outputs[1][1]["day"].unique()), ["2025-01-01", "2025-01-02", "2025-01-03"])
+
+    def test_failed_day_keeps_the_others(self):
+        """
+      This test checks that a failing day is recorded in the outputs and that the rules of the other days are still written.
+      """
+        mine_day = per_day_mining.mine_day
+
+        def failing_mine_day(day, *arguments):
+            if day == "2025-01-02":
+                raise ValueError("no valid data")
+            return mine_day(day, *arguments)
+
+        with patch("core.per_day_mining.mine_day", side_effect=failing_mine_day):
+            formatted_output = get_per_day_rules(self.file_path, self.temp_dir.name, "time", "%Y-%m-%d %H:%M:%S", self.sensors, self.core_processing_par,
+                                                 self.time_processing_par, self.rule_mining_par, 1)
+
+        self.assertEqual(formatted_output[1], "=== Day 2025-01-02 (failed) ===\nno valid data")
+        rules = pd.read_csv(os.path.join(self.temp_dir.name, "generated_rules_per_day.csv"))
+        self.assertEqual(sorted(rules["day"].unique()), ["2025-01-01", "2025-01-03"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+
+class TestDiscretizationModel(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.df = pd.DataFrame({"sensor_1": rng.normal(50, 5, 1000), "sensor_2": rng.integers(0, 20, 1000).astype(float)})
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_equal_width_matches_cut(self):
+        """
+      This test checks that the equal width edges and bins are the same as the ones of "pd.cut".
+      """
+        model = DiscretizationModel.fit(self.df, ["sensor_1"], "equal_width", 4)
+        expected, expected_edges = pd.cut(self.df["sensor_1"], bins=4, labels=[f"bin_{i}" for i in range(4)], retbins=True)
+
+        np.testing.assert_allclose(model.bin_edges["sensor_1"], expected_edges)
+        self.assertEqual(model.transform(self.df["sensor_1"]).astype(str).tolist(), expected.astype(str).tolist())
+
+    def test_quantile_matches_qcut(self):
+        """
+      This test checks that the quantile edges and bins are the same as the ones of "pd.qcut", duplicated edges included.
+      """
+        model = DiscretizationModel.fit(self.df, ["sensor_2"], "quantile", 30)
+        expected, expected_edges = pd.qcut(self.df["sensor_2"], q=30, retbins=True, duplicates="drop")
+
+        np.testing.assert_allclose(model.bin_edges["sensor_2"], expected_edges)
+        self.assertEqual(model.transform(self.df["sensor_2"]).cat.codes.tolist(), expected.cat.codes.tolist())
+
+    def test_chunks_use_the_same_edges(self):
+        """
+      This test checks that a fitted model bins every chunk the same way as the full data, values outside the edges included.
+      """
+        model = DiscretizationModel.fit(self.df, ["sensor_1"], "equal_width", 3)
+        full = model.transform(self.df["sensor_1"]).tolist()
+        chunks = [model.transform(chunk["sensor_1"]).tolist() for chunk in np.array_split(self.df, 4)]
+        self.assertEqual(sum(chunks, []), full)
+
+        outside = model.transform(pd.Series([-1000.0, 1000.0, np.nan], name="sensor_1"))
+        self.assertEqual(outside.cat.codes.tolist(), [0, 2, -1])
+
+    def test_fit_on_sample(self):
+        """
+      This test checks that a model fitted on a sample is reproducible.
+      """
+        first = DiscretizationModel.fit(self.df, ["sensor_1"], "quantile", 3, sample_size=100)
+        second = DiscretizationModel.fit(self.df, ["sensor_1"], "quantile", 3, sample_size=100)
+        self.assertEqual(first.bin_edges, second.bin_edges)
+
+    def test_save_and_load(self):
+        """
+      This test checks that a saved model is loaded with the same edges and labels.
+      """
+        model = DiscretizationModel.fit(self.df, ["sensor_1", "sensor_2"], "equal_width", 3, labels=["low", "mid", "high"])
+        model_file = os.path.join(self.temp_dir.name, "model.json")
+        model.save(model_file)
+        restored = DiscretizationModel.load(model_file)
+
+        self.assertEqual(restored.bin_edges, model.bin_edges)
+        self.assertEqual(restored.bin_labels["sensor_1"], ["low", "mid", "high"])
+        self.assertIsNone(DiscretizationModel.load(os.path.join(self.temp_dir.name, "missing.json")))
+
+    def test_changed_settings_refit(self):
+        """
+      This test checks that a saved model fitted with another method, number of bins or labels is not reused.
+      """
+        model = DiscretizationModel.fit(self.df, ["sensor_1", "sensor_2"], "quantile", 30, labels=None)
+        model_file = os.path.join(self.temp_dir.name, "model.json")
+        model.save(model_file)
+        self.assertIsNotNone(DiscretizationModel.load(model_file, ("quantile", 30, None)))
+        for settings in [("equal_width", 30, None), ("quantile", 4, None), ("quantile", 30, ["bin_0"] * 30)]:
+            self.assertIsNone(DiscretizationModel.load(model_file, settings))
+
+        # a given model with other settings is fitted again on the data
+        processor = RuleMiningProcessor(self.df.copy(), {"temperature": ["sensor_1"]}, "time", model)
+        processor.discretize_and_encode(["temperature"], "equal_width", 2, ["low", "high"])
+        self.assertEqual(processor.discretization_model.bin_labels["sensor_1"], ["low", "high"])
+        self.assertEqual(processor.df.filter(like="sensor_1").shape[1], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from data_manager.preprocessing.core_preprocessor import DataChecker
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+
+class TestInPlaceEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.sensors = {"temperature": ["sensor_1", "sensor_2"], "ordinal": ["sensor_3"], "categorical": ["sensor_4"]}
+        self.df = pd.DataFrame({"time": pd.date_range("2025-01-01", periods=8, freq="h"),
+                                "sensor_1": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+                                "sensor_2": [5.0, 5.0, 6.0, 6.0, 7.0, 7.0, 8.0, 9.0],
+                                "sensor_3": [2, 0, 0, 1, 1, 2, 2, 0],
+                                "sensor_4": [0, 1, 0, 1, 0, 1, 0, 1]})
+
+    def test_encoding_matches_get_dummies(self):
+        """
+      This test checks that the in-place one-hot encoding gives the same columns, order and values as "pd.get_dummies".
+      """
+        processor = RuleMiningProcessor(self.df.copy(), self.sensors, "time")
+        discretized = processor.advanced_preprocessing("equal_width", 3, None, ["temperature"])
+
+        expected = self.df.copy()
+        for col in ["sensor_1", "sensor_2"]:
+            expected[col] = processor.discretization_model.transform(expected[col])
+        expected = pd.get_dummies(expected, columns=["sensor_1", "sensor_2"]).drop(columns=["time"])
+        expected = pd.get_dummies(expected, columns=["sensor_3"])
+        expected["sensor_4"] = expected["sensor_4"].astype(bool)
+
+        pd.testing.assert_frame_equal(discretized, expected)
+
+    def test_cleaning_does_not_copy_the_columns(self):
+        """
+      This test checks that handling the missing values keeps the owned frame and the memory of the columns that need no filling.
+      """
+        df = self.df.copy()
+        df.loc[3, "sensor_2"] = np.nan
+        sensor_1_values = df["sensor_1"].to_numpy()
+
+        checker = DataChecker(df, ["sensor_1", "sensor_2"], "time")
+        checker.handle_missing_values("fill", "mean")
+
+        self.assertIs(checker.df, df)
+        self.assertEqual(list(checker.df.columns), list(self.df.columns))
+        self.assertTrue(np.shares_memory(sensor_1_values, checker.df["sensor_1"].to_numpy()))
+        self.assertFalse(checker.df["sensor_2"].isna().any())
+
+if __name__ == "__main__":
+    unittest.main()
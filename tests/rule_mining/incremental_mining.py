@@ -0,0 +1,108 @@
+import os
+import sys
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from mlxtend.frequent_patterns import fpgrowth
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.incremental_mining import IncrementalMiningState
+from core.rule_mining import count_transactions, mine_frequent_itemsets_from_counts
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+from data_manager.preprocessing.discretization_model import DiscretizationModel
+
+class TestIncrementalMining(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.transactions = pd.DataFrame(rng.random((300, 6)) < 0.5, columns=[f"item_{i}" for i in range(6)])
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _as_dict(frequent_itemsets):
+        return {itemset: round(support, 10) for itemset, support in zip(frequent_itemsets["itemsets"], frequent_itemsets["support"])}
+
+    def test_counts_mining_matches_fpgrowth(self):
+        """
+      This test checks that mining the unique transactions with their counts gives the same itemsets and supports as FP-Growth.
+      """
+        unique_transactions, counts = count_transactions(self.transactions)
+        from_counts = mine_frequent_itemsets_from_counts(unique_transactions, counts, 0.1)
+        expected = fpgrowth(self.transactions, min_support=0.1, use_colnames=False)
+
+        self.assertEqual(counts.sum(), len(self.transactions))
+        self.assertEqual(self._as_dict(from_counts), self._as_dict(expected))
+
+    def test_state_accumulates_chunks(self):
+        """
+      This test checks that adding two chunks to the state gives the same counts as the full data, also after saving and loading.
+      """
+        state = IncrementalMiningState({"bins": 3})
+        for chunk in (self.transactions.iloc[:120], self.transactions.iloc[120:]):
+            state.add_transactions(list(chunk.columns), *count_transactions(chunk))
+        state.watermark = "2025-01-01 00:00:00"
+
+        state_file = os.path.join(self.temp_dir.name, "state.json")
+        state.save(state_file)
+        restored = IncrementalMiningState.load(state_file)
+
+        self.assertEqual(restored.transaction_count, len(self.transactions))
+        self.assertEqual(restored.watermark, "2025-01-01 00:00:00")
+        from_state = mine_frequent_itemsets_from_counts(*restored.to_transactions(), 0.1, restored.transaction_count)
+        expected = fpgrowth(self.transactions, min_support=0.1, use_colnames=False)
+        self.assertEqual(self._as_dict(from_state), self._as_dict(expected))
+
+    def test_watermark_counts_the_rows_at_the_last_timestamp(self):
+        """
+      This test checks that the watermark keeps the number of rows at the last timestamp, adding the rows of a next run with the same timestamp.
+      """
+        state = IncrementalMiningState({})
+        state.advance_watermark(pd.to_datetime(["2025-01-01 00:00:00", "2025-01-01 01:00:00", "2025-01-01 01:00:00"]).to_numpy())
+        self.assertEqual((state.watermark, state.watermark_rows), ("2025-01-01 01:00:00", 2))
+
+        state.advance_watermark(pd.to_datetime(["2025-01-01 01:00:00"]).to_numpy())
+        self.assertEqual((state.watermark, state.watermark_rows), ("2025-01-01 01:00:00", 3))
+
+        state.advance_watermark(pd.to_datetime(["2025-01-01 02:00:00"]).to_numpy())
+        self.assertEqual((state.watermark, state.watermark_rows), ("2025-01-01 02:00:00", 1))
+
+        state_file = os.path.join(self.temp_dir.name, "state.json")
+        state.save(state_file)
+        self.assertEqual(IncrementalMiningState.load(state_file).watermark_rows, 1)
+
+    def test_new_items_get_new_ids(self):
+        """
+      This test checks that items seen for the first time are appended without changing the IDs of the known items.
+      """
+        state = IncrementalMiningState({})
+        state.add_transactions(["a", "b"], np.array([[True, False]]), np.array([2]))
+        state.add_transactions(["c", "a"], np.array([[True, True]]), np.array([1]))
+
+        self.assertEqual(state.items, ["a", "b", "c"])
+        self.assertEqual(dict(state.itemset_counts), {(0,): 2, (0, 2): 1})
+
+    def test_missing_state_file(self):
+        """
+      This test checks that loading a state that does not exist yet returns None.
+      """
+        self.assertIsNone(IncrementalMiningState.load(os.path.join(self.temp_dir.name, "missing.json")))
+
+    def test_fixed_bin_edges_are_reused(self):
+        """
+      This test checks that the bin edges of a given discretization model are applied as they are and that values outside of them fall into the outer bins.
+      """
+        df = pd.DataFrame({"time": pd.date_range("2025-01-01", periods=4, freq="h"), "sensor_1": [-5.0, 1.0, 6.0, 50.0]})
+        model = DiscretizationModel("equal_width", 2, {"sensor_1": [0.0, 5.0, 10.0]}, {"sensor_1": ["bin_0", "bin_1"]})
+        processor = RuleMiningProcessor(df, {"temperature": ["sensor_1"]}, "time", model)
+        discretized = processor.advanced_preprocessing("equal_width", 2, None, ["temperature"])
+
+        self.assertEqual(discretized["sensor_1_bin_0"].tolist(), [True, True, False, False])
+        self.assertEqual(discretized["sensor_1_bin_1"].tolist(), [False, False, True, True])
+        self.assertEqual(processor.discretization_model.bin_edges["sensor_1"], [0.0, 5.0, 10.0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.rule_mining import run_association_rule_mining, format_rules_output
+from data_manager.preprocessing.item_dictionary import ItemDictionary
+from data_manager.preprocessing.rule_mining_processor import RuleMiningProcessor
+
+class TestItemDictionary(unittest.TestCase):
+
+    def setUp(self):
+        self.sensors = {"temperature": ["sensor_1"], "ordinal": ["sensor_2"]}
+        self.df = pd.DataFrame({"time": pd.date_range("2025-01-01", periods=8, freq="h"),
+                                "sensor_1": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+                                "sensor_2": [0, 0, 0, 0, 1, 1, 1, 1]})
+
+    def _processed(self):
+        processor = RuleMiningProcessor(self.df.copy(), self.sensors, "time")
+        discretized = processor.advanced_preprocessing("equal_width", 2, None, ["temperature"])
+        return discretized, processor.build_item_dictionary()
+
+    def test_item_ids_follow_columns(self):
+        """
+      This test checks that every rule mining column gets an int32 item ID equal to its position, with its sensor and label.
+      """
+        discretized, item_dictionary = self._processed()
+
+        self.assertEqual(item_dictionary.item_ids.dtype, np.int32)
+        self.assertEqual(list(item_dictionary.columns), list(discretized.columns))
+        self.assertEqual(list(item_dictionary.encode(["sensor_1_bin_1", "sensor_2_0"])), [1, 2])
+        self.assertEqual(item_dictionary.describe(0)["sensor"], "sensor_1")
+        self.assertEqual(item_dictionary.describe(0)["label"], "bin_0")
+        self.assertEqual(item_dictionary.describe(2)["label"], "0")
+        self.assertIsNone(item_dictionary.describe(2)["bin_edges"])
+
+    def test_bin_edges_are_attached(self):
+        """
+      This test checks that continuous items carry the edges of their bin.
+      """
+        _, item_dictionary = self._processed()
+
+        lower, upper = item_dictionary.describe(1)["bin_edges"]
+        self.assertAlmostEqual(lower, 4.5)
+        self.assertAlmostEqual(upper, 8.0)
+
+    def test_rules_are_decoded_at_output(self):
+        """
+      This test checks that the rules are mined on integer IDs and decoded into column names only when formatted.
+      """
+        discretized, item_dictionary = self._processed()
+        rules = run_association_rule_mining(discretized, 0.3, 0.9, None)
+
+        self.assertTrue(all(isinstance(item, (int, np.integer)) for itemset in rules["antecedents"] for item in itemset))
+
+        formatted_rules = format_rules_output(rules, item_dictionary)
+        self.assertIn("If ['sensor_1_bin_0'] then ['sensor_2_0']", formatted_rules)
+        self.assertIn("If ['sensor_2_1'] then ['sensor_1_bin_1']", formatted_rules)
+
+    def test_round_trip(self):
+        """
+      This test checks that the item dictionary can be serialized and restored.
+      """
+        _, item_dictionary = self._processed()
+        restored = ItemDictionary.from_dict(item_dictionary.to_dict())
+
+        self.assertEqual(list(restored.columns), list(item_dictionary.columns))
+        self.assertEqual(restored.bin_edges, item_dictionary.bin_edges)
+        self.assertEqual(restored.decode([2, 0]), ["sensor_1_bin_0", "sensor_2_0"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.rule_mining import get_rules
+from core.preview_sampling import preview_sample_size, draw_preview_sample, wilson_interval
+
+class TestPreviewMining(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(5)
+        rows = 3000
+        self.data = pd.DataFrame({
+            "time": pd.date_range("2025-01-01", periods=rows, freq="min").strftime("%Y-%m-%d %H:%M:%S"),
+            "sensor_1": rng.normal(10, 2, rows).round(2),
+            "sensor_2": rng.integers(0, 2, rows)})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_sample_size_and_intervals(self):
+        """
+      This test checks the sample size for a margin of error, the proportional allocation of the stratified sample and
+      that the Wilson intervals contain the estimate and collapse to it for a sample of all the rows.
+      """
+        self.assertEqual(preview_sample_size(10**9, 0.01, 0.95), 9604)
+        self.assertEqual(preview_sample_size(1000, 0.01, 0.95), 906)
+        self.assertEqual(preview_sample_size(100, 0.5, 0.5), 1)
+
+        df = pd.DataFrame({"time": pd.date_range("2025-01-01", periods=600, freq="min"), "value": range(600)})
+        sample = draw_preview_sample(df, "time", 60, "stratified", "1h", 0)
+        self.assertEqual(np.bincount(sample["time"].dt.hour).tolist(), [6] * 10)
+        self.assertTrue(sample["time"].is_monotonic_increasing)
+        pd.testing.assert_frame_equal(draw_preview_sample(df, "time", 60, "random", "1h", 3), draw_preview_sample(df, "time", 60, "random", "1h", 3))
+
+        low, high = wilson_interval([0.2, 0.5], 400, 10**6, 0.95)
+        self.assertTrue(((low < [0.2, 0.5]) & (high > [0.2, 0.5])).all())
+        np.testing.assert_allclose(high - low, [0.0783, 0.0975], atol=1e-3)
+        low, high = wilson_interval(0.2, 100, 100, 0.95)
+        self.assertEqual((float(low), float(high)), (0.2, 0.2))
+
+    def test_preview_rules_file(self):
+        """
+      This test checks that the preview writes its rules with the intervals in "generated_rules_preview.txt" without the
+      outputs of a full run, and that a sample of all the rows gives the supports and confidences of the full run.
+      """
+        input_file = os.path.join(self.temp_dir.name, "data.csv")
+        self.data.to_csv(input_file, index=False)
+        arguments = [input_file, self.temp_dir.name, "time", "%Y-%m-%d %H:%M:%S", {"temperature": ["sensor_1"], "ordinal": ["sensor_2"]}, None,
+                     ["fill", "mean", None, None, "z_score", 3], ["first", "drop", "error"], ["equal_width", 2, None, ["temperature"], 0.1, 0.3, None, None, None]]
+
+        preview = get_rules(*arguments, None, None, (0.05, 0.95, "stratified", "1h", 0))
+        self.assertTrue(preview.startswith("Preview on a stratified sample of 341 of 3000 rows"))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, "generated_rules.txt")))
+        with open(os.path.join(self.temp_dir.name, "generated_rules_preview.txt")) as f:
+            self.assertEqual(f.read(), preview)
+
+        # a margin of error small enough for all the rows gives the values of the full run with empty intervals
+        census = get_rules(*arguments, None, None, (0.0001, 0.95, "random", "1h", 0)).splitlines()[1:]
+        full = get_rules(*arguments).splitlines()
+        self.assertEqual(len(census), len(full))
+        for census_rule, full_rule in zip(census, full):
+            support, confidence = full_rule.split("Support: ")[1].split(", Confidence: ")
+            confidence = confidence.split(",")[0]
+            self.assertIn(f"Support: {support} [{support}, {support}]", census_rule)
+            self.assertIn(f"Confidence: {confidence} [{confidence}, {confidence}]", census_rule)
+
+if __name__ == "__main__":
+    unittest.main()
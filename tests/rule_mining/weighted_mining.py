@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+from mlxtend.frequent_patterns import fpgrowth
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.rule_mining import count_transactions, find_frequent_itemsets, weighted_fpgrowth, weighted_fpgrowth_supported
+
+@unittest.skipUnless(weighted_fpgrowth_supported(), "the installed mlxtend has other FP-Growth internals")
+class TestWeightedMining(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        # 40 distinct states repeated over 5000 rows
+        states = rng.random((40, 10)) < 0.4
+        self.transactions = pd.DataFrame(states[rng.integers(0, 40, 5000)])
+
+    def test_unique_transactions_in_first_occurrence_order(self):
+        """
+      This test checks that the identical rows are collapsed into unique rows (in the order of their first occurrence)
+      with counts that add up to the number of rows.
+      """
+        unique_transactions, counts = count_transactions(self.transactions)
+        rows = [tuple(row) for row in self.transactions.to_numpy()]
+        expected = list(dict.fromkeys(rows))
+
+        self.assertEqual([tuple(row) for row in unique_transactions], expected)
+        self.assertEqual(counts.tolist(), [rows.count(row) for row in expected])
+
+    def test_weighted_mining_matches_fpgrowth(self):
+        """
+      This test checks that mining the weighted transactions gives the same frequent itemsets, supports and order as
+      FP-Growth on every row, for several minimum supports.
+      """
+        for min_support in [0.02, 0.1, 0.5]:
+            expected = fpgrowth(self.transactions, min_support=min_support, use_colnames=False)
+            unique_transactions, counts = count_transactions(self.transactions)
+            pd.testing.assert_frame_equal(weighted_fpgrowth(unique_transactions, counts, min_support), expected)
+            pd.testing.assert_frame_equal(find_frequent_itemsets(self.transactions, min_support), expected)
+
+if __name__ == "__main__":
+    unittest.main()
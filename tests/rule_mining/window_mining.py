@@ -0,0 +1,60 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.window_mining import iterate_window_counts
+from config.validate_config import validate_rolling_window
+
+class TestWindowCounts(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        # irregular, sorted timestamps over ten days with a gap of two days
+        offsets = np.sort(rng.choice(np.arange(0, 10 * 24 * 60), size=2000, replace=False))
+        offsets = offsets[(offsets < 3 * 24 * 60) | (offsets > 5 * 24 * 60)]
+        self.times = (np.datetime64("2025-01-01T00:00:00", "ns") + offsets.astype("timedelta64[m]")).astype("datetime64[ns]")
+        self.codes = rng.integers(0, 5, len(self.times))
+
+    def _check_windows(self, window, step):
+        windows = list(iterate_window_counts(self.times, self.codes, 5, window, step))
+        for window_start, window_end, counts in windows:
+            in_window = (self.times >= window_start.to_datetime64()) & (self.times < window_end.to_datetime64())
+            np.testing.assert_array_equal(counts, np.bincount(self.codes[in_window], minlength=5))
+        return windows
+
+    def test_overlapping_windows(self):
+        """
+      This test checks that the incrementally updated counts of overlapping windows match counting every window from scratch.
+      """
+        windows = self._check_windows("2D", "12h")
+        self.assertEqual(windows[0][0], pd.Timestamp(self.times[0]))
+        self.assertGreater(windows[-1][1], pd.Timestamp(self.times[-1]))
+
+    def test_disjoint_windows(self):
+        """
+      This test checks the counts when the step is larger than the window, so some rows are never part of a window.
+      """
+        self._check_windows("6h", "1D")
+
+    def test_empty_windows_inside_gap(self):
+        """
+      This test checks that the windows inside a gap in the data have no transactions.
+      """
+        windows = self._check_windows("12h", "12h")
+        self.assertTrue(any(counts.sum() == 0 for _, _, counts in windows))
+
+    def test_invalid_window_config(self):
+        """
+      This test checks that a missing, null, non-string or non-positive window or step is rejected.
+      """
+        validate_rolling_window({"window": "7D", "step": "1D"})
+        for rolling_window_config in [{"window": "7D"}, {"step": "1D"}, {"window": "7D", "step": None},
+                                      {"window": 7, "step": "1D"}, {"window": "NaT", "step": "1D"}, {"window": "7D", "step": "-1D"}]:
+            with self.assertRaises(ValueError):
+                validate_rolling_window(rolling_window_config)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import unittest
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from core.analysis_service import create_server
+
+class TestAnalysisService(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(3)
+        times = pd.date_range("2025-01-01", periods=2 * 48, freq="30min")
+        data = pd.DataFrame({"time": times.strftime("%Y-%m-%d %H:%M:%S"),
+                             "sensor_1": rng.normal(10, 2, len(times)).round(2),
+                             "sensor_2": rng.integers(0, 2, len(times))})
+        self.file_path = os.path.join(self.temp_dir.name, "data.csv")
+        data.to_csv(self.file_path, index=False)
+
+        self.server = create_server(port=0, cache_size=1)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def _config(self, **overrides):
+        config = {
+            "input_file": self.file_path,
+            "output_dir": os.path.join(self.temp_dir.name, "output"),
+            "time_column": "time",
+            "time_format": "%Y-%m-%d %H:%M:%S",
+            "sensors": {"temperature": ["sensor_1"], "ordinal": ["sensor_2"]},
+            "pre_processing": {
+                "handle_missing_values": {"strategy": "fill", "fill_method": "mean", "fill_value": None, "time_window": "1min"},
+                "detect_outliers": {"method": "z_score", "threshold": 3},
+                "time_col": {"check_duplicates_keep": "first", "handle_missing_values": "drop", "failed_datetime_conversion": "error"},
+                "rule_mining": {"method": "equal_width", "bins": 2, "continuous_sensor_types": ["temperature"],
+                                "min_support": 0.1, "min_confidence": 0.5, "min_lift": 0.5}}}
+        config.update(overrides)
+        return config
+
+    def _request(self, path, data=None):
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.url + path, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_repeated_request_uses_the_cache(self):
+        """
+      This test checks that a repeated request (with other rule mining thresholds) reuses the cleaned dataset.
+      """
+        status, first = self._request("/analyze", self._config())
+        self.assertEqual(status, 200)
+        self.assertFalse(first["cached"])
+        self.assertGreater(first["rule_count"], 0)
+
+        config = self._config()
+        config["pre_processing"]["rule_mining"]["min_lift"] = 1.0
+        status, second = self._request("/analyze", config)
+        self.assertEqual(status, 200)
+        self.assertTrue(second["cached"])
+        self.assertLessEqual(second["rule_count"], first["rule_count"])
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "output", "generated_rules.txt")))
+
+        _, status_data = self._request("/status")
+        self.assertEqual((status_data["hits"], status_data["misses"], status_data["cached_datasets"]), (1, 1, 1))
+
+    def test_concurrent_requests_load_once(self):
+        """
+      This test checks that concurrent requests for the same dataset load it once, and that every request writes the
+      processed data in its output directory, also when the dataset came from the cache.
+      """
+        output_dirs = [os.path.join(self.temp_dir.name, f"output_{index}") for index in range(3)]
+        responses = []
+        threads = [threading.Thread(target=lambda output_dir=output_dir: responses.append(self._request("/analyze", self._config(output_dir=output_dir))))
+                   for output_dir in output_dirs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(status for status, _ in responses), [200, 200, 200])
+        self.assertEqual(sorted(data["cached"] for _, data in responses), [False, True, True])
+        for output_dir in output_dirs:
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "processed_data.csv")))
+        _, status_data = self._request("/status")
+        self.assertEqual((status_data["hits"], status_data["misses"]), (2, 1))
+
+    def test_changed_input_or_range_is_not_cached(self):
+        """
+      This test checks that another date range or a modified input file is a cache miss, and that the LRU cache stays bounded.
+      """
+        self._request("/analyze", self._config())
+        _, single_day = self._request("/analyze", self._config(date="2025-01-02"))
+        self.assertFalse(single_day["cached"])
+        self.assertEqual(single_day["mode"], "single_day")
+
+        os.utime(self.file_path, ns=(0, 0))
+        _, after_change = self._request("/analyze", self._config(date="2025-01-02"))
+        self.assertFalse(after_change["cached"])
+
+        _, status_data = self._request("/status")
+        self.assertEqual(status_data["cached_datasets"], 1)
+
+    def test_full_data_bounds_and_preview(self):
+        """
+      This test checks that the full_data bounds limit the cleaned rows and are part of the cache key, and that a preview
+      request writes the preview rules.
+      """
+        _, unbounded = self._request("/analyze", self._config())
+        status, bounded = self._request("/analyze", self._config(full_data={"start": "2025-01-02", "chunk_size": 10}))
+        self.assertEqual(status, 200)
+        self.assertFalse(bounded["cached"])
+        self.assertEqual((unbounded["rows"], bounded["rows"]), (96, 48))
+
+        # another chunk size gives the same cleaned data
+        _, rechunked = self._request("/analyze", self._config(full_data={"start": "2025-01-02", "chunk_size": 20}))
+        self.assertTrue(rechunked["cached"])
+
+        config = self._config(full_data={"start": "2025-01-02"})
+        config["pre_processing"]["rule_mining"]["preview"] = {"margin_of_error": 0.2}
+        status, preview = self._request("/analyze", config)
+        self.assertEqual(status, 200)
+        self.assertTrue(preview["preview"])
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "output", "generated_rules_preview.txt")))
+
+    def test_output_settings_per_request(self):
+        """
+      This test checks that the output settings of a request are used for its outputs only.
+      """
+        output_config = {"compression": "gzip", "processed_data": False}
+        status, _ = self._request("/analyze", self._config(output_dir=os.path.join(self.temp_dir.name, "gzip"), output=output_config))
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.temp_dir.name, "gzip"))), ["generated_rules.txt", "processed_data_mining_rules.csv.gz"])
+
+        status, _ = self._request("/analyze", self._config(date="2025-01-02"))
+        self.assertEqual(status, 200)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "output", "processed_data_mining_rules.csv")))
+
+    def test_invalid_requests(self):
+        """
+      This test checks that invalid configs, unsupported modes and memory budgets are rejected with a 400 status.
+      """
+        status, data = self._request("/analyze", {"input_file": self.file_path})
+        self.assertEqual(status, 400)
+        self.assertIn("Missing required config keys", data["error"])
+
+        status, data = self._request("/analyze", self._config(mode="per_day"))
+        self.assertEqual(status, 400)
+        self.assertIn("Invalid 'mode' for the service", data["error"])
+
+        status, data = self._request("/analyze", self._config(memory={"max_memory": "1GB"}))
+        self.assertEqual(status, 400)
+        self.assertIn("'memory.max_memory' is not supported", data["error"])
+
+if __name__ == "__main__":
+    unittest.main()
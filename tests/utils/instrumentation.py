@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import unittest
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from utils.instrumentation import instrumented, measure_stage, start_run_report, finish_run_report
+from data_manager.preprocessing.core_preprocessor import DataChecker
+
+@instrumented
+def double_rows(df):
+    return pd.concat([df, df])
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({"time": pd.date_range("2025-01-01", periods=4, freq="h"), "sensor_1": [1.0, None, 3.0, 4.0]})
+
+    def tearDown(self):
+        finish_run_report(self.temp_dir.name)
+        self.temp_dir.cleanup()
+
+    def _read_report(self):
+        with open(os.path.join(self.temp_dir.name, "run_report.json")) as f:
+            return json.load(f)
+
+    def test_stages_are_measured(self):
+        """
+      This test checks that the instrumented methods, functions and blocks are written in the run report with their shapes and depth.
+      """
+        start_run_report("full_data", trace_memory=True)
+        DataChecker(self.df.copy(), ["sensor_1"], "time").handle_missing_values("drop", None)
+        double_rows(self.df)
+        with measure_stage("write_output"):
+            pass
+        finish_run_report(self.temp_dir.name)
+
+        report = self._read_report()
+        self.assertEqual(report["status"], "succeeded")
+        stages = {stage["stage"]: stage for stage in report["stages"]}
+        self.assertEqual([stage["stage"] for stage in report["stages"]], ["DataChecker.handle_missing_values", "double_rows", "write_output"])
+
+        missing_values = stages["DataChecker.handle_missing_values"]
+        self.assertEqual((missing_values["rows_in"], missing_values["rows_out"], missing_values["columns_out"]), (4, 3, 2))
+        self.assertEqual((stages["double_rows"]["rows_in"], stages["double_rows"]["rows_out"]), (4, 8))
+        for key in ["wall_time_s", "cpu_time_s", "peak_rss_delta_mb", "traced_peak_delta_mb", "depth"]:
+            self.assertIn(key, stages["double_rows"])
+
+    def test_nested_stages_and_failures(self):
+        """
+      This test checks that nested stages get their depth and that a failed run is reported with its error.
+      """
+        start_run_report("single_day")
+        with self.assertRaises(ValueError):
+            with measure_stage("outer"):
+                with measure_stage("inner"):
+                    raise ValueError("broken stage")
+        finish_run_report(self.temp_dir.name, status="failed", error="broken stage")
+
+        report = self._read_report()
+        self.assertEqual((report["status"], report["error"]), ("failed", "broken stage"))
+        self.assertEqual([(stage["stage"], stage["depth"]) for stage in report["stages"]], [("outer", 0), ("inner", 1)])
+
+    def test_no_active_report(self):
+        """
+      This test checks that the instrumented functions run normally and that no report is written when no report is active.
+      """
+        self.assertEqual(len(double_rows(self.df)), 8)
+        self.assertIsNone(finish_run_report(self.temp_dir.name))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, "run_report.json")))
+
+if __name__ == "__main__":
+    unittest.main()
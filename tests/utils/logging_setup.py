@@ -0,0 +1,85 @@
+import os
+import sys
+import queue
+import logging
+import unittest
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from utils.logging_setup import initialize_logging, stop_logging, DeferredQueueHandler
+
+def log_in_worker(message):
+    logging.info("Worker message: %s", message)
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+class TestQueueLogging(unittest.TestCase):
+
+    def setUp(self):
+        # the logs are saved in "../system_logs", relative to the working directory
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        self.work_dir = os.path.join(self.temp_dir.name, "src")
+        os.makedirs(self.work_dir)
+        os.chdir(self.work_dir)
+
+    def tearDown(self):
+        stop_logging()
+        for handler in logging.root.handlers[:]:
+            logging.root.removeHandler(handler)
+            handler.close()
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def read_log(self, log_path):
+        with open(os.path.join(log_path, "run.log")) as f:
+            return f.read()
+
+    def test_records_are_written_by_the_listener(self):
+        """
+      This test checks that the root logger only has the queue handler and that the %-style records are formatted
+      and written to the log file once the listener is stopped.
+      """
+        log_path = initialize_logging(level="INFO")
+        self.assertEqual([type(handler) for handler in logging.root.handlers], [DeferredQueueHandler])
+
+        logging.info("Filled %s values in column '%s'.", 3, "sensor1")
+        logging.debug("This debug record is %s.", "filtered")
+        stop_logging()
+
+        log = self.read_log(log_path)
+        self.assertIn("INFO - Filled 3 values in column 'sensor1'.", log)
+        self.assertNotIn("filtered", log)
+
+    def test_arguments_are_merged_when_logged(self):
+        """
+      This test checks that a record shows the values of its arguments at the logging call, also if they are changed
+      in place before the listener writes it.
+      """
+        records = queue.Queue()
+        handler = DeferredQueueHandler(records)
+        values = [1, 2]
+        handler.handle(logging.LogRecord("root", logging.INFO, __file__, 1, "Values: %s", (values,), None))
+        values[0] = 100
+
+        record = records.get_nowait()
+        self.assertEqual((record.getMessage(), record.args), ("Values: [1, 2]", None))
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "the fork start method is not available")
+    def test_forked_worker_logs_directly(self):
+        """
+      This test checks that a forked worker process (as used by the batch and per_day modes) writes its logs to the
+      session log file, although the listener thread of the parent does not exist in the worker.
+      """
+        log_path = initialize_logging(level="INFO")
+        worker = multiprocessing.get_context("fork").Process(target=log_in_worker, args=("job_1",))
+        worker.start()
+        worker.join()
+        stop_logging()
+
+        self.assertEqual(worker.exitcode, 0)
+        self.assertIn("Worker message: job_1", self.read_log(log_path))
+
+if __name__ == "__main__":
+    unittest.main()
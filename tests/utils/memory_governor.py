@@ -0,0 +1,118 @@
+import os
+import sys
+import gzip
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from utils import memory_governor
+from utils.memory_governor import MemoryGovernor, configure_memory_governor, finish_memory_governor, estimate_file_rows
+from core.rule_mining import mine_and_save_rules
+from config.config_loader import get_memory_input
+from config.validate_config import validate_memory
+
+class TestMemoryGovernor(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(8)
+        rows = 500
+        self.processed_data = pd.DataFrame({
+            "time": pd.date_range("2025-01-01", periods=rows, freq="min"),
+            "sensor_1": rng.normal(10, 2, rows).round(2),
+            "sensor_2": rng.normal(50, 5, rows).round(1),
+            "sensor_3": rng.integers(0, 3, rows)})
+        self.sensors = {"temperature": ["sensor_1"], "pressure": ["sensor_2"], "ordinal": ["sensor_3"]}
+        self.rule_mining_par = ["equal_width", 3, None, ["temperature", "pressure"], 0.05, 0.3, None, None, None]
+
+    def tearDown(self):
+        finish_memory_governor()
+        self.temp_dir.cleanup()
+
+    def read_bytes(self, file_path):
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    @patch("utils.memory_governor.get_current_rss_mb", return_value=100)
+    def test_plan_degrades_with_the_budget(self, _):
+        """
+      This test checks that every step keeps its usual path within the budget and chooses the leaner path (float32,
+      sparse or spilled transactions, counting in blocks) when its projection exceeds the budget.
+      """
+        governor = MemoryGovernor(1000)
+        self.assertEqual(governor.transaction_storage(1000, 30, 3), "dense")
+        self.assertEqual(governor.transaction_storage(50_000_000, 30, 3), "sparse")
+        self.assertEqual(governor.transaction_storage(200_000_000, 30, 3), "spill")
+        self.assertIsNone(governor.counting_block_rows(1000, 30))
+        self.assertEqual(governor.counting_block_rows(100_000_000, 30), int(100 * 2**20 / (30 + 30 / 8 + 16)))
+        self.assertEqual(governor.plan["transactions"], "a matrix spilled to disk")
+
+        self.assertIs(governor.plan_cleaning(self.processed_data, ["sensor_1", "sensor_2"]), self.processed_data)
+        cleaned = MemoryGovernor(100.01).plan_cleaning(self.processed_data, ["sensor_1", "sensor_3"])
+        self.assertEqual(cleaned.dtypes.astype(str).tolist(), ["datetime64[ns]", "float32", "float64", "int64"])
+
+        # without a budget, the whole file is read at once and the bounded reads keep their chunk size
+        file_path = os.path.join(self.temp_dir.name, "data.csv")
+        self.processed_data.to_csv(file_path, index=False)
+        self.assertEqual(MemoryGovernor().plan_reading(file_path, 3, 100_000, 2, False), (None, False))
+        self.assertEqual(MemoryGovernor().plan_reading(file_path, 3, 100_000, 2, True), (100_000, False))
+        self.assertEqual(governor.plan_reading(file_path, 3, 100_000, 2, False), (None, False))
+        buffer_rows = int(100.01 * 2**20 * memory_governor.BUFFER_BUDGET_SHARE / ((memory_governor.TIME_TEXT_BYTES + 8 * 3) * 2 * 4))
+        self.assertEqual(MemoryGovernor(100.01).plan_reading(file_path, 3, 100_000, 2, False), (buffer_rows, True))
+        self.assertEqual(MemoryGovernor(100.01).plan_reading(file_path, 3, 5000, 2, True), (5000, False))
+
+    def test_estimate_file_rows(self):
+        """
+      This test checks that the rows of a short file are counted exactly and that the rows of a longer (or compressed)
+      file are estimated from the length of its first lines.
+      """
+        file_path = os.path.join(self.temp_dir.name, "data.csv")
+        self.processed_data.to_csv(file_path, index=False)
+        self.assertEqual(estimate_file_rows(file_path), 500)
+
+        long_data = pd.concat([self.processed_data] * 200)
+        long_data.to_csv(file_path, index=False)
+        self.assertAlmostEqual(estimate_file_rows(file_path), 100_000, delta=1000)
+        with gzip.open(file_path + ".gz", "wb") as f:
+            f.write(self.read_bytes(file_path)[:1000])
+        self.assertEqual(estimate_file_rows(file_path + ".gz"), len(self.read_bytes(file_path)[:1000].splitlines()) - 1)
+        self.assertEqual(estimate_file_rows(os.path.join(self.temp_dir.name, "missing.csv")), 0)
+
+    def test_leaner_transactions_give_the_same_outputs(self):
+        """
+      This test checks that the sparse and the spilled transactions, counted in blocks, give the same mining data and
+      rules as the usual dense transactions.
+      """
+        expected_dir = os.path.join(self.temp_dir.name, "dense")
+        os.makedirs(expected_dir)
+        expected_rules = mine_and_save_rules(self.processed_data.copy(), expected_dir, self.sensors, "time", self.rule_mining_par)
+        self.assertFalse(expected_rules.startswith("No valid"))
+
+        for storage in ["sparse", "spill"]:
+            output_dir = os.path.join(self.temp_dir.name, storage)
+            os.makedirs(output_dir)
+            configure_memory_governor(1024, self.temp_dir.name)
+            with patch.object(MemoryGovernor, "transaction_storage", return_value=storage), \
+                 patch.object(MemoryGovernor, "counting_block_rows", return_value=70):
+                rules = mine_and_save_rules(self.processed_data.copy(), output_dir, self.sensors, "time", self.rule_mining_par)
+            finish_memory_governor()
+            self.assertEqual(rules, expected_rules)
+            self.assertEqual(self.read_bytes(os.path.join(output_dir, "processed_data_mining_rules.csv")),
+                             self.read_bytes(os.path.join(expected_dir, "processed_data_mining_rules.csv")))
+
+    def test_memory_config(self):
+        """
+      This test checks that the budget is read in MB or GB and that invalid budgets are rejected.
+      """
+        self.assertEqual(get_memory_input({"memory": {"max_memory": "4GB"}}), (4096, None))
+        self.assertEqual(get_memory_input({"memory": {"max_memory": 512, "spill_dir": "/tmp"}}), (512, "/tmp"))
+        self.assertEqual(get_memory_input({}), (None, None))
+        for memory_config in [{"max_memory": "0GB"}, {"max_memory": "4TB"}, {"max_memory": True}, {"max_memory": 512, "spill_dir": ""}]:
+            with self.assertRaises(ValueError):
+                validate_memory(memory_config)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+import tempfile
+import importlib.util
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from utils import output_writer
+from utils.output_writer import OutputWriter
+
+class TestOutputWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(4)
+        self.bool_data = pd.DataFrame(rng.random((1000, 7)) < 0.3, columns=[f"sensor_{i}_bin_0" for i in range(6)] + ["a,b"])
+        self.processed_data = pd.DataFrame({"time": pd.date_range("2025-01-01", periods=50, freq="h"), "sensor_1": rng.normal(0, 1, 50)})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_bytes(self, file_path):
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    def test_bool_csv_matches_pandas(self):
+        """
+      This test checks that the boolean frames are written with the same bytes as "to_csv" (also in several blocks and
+      without rows), and that the other frames are written by pandas.
+      """
+        original_block_cells = output_writer.BOOL_CSV_BLOCK_CELLS
+        output_writer.BOOL_CSV_BLOCK_CELLS = 100
+        try:
+            for df in [self.bool_data, self.bool_data.iloc[:0], self.processed_data]:
+                file_path = OutputWriter().write(df, self.temp_dir.name, "data")
+                expected_file = os.path.join(self.temp_dir.name, "expected.csv")
+                df.to_csv(expected_file, index=False)
+                self.assertEqual(self.read_bytes(file_path), self.read_bytes(expected_file))
+        finally:
+            output_writer.BOOL_CSV_BLOCK_CELLS = original_block_cells
+
+    def test_background_compressed_and_disabled_outputs(self):
+        """
+      This test checks that a background write keeps the data of the call (the frame is changed afterwards), that the
+      compressed CSV gets its extension, and that a disabled output is not written.
+      """
+        writer = OutputWriter(compression="gzip", background=True, disabled_outputs=["processed_data_mining_rules"])
+        df = self.processed_data.copy()
+        file_path = writer.write(df, self.temp_dir.name, "processed_data")
+        df["sensor_1"] = 0.0
+        self.assertIsNone(writer.write(self.bool_data, self.temp_dir.name, "processed_data_mining_rules"))
+        writer.wait()
+
+        self.assertTrue(file_path.endswith("processed_data.csv.gz"))
+        written = pd.read_csv(file_path, parse_dates=["time"])
+        pd.testing.assert_frame_equal(written, self.processed_data)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["processed_data.csv.gz"])
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "the optional pyarrow package is not installed")
+    def test_columnar_formats(self):
+        """
+      This test checks that the Parquet and Feather outputs are read back with the same data.
+      """
+        for file_format, read in [("parquet", pd.read_parquet), ("feather", pd.read_feather)]:
+            file_path = OutputWriter(file_format).write(self.processed_data, self.temp_dir.name, "processed_data")
+            pd.testing.assert_frame_equal(read(file_path), self.processed_data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import pstats
+import unittest
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from utils.profiling import profile_block, start_stage_profiling, stop_stage_profiling
+from utils.instrumentation import measure_stage, start_run_report, finish_run_report
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        stop_stage_profiling()
+        self.temp_dir.cleanup()
+
+    def test_profile_block(self):
+        """
+      This test checks that a profiled block writes a readable .prof file and collapsed stacks that contain the profiled function.
+      """
+        with profile_block(self.temp_dir.name, "run_full_data", sample_interval=0.001):
+            busy_loop(0.1)
+
+        stats = pstats.Stats(os.path.join(self.temp_dir.name, "run_full_data.prof"))
+        self.assertTrue(any(function[2] == "busy_loop" for function in stats.stats))
+
+        with open(os.path.join(self.temp_dir.name, "run_full_data.collapsed.txt")) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any("busy_loop" in line for line in lines))
+
+    def test_stage_profiling(self):
+        """
+      This test checks that only the top-level stages get their own profile when the stage profiling is enabled.
+      """
+        start_run_report("full_data")
+        start_stage_profiling(self.temp_dir.name)
+        with measure_stage("load"):
+            with measure_stage("parse"):
+                busy_loop(0.01)
+        with measure_stage("mine"):
+            busy_loop(0.01)
+        stop_stage_profiling()
+        with measure_stage("write"):
+            pass
+        finish_run_report(self.temp_dir.name)
+
+        profiles = sorted(name for name in os.listdir(self.temp_dir.name) if name.endswith(".prof"))
+        self.assertEqual(profiles, ["001_load.prof", "002_mine.prof"])
+
+if __name__ == "__main__":
+    unittest.main()
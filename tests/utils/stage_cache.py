@@ -0,0 +1,121 @@
+import os
+import sys
+import unittest
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from utils.stage_cache import StageCache
+from core.rule_mining import get_rules
+from utils.memory_governor import configure_memory_governor, finish_memory_governor
+
+class TestStageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_or_compute(self):
+        """
+      This test checks that a stage is computed only once for the same key and that another key is computed again.
+      """
+        cache = StageCache(self.cache_dir)
+        calls = []
+        compute = lambda: calls.append(1) or pd.DataFrame({"a": [1, 2]})
+
+        first, first_cached = cache.get_or_compute("stage", cache.make_key("x", 1), compute)
+        second, second_cached = cache.get_or_compute("stage", cache.make_key("x", 1), compute)
+        cache.get_or_compute("stage", cache.make_key("x", 2), compute)
+
+        self.assertEqual((first_cached, second_cached), (False, True))
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(len(calls), 2)
+
+    def test_lru_eviction(self):
+        """
+      This test checks that the least recently used entries are evicted when the cache is larger than its size limit.
+      """
+        cache = StageCache(self.cache_dir, max_size_mb=0.15)
+        value = np.zeros(8000)  # about 64 KB per entry
+        cache.put("stage", "a", value)
+        cache.put("stage", "b", value)
+        os.utime(cache._entry_file("stage", "a"), ns=(0, 0))
+        self.assertIsNotNone(cache.get("stage", "a"))  # "a" becomes the most recently used entry
+        os.utime(cache._entry_file("stage", "b"), ns=(1, 1))
+        cache.put("stage", "c", value)
+
+        self.assertIsNotNone(cache.get("stage", "a"))
+        self.assertIsNone(cache.get("stage", "b"))
+        self.assertIsNotNone(cache.get("stage", "c"))
+
+    def test_corrupted_entry_is_ignored(self):
+        """
+      This test checks that an unreadable entry is removed and treated as a cache miss.
+      """
+        cache = StageCache(self.cache_dir)
+        with open(cache._entry_file("stage", "a"), "wb") as f:
+            f.write(b"not a pickle")
+
+        self.assertIsNone(cache.get("stage", "a"))
+        self.assertFalse(os.path.exists(cache._entry_file("stage", "a")))
+
+    def test_rerun_resumes_from_the_deepest_stage(self):
+        """
+      This test checks that a re-run with another min_lift does not clean, discretize or run FP-Growth again and gives the same rules.
+      """
+        rng = np.random.default_rng(2)
+        times = pd.date_range("2025-01-01", periods=200, freq="h")
+        data = pd.DataFrame({"time": times.strftime("%Y-%m-%d %H:%M:%S"), "sensor_1": rng.normal(10, 2, 200).round(2),
+                             "sensor_2": rng.integers(0, 2, 200)})
+        input_file = os.path.join(self.temp_dir.name, "data.csv")
+        data.to_csv(input_file, index=False)
+
+        arguments = [input_file, self.temp_dir.name, "time", "%Y-%m-%d %H:%M:%S", {"temperature": ["sensor_1"], "ordinal": ["sensor_2"]}, None,
+                     ["fill", "mean", None, None, "z_score", 3], ["first", "drop", "error"]]
+        rule_mining_par = ["equal_width", 2, None, ["temperature"], 0.1, 0.5, None, None, None]
+
+        expected = get_rules(*arguments, rule_mining_par)
+        get_rules(*arguments, rule_mining_par, StageCache(self.cache_dir))
+        with patch("core.rule_mining.DataProcessor") as data_processor, patch("core.rule_mining.RuleMiningProcessor") as processor, \
+             patch("mlxtend.frequent_patterns.fpgrowth") as fpgrowth:
+            cached = get_rules(*arguments, rule_mining_par, StageCache(self.cache_dir))
+            rule_mining_par_lift = rule_mining_par[:6] + [1.0] + rule_mining_par[7:]
+            get_rules(*arguments, rule_mining_par_lift, StageCache(self.cache_dir))
+
+        self.assertEqual(cached, expected)
+        data_processor.assert_not_called()
+        processor.assert_not_called()
+        fpgrowth.assert_not_called()
+
+    @patch("utils.memory_governor.get_current_rss_mb", return_value=100)
+    def test_float32_data_is_not_cached(self, _):
+        """
+      This test checks that the stages of a run whose values were converted to float32 by the memory governor are not
+      stored, so a later run without a budget does not reuse them.
+      """
+        rng = np.random.default_rng(4)
+        times = pd.date_range("2025-01-01", periods=200, freq="h")
+        data = pd.DataFrame({"time": times.strftime("%Y-%m-%d %H:%M:%S"), "sensor_1": rng.normal(10, 2, 200).round(2)})
+        input_file = os.path.join(self.temp_dir.name, "data.csv")
+        data.to_csv(input_file, index=False)
+        arguments = [input_file, self.temp_dir.name, "time", "%Y-%m-%d %H:%M:%S", {"temperature": ["sensor_1"]}, None,
+                     ["fill", "mean", None, None, "z_score", 3], ["first", "drop", "error"], ["equal_width", 2, None, ["temperature"], 0.1, 0.5, None, None, None]]
+
+        governor = configure_memory_governor(100.01)
+        try:
+            get_rules(*arguments, StageCache(self.cache_dir))
+        finally:
+            finish_memory_governor()
+        self.assertTrue(governor.float32_values)
+        self.assertEqual([files for _, _, files in os.walk(self.cache_dir) if files], [])
+
+        get_rules(*arguments, StageCache(self.cache_dir))
+        self.assertNotEqual([files for _, _, files in os.walk(self.cache_dir) if files], [])
+
+if __name__ == "__main__":
+    unittest.main()
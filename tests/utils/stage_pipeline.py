@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import unittest
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+from utils.stage_pipeline import run_pipeline
+from utils.instrumentation import start_run_report, finish_run_report
+
+class TestStagePipeline(unittest.TestCase):
+
+    def test_order_back_pressure_and_metrics(self):
+        """
+      This test checks that the results come in the order of the source, that the reader does not read ahead of the
+      bounded queues while the consumer is slow, and that the queue metrics are added to the run report.
+      """
+        read = []
+        def source():
+            for i in range(20):
+                read.append(i)
+                yield i
+
+        results = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            start_run_report()
+            try:
+                for result in run_pipeline("test", source(), [("double", lambda x: 2 * x), ("add", lambda x: x + 1)], queue_size=2):
+                    time.sleep(0.005)
+                    # at most 2 items per queue (3 queues), 1 item per thread (3 threads) and the current item are read
+                    self.assertLessEqual(len(read) - len(results), 10)
+                    results.append(result)
+            finally:
+                with open(finish_run_report(temp_dir)) as f:
+                    stages = json.load(f)["stages"]
+
+        self.assertEqual(results, [2 * i + 1 for i in range(20)])
+        metrics = next(stage for stage in stages if stage["stage"] == "pipeline_test")["metrics"]
+        self.assertEqual([queue["queue"] for queue in metrics], ["read->double", "double->add", "add->consumer"])
+        self.assertTrue(all(queue["items"] == 20 and queue["max_depth"] <= 2 for queue in metrics))
+
+    def test_errors_and_early_stop(self):
+        """
+      This test checks that an error of a stage or of the source is raised in the caller, and that the threads stop if
+      the caller stops early.
+      """
+        def fail_on_three(x):
+            if x == 3:
+                raise ValueError("bad item")
+            return x
+
+        with self.assertRaises(ValueError) as context:
+            list(run_pipeline("test", iter(range(100)), [("check", fail_on_three)]))
+        self.assertEqual(str(context.exception), "bad item")
+
+        def failing_source():
+            yield 1
+            raise OSError("read failed")
+
+        with self.assertRaises(OSError):
+            list(run_pipeline("test", failing_source(), [("same", lambda x: x)]))
+
+        threads_before = threading.active_count()
+        pipeline = run_pipeline("test", iter(range(10**6)), [("same", lambda x: x)])
+        self.assertEqual([next(pipeline) for _ in range(3)], [0, 1, 2])
+        pipeline.close()
+        self.assertEqual(threading.active_count(), threads_before)
+
+if __name__ == "__main__":
+    unittest.main()